@@ -0,0 +1,51 @@
+"""
+Admin support for tables too large to count on every page view.
+
+The change list counts its rows for the paginator and, by default, counts
+the whole table once more for "N of M selected". ``EstimatedCountMixin``
+drops the second count and, for unfiltered lists of large PostgreSQL tables,
+replaces the first with the planner's row estimate, so opening the list of
+a table with hundreds of thousands of rows doesn't scan it. Filtered and
+searched lists are still counted exactly.
+"""
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+# Below this many rows an exact count is cheap enough.
+ESTIMATE_THRESHOLD = 100000
+
+
+def estimated_count(queryset):
+    """The row estimate of the queryset's table, or ``None`` if unknown."""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    # -1 until the table is first analyzed.
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimated_count(queryset)
+            if estimate is not None and estimate >= ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
+
+
+class EstimatedCountMixin:
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
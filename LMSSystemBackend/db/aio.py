@@ -0,0 +1,111 @@
+"""
+Async execution of querysets for the async views.
+
+Querysets are compiled by Django as usual and their SQL is run on a psycopg
+``AsyncConnection`` borrowed from an ``AsyncConnectionPool``, so an event
+loop can keep many queries in flight without parking a thread on each one.
+Pools belong to an event loop and are created the first time the loop needs
+one, which makes them suitable for ASGI servers (one long-lived loop per
+worker) but not for ``async_to_sync`` calls that start a loop per call.
+
+Without ``ASYNC_DB_POOL``, or on a database other than PostgreSQL, queries go
+through Django's async ORM instead (which runs them in a thread).
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from psycopg import AsyncClientCursor
+from psycopg_pool import AsyncConnectionPool
+
+# (alias, database name, event loop) -> (pool, task opening it)
+_pools = {}
+
+# Callables given the duration of every query run here, for the request
+# metrics: these queries bypass the connections' execute_wrappers.
+query_observers = ContextVar("query_observers", default=())
+
+
+def connect_kwargs(alias):
+    """Arguments of ``psycopg.AsyncConnection.connect()`` for ``alias``."""
+    kwargs = connections[alias].get_connection_params()
+    kwargs.update(autocommit=True, cursor_factory=AsyncClientCursor)
+    return kwargs
+
+
+def _get_pool(alias):
+    connection = connections[alias]
+    if not settings.ASYNC_DB_POOL or connection.vendor != "postgresql":
+        return None
+    loop = asyncio.get_running_loop()
+    key = (alias, connection.settings_dict["NAME"], loop)
+    entry = _pools.get(key)
+    if entry is None:
+        pool = AsyncConnectionPool(
+            kwargs=connect_kwargs(alias),
+            open=False,
+            name=f"{alias}-async",
+            **settings.ASYNC_DB_POOL,
+        )
+        # Created and stored without awaiting, so concurrent first requests
+        # share one pool and wait on the same opening.
+        entry = _pools[key] = (pool, loop.create_task(pool.open()))
+    return entry
+
+
+async def afetch(queryset):
+    """
+    Rows of a ``values_list()`` queryset, with Django's converters applied.
+    """
+    alias = queryset.db
+    entry = _get_pool(alias)
+    if entry is None:
+        return [row async for row in queryset]
+
+    compiler = queryset.query.get_compiler(using=alias)
+    try:
+        sql, params = compiler.as_sql()
+    except EmptyResultSet:
+        return []
+    pool, opening = entry
+    await opening
+    start = time.perf_counter()
+    async with pool.connection() as connection:
+        async with connection.cursor() as cursor:
+            await cursor.execute(sql, params)
+            rows = await cursor.fetchall()
+    duration = time.perf_counter() - start
+    for observe in query_observers.get():
+        observe(duration)
+    return list(compiler.results_iter(results=[rows], tuple_expected=True))
+
+
+async def afetch_instances(queryset, fields=None):
+    """
+    Model instances of ``queryset`` with the given concrete fields (all of
+    them by default) loaded; related objects are not followed.
+    """
+    model = queryset.model
+    names = fields or [field.attname for field in model._meta.concrete_fields]
+    rows = await afetch(queryset.values_list(*names))
+    return [model.from_db(queryset.db, names, row) for row in rows]
+
+
+async def afetch_values(queryset):
+    """Rows of a ``values()`` queryset, as dicts."""
+    query = queryset.query
+    names = [*query.extra_select, *query.values_select, *query.annotation_select]
+    rows = await afetch(queryset.values_list(*names))
+    return [dict(zip(names, row)) for row in rows]
+
+
+async def close_async_pools():
+    loop = asyncio.get_running_loop()
+    for key, (pool, _) in list(_pools.items()):
+        if key[2] is loop:
+            del _pools[key]
+            await pool.close()
@@ -0,0 +1,92 @@
+"""
+Process-wide psycopg connection pools, one per database alias.
+
+Pools are created lazily by the ``LMSSystemBackend.db.postgresql`` backend the
+first time a connection is needed, so every WSGI/ASGI worker process owns its
+own pool and no sockets are shared across a fork. A child forked after its
+parent used a pool forgets it, and opens its own on first use.
+"""
+
+import atexit
+import os
+import threading
+
+from psycopg_pool import ConnectionPool
+
+_pools = {}
+_lock = threading.Lock()
+
+
+def get_pool(alias, name, pool_options, connect_kwargs, check=False):
+    key = (alias, name)
+    pool = _pools.get(key)
+    if pool is None:
+        with _lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(
+                    kwargs=connect_kwargs,
+                    open=False,
+                    check=ConnectionPool.check_connection if check else None,
+                    name=alias,
+                    **pool_options,
+                )
+                _pools[key] = pool
+    return pool
+
+
+def current_pool(alias, name):
+    """The pool of ``alias`` and database ``name`` in this process, if any."""
+    return _pools.get((alias, name))
+
+
+def open_pools(wait=False, timeout=30.0):
+    """
+    Start filling every configured pool up to ``min_size``, so the first
+    requests don't pay the connection handshake. Only call it in the worker
+    process, e.g. from gunicorn's ``post_worker_init`` hook: the pool's threads
+    don't survive a fork, and its sockets would be shared with the children.
+    """
+    from django.db import connections
+
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is not None:
+            pool.open(wait=wait, timeout=timeout)
+
+
+def close_pool(alias, name):
+    with _lock:
+        pool = _pools.pop((alias, name), None)
+    if pool is not None:
+        pool.close()
+
+
+def close_pools():
+    with _lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats():
+    """
+    Return ``{alias: stats}`` for the pools of this process, where ``stats``
+    are the counters reported by ``psycopg_pool`` (``pool_size``,
+    ``pool_available``, ``requests_waiting``, ``connections_errors``, ...).
+    """
+    return {pool.name: pool.get_stats() for pool in list(_pools.values())}
+
+
+def _forget_pools():
+    # The parent's pools have no worker threads here, and closing them would
+    # close the parent's sockets.
+    global _lock
+    _pools.clear()
+    _lock = threading.Lock()
+
+
+atexit.register(close_pools)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pools)
@@ -0,0 +1,108 @@
+"""
+PostgreSQL backend that borrows connections from a ``psycopg_pool`` pool.
+
+Enabled per database with ``OPTIONS["pool"]`` (the keyword arguments of
+``psycopg_pool.ConnectionPool``: ``min_size``, ``max_size``, ``timeout``,
+``max_idle``, ``max_lifetime``, ...). Without it the backend behaves exactly
+like ``django.db.backends.postgresql``.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base, creation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.utils.asyncio import async_unsafe
+
+from LMSSystemBackend.db.pool import close_pool, current_pool, get_pool
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # The pool keeps its connections to the test database open, which
+        # would make dropping it fail.
+        close_pool(self.connection.alias, test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    creation_class = DatabaseCreation
+    # (database name, pool) of the last lookup.
+    _pool = None
+
+    @property
+    def pool_options(self):
+        if self.alias == NO_DB_ALIAS:
+            return None
+        return self.settings_dict["OPTIONS"].get("pool")
+
+    @property
+    def pool(self):
+        pool_options = self.pool_options
+        if not pool_options:
+            return None
+        # Looked up by database name too: the test runner renames the database
+        # (test_...) after this wrapper may already have used a pool.
+        # A forked child must not use its parent's pool either.
+        name = self.settings_dict["NAME"]
+        if self._pool is not None and self._pool[0] == name:
+            if self._pool[1] is current_pool(self.alias, name):
+                return self._pool[1]
+
+        if self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured(
+                "Pooled connections require CONN_MAX_AGE = 0; the pool keeps "
+                "them open between requests."
+            )
+        connect_kwargs = self.get_connection_params()
+        # Django switches autocommit off/on itself once it owns the connection.
+        connect_kwargs["autocommit"] = True
+        pool = get_pool(
+            self.alias,
+            name,
+            pool_options,
+            connect_kwargs,
+            check=self.settings_dict["CONN_HEALTH_CHECKS"],
+        )
+        self._pool = (name, pool)
+        return pool
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        try:
+            self.isolation_level = IsolationLevel(
+                IsolationLevel.READ_COMMITTED
+                if isolation_level is None
+                else isolation_level
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level {isolation_level} "
+                f"specified. Use one of the psycopg.IsolationLevel values."
+            )
+        # No-op once the pool is running.
+        pool.open()
+        connection = pool.getconn()
+        if isolation_level is not None:
+            connection.isolation_level = self.isolation_level
+        return connection
+
+    def _close(self):
+        if self.connection is not None and self.pool_options:
+            with self.wrap_database_errors:
+                # putconn() rolls back anything left open and discards broken
+                # connections, so the next checkout gets a clean session.
+                self.pool.putconn(self.connection)
+                # The connection now belongs to the pool again.
+                self.connection = None
+            return
+        return super()._close()
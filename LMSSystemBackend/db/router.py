@@ -0,0 +1,160 @@
+"""
+Read replica routing.
+
+``ReplicaMiddleware`` picks a replica for GET, HEAD and OPTIONS requests to
+the views of ``REPLICA_APPS``. While such a request runs, ``ReplicaRouter``
+sends reads of those apps' models to the replica; everything else (writes,
+sessions, other apps, other requests) stays on ``default``.
+
+Replicas are picked at random in proportion to their weight. One that fails
+to connect is skipped for ``REPLICA_RETRY_SECONDS``; when none is left the
+request reads from ``default``. A client that sends a write gets a cookie
+that keeps its reads on ``default`` for ``REPLICA_STICKY_SECONDS``, so it
+reads its own writes despite the replication lag.
+"""
+
+import copy
+import random
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.urls import Resolver404, resolve
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "lms_primary"
+
+# Alias reads of REPLICA_APPS go to during the current request.
+read_alias = ContextVar("read_alias", default=None)
+
+# Replica alias -> time until which it is considered down.
+_down_until = {}
+
+
+def parse_replicas(spec, primary):
+    """
+    Database settings and weights of the replicas listed in ``spec``, a
+    comma-separated list of ``host[:port][/name][=weight]`` copying the
+    other settings of ``primary``.
+    """
+    databases = {}
+    weights = {}
+    for index, entry in enumerate(filter(None, spec.split(",")), 1):
+        address, _, weight = entry.strip().partition("=")
+        address, _, name = address.partition("/")
+        host, _, port = address.partition(":")
+        alias = f"replica{index}"
+        databases[alias] = {
+            **copy.deepcopy(primary),
+            "HOST": host or primary.get("HOST", ""),
+            "PORT": port or primary.get("PORT", ""),
+            "NAME": name or primary["NAME"],
+            "TEST": {"MIRROR": DEFAULT_DB_ALIAS},
+        }
+        weights[alias] = float(weight or 1)
+    return databases, weights
+
+
+def is_available(alias):
+    if _down_until.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError:
+        _down_until[alias] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+        return False
+    return True
+
+
+def choose_replica():
+    """A weighted random replica that accepts connections, or ``None``."""
+    weights = dict(settings.DATABASE_REPLICAS)
+    while weights:
+        (alias,) = random.choices(list(weights), list(weights.values()))
+        if is_available(alias):
+            return alias
+        del weights[alias]
+    return None
+
+
+def routes_to_replica(request):
+    if not settings.DATABASE_REPLICAS or request.method not in SAFE_METHODS:
+        return False
+    if request.COOKIES.get(STICKY_COOKIE):
+        return False
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return False
+    return match.func.__module__.partition(".")[0] in settings.REPLICA_APPS
+
+
+def mark_sticky(request, response):
+    if settings.DATABASE_REPLICAS and request.method not in SAFE_METHODS:
+        response.set_cookie(
+            STICKY_COOKIE,
+            "1",
+            max_age=settings.REPLICA_STICKY_SECONDS,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        alias = choose_replica() if routes_to_replica(request) else None
+        token = read_alias.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            read_alias.reset(token)
+        return mark_sticky(request, response)
+
+    async def __acall__(self, request):
+        alias = None
+        if routes_to_replica(request):
+            alias = await sync_to_async(choose_replica)()
+        token = read_alias.set(alias)
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_alias.reset(token)
+        return mark_sticky(request, response)
+
+
+class ReplicaRouter:
+    def _is_routed(self, model):
+        return model._meta.app_label in settings.REPLICA_APPS
+
+    def db_for_read(self, model, **hints):
+        if self._is_routed(model):
+            return read_alias.get()
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        group = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in group and obj2._state.db in group:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,112 @@
+from django.db.models.query import ValuesIterable
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+from LMSSystemBackend.db.aio import afetch_instances, afetch_values
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on an indexed, unique key: every page is a
+    ``WHERE key > cursor ORDER BY key LIMIT n`` seek, so deep pages cost the
+    same as the first one and rows inserted meanwhile are never skipped or
+    repeated. Views may override the key with a ``pagination_ordering``
+    attribute; clients may pass ``?page_size=``.
+
+    ``CursorPagination.paginate_queryset`` is split in two around its single
+    query so that async views can run that query with ``apaginate_queryset``.
+    """
+
+    ordering = "pk"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "pagination_ordering", self.ordering)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_query = self.get_page_query(queryset, request, view)
+        if page_query is None:
+            return None
+        return self.set_page(list(page_query))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_query = self.get_page_query(queryset, request, view)
+        if page_query is None:
+            return None
+        if page_query._iterable_class is ValuesIterable:
+            return self.set_page(await afetch_values(page_query))
+        return self.set_page(await afetch_instances(page_query))
+
+    def get_page_query(self, queryset, request, view=None):
+        """The queryset of the requested page plus the row following it."""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+        self._page_state = (offset, reverse, current_position)
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            order = self.ordering[0]
+            is_reversed = order.startswith("-")
+            order_attr = order.lstrip("-")
+
+            # Test for: (cursor reversed) XOR (queryset reversed)
+            if self.cursor.reverse != is_reversed:
+                kwargs = {order_attr + "__lt": current_position}
+            else:
+                kwargs = {order_attr + "__gt": current_position}
+
+            queryset = queryset.filter(**kwargs)
+
+        return queryset[offset : offset + self.page_size + 1]
+
+    def set_page(self, results):
+        """Work out the page and its neighbours from the fetched rows."""
+        offset, reverse, current_position = self._page_state
+        self.page = list(results[: self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
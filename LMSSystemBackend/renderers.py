@@ -0,0 +1,43 @@
+from rest_framework import renderers
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """
+    DRF's ``JSONRenderer`` encoding with orjson, several times faster than
+    the standard library on large lists. The output is the same compact UTF-8
+    JSON; only floats needing an exponent are spelled differently (``1e-5``
+    instead of ``1e-05``), which parses to the same number.
+
+    Falls back to DRF's encoding when orjson isn't installed and for indented
+    (e.g. browsable API) or non-default (``UNICODE_JSON``, ``COMPACT_JSON``)
+    output.
+    """
+
+    encoder = renderers.JSONRenderer.encoder_class()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data,
+            default=self.encoder.default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+        # Escaped like DRF does, to stay a strict javascript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
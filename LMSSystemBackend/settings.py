@@ -14,6 +14,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from LMSSystemBackend.db.router import parse_replicas
+
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -39,21 +41,23 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "courses.apps.CoursesConfig",
     "students.apps.StudentsConfig",
     "reports.apps.ReportsConfig",
     "user_profiles.apps.UserProfilesConfig",
     "notifications.apps.NotificationsConfig",
+    "metrics.apps.MetricsConfig",
     "rest_framework",
     "corsheaders",
-    "debug_toolbar",
 ]
 
 MIDDLEWARE = [
+    "metrics.middleware.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "LMSSystemBackend.db.router.ReplicaMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
@@ -61,6 +65,25 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# The debug toolbar instruments every request, so it is only installed when
+# asked for with DEBUG_TOOLBAR=1.
+DEBUG_TOOLBAR = os.getenv("DEBUG_TOOLBAR", "0") == "1"
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.middleware.common.CommonMiddleware"),
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
+# Request metrics (see metrics/). Each worker process keeps its own; with
+# METRICS_DIR set they write them there every METRICS_FLUSH_INTERVAL seconds
+# so that /metrics and "manage.py metrics" report all workers. Clear the
+# directory when the server restarts. /metrics is open to staff users and
+# to requests bearing METRICS_TOKEN.
+METRICS_DIR = os.getenv("METRICS_DIR")
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "10"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
 ROOT_URLCONF = "LMSSystemBackend.urls"
 CORS_ORIGIN_ALLOW_ALL = False
 CORS_ORIGIN_WHITELIST = (
@@ -68,6 +91,8 @@ CORS_ORIGIN_WHITELIST = (
     "http://103.75.186.201:8081",
     "http://localhost:3000",
 )
+# Lets the frontends read the validators and send them back when polling.
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified"]
 
 TEMPLATES = [
     {
@@ -98,18 +123,112 @@ keepalive_kwargs = {
 }
 
 
+# Connections are borrowed from a per-process psycopg pool (see
+# LMSSystemBackend/db/postgresql). Set DB_POOL=0 to fall back to Django's
+# persistent connections, kept for DB_CONN_MAX_AGE seconds.
+DB_POOL = os.getenv("DB_POOL", "1") == "1"
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "LMSSystemBackend.db.postgresql",
         "NAME": "bkel_data",
         "USER": "chaunhu.thesis",
         "PASSWORD": os.getenv("DB_PASSWORD"),
         "HOST": "ep-wandering-waterfall-a5cvyxpm.us-east-2.aws.neon.tech",
         "PORT": "5432",
-        "OPTIONS": {"sslmode": "require"},
+        "OPTIONS": {"sslmode": "require", **keepalive_kwargs},
+        "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_HEALTH_CHECKS", "1") == "1",
     }
 }
 
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        # Seconds a request waits for a free connection before failing.
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        # Connections idle for longer are closed, down to min_size.
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+    }
+
+# Read replicas (see LMSSystemBackend/db/router.py), listed in DB_REPLICAS as
+# host[:port][/name][=weight], e.g. "replica-1.example.com=2,replica-2.lan".
+# GET requests to the views of REPLICA_APPS read from them; a client that
+# wrote reads from the primary for REPLICA_STICKY_SECONDS, and a replica that
+# fails to connect is left alone for REPLICA_RETRY_SECONDS.
+replica_databases, DATABASE_REPLICAS = parse_replicas(
+    os.getenv("DB_REPLICAS", ""), DATABASES["default"]
+)
+DATABASES.update(replica_databases)
+DATABASE_ROUTERS = ["LMSSystemBackend.db.router.ReplicaRouter"]
+REPLICA_APPS = ["courses", "user_profiles"]
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+REPLICA_RETRY_SECONDS = int(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+# Served over ASGI (asgi.py sets ASYNC_VIEWS=1), the course list, semester
+# detail, lab list and course tree answer GET with the async views of
+# courses/async_views.py. Their queries run on a pool of async connections
+# per event loop, sized by ASYNC_DB_POOL_*; ASYNC_DB_POOL=0 runs them through
+# Django's async ORM instead.
+ASYNC_VIEWS = os.getenv("ASYNC_VIEWS", "0") == "1"
+ASYNC_DB_POOL = None
+if os.getenv("ASYNC_DB_POOL", "1") == "1":
+    ASYNC_DB_POOL = {
+        "min_size": int(os.getenv("ASYNC_DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("ASYNC_DB_POOL_MAX_SIZE", "20")),
+        "timeout": float(os.getenv("ASYNC_DB_POOL_TIMEOUT", "10")),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+    }
+
+# The notification event stream (api/notifications/stream, ASGI only) sends
+# a heartbeat comment every NOTIFICATION_STREAM_HEARTBEAT seconds and ends
+# after NOTIFICATION_STREAM_MAX_AGE, when clients reconnect after
+# NOTIFICATION_STREAM_RETRY seconds and resume where they stopped.
+NOTIFICATION_STREAM_HEARTBEAT = int(os.getenv("NOTIFICATION_STREAM_HEARTBEAT", "15"))
+NOTIFICATION_STREAM_MAX_AGE = int(os.getenv("NOTIFICATION_STREAM_MAX_AGE", "300"))
+NOTIFICATION_STREAM_RETRY = int(os.getenv("NOTIFICATION_STREAM_RETRY", "3"))
+
+
+# Cache for the course tree read endpoints (see courses/cache.py). Local
+# memory is private to each worker process, so invalidations only reach the
+# worker that made the write: other workers keep serving their entries, and
+# answering 304 to their ETags, until the course version they hold expires,
+# up to COURSE_CACHE_TIMEOUT seconds later. With several workers set
+# COURSE_CACHE_BACKEND=file or redis and COURSE_CACHE_LOCATION (a directory
+# or a redis:// URL) to share one cache, where versions never expire.
+COURSE_CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+COURSE_CACHE_ALIAS = "courses"
+COURSE_CACHE_BACKEND = os.getenv("COURSE_CACHE_BACKEND", "locmem")
+COURSE_CACHE_TIMEOUT = int(os.getenv("COURSE_CACHE_TIMEOUT", "300"))
+COURSE_VERSION_TIMEOUT = (
+    COURSE_CACHE_TIMEOUT if COURSE_CACHE_BACKEND == "locmem" else None
+)
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    COURSE_CACHE_ALIAS: {
+        "BACKEND": COURSE_CACHE_BACKENDS[COURSE_CACHE_BACKEND],
+        "LOCATION": os.getenv("COURSE_CACHE_LOCATION", "courses"),
+        "TIMEOUT": COURSE_CACHE_TIMEOUT,
+    },
+}
+if COURSE_CACHE_BACKEND != "redis":
+    # Past this size local memory evicts the least recently used entries and
+    # the file cache a random share of them; redis evicts according to its
+    # own maxmemory-policy (allkeys-lru is recommended).
+    CACHES[COURSE_CACHE_ALIAS]["OPTIONS"] = {
+        "MAX_ENTRIES": int(os.getenv("COURSE_CACHE_MAX_ENTRIES", "5000"))
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -152,9 +271,11 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "LMSSystemBackend.renderers.JSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
-    ]
+    ],
+    "DEFAULT_PAGINATION_CLASS": "LMSSystemBackend.pagination.KeysetPagination",
+    "PAGE_SIZE": 100,
 }
 AUTH_USER_MODEL = "user_profiles.UserProfile"
 
@@ -0,0 +1,132 @@
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base as postgresql_base
+from django.test import SimpleTestCase
+
+from LMSSystemBackend.db import pool as db_pool
+from LMSSystemBackend.db.postgresql.base import DatabaseWrapper
+
+
+def make_wrapper(alias="pooled", pool=None, **settings):
+    options = {} if pool is None else {"pool": pool}
+    settings_dict = {
+        "ENGINE": "LMSSystemBackend.db.postgresql",
+        "NAME": "lms",
+        "USER": "lms",
+        "PASSWORD": "",
+        "HOST": "localhost",
+        "PORT": "",
+        "OPTIONS": options,
+        "ATOMIC_REQUESTS": False,
+        "AUTOCOMMIT": True,
+        "CONN_MAX_AGE": 0,
+        "CONN_HEALTH_CHECKS": False,
+        "TIME_ZONE": None,
+        "TEST": {},
+        **settings,
+    }
+    return DatabaseWrapper(settings_dict, alias)
+
+
+# The pools of the running tests are set aside, not closed.
+@mock.patch.dict(db_pool._pools, clear=True)
+@mock.patch.object(db_pool, "ConnectionPool")
+class PooledBackendTests(SimpleTestCase):
+    pool_options = {"min_size": 2, "max_size": 4}
+
+    def test_connections_are_borrowed_and_returned(self, ConnectionPool):
+        wrapper = make_wrapper(pool=self.pool_options)
+        pool = ConnectionPool.return_value
+
+        connection = wrapper.get_new_connection(wrapper.get_connection_params())
+        self.assertIs(connection, pool.getconn.return_value)
+        pool.open.assert_called_once_with()
+        kwargs = ConnectionPool.call_args.kwargs
+        self.assertEqual(
+            (kwargs["name"], kwargs["open"], kwargs["min_size"], kwargs["max_size"]),
+            ("pooled", False, 2, 4),
+        )
+        self.assertTrue(kwargs["kwargs"]["autocommit"])
+        self.assertNotIn("pool", kwargs["kwargs"])
+
+        wrapper.connection = connection
+        wrapper._close()
+        pool.putconn.assert_called_once_with(connection)
+        connection.close.assert_not_called()
+        self.assertIsNone(wrapper.connection)
+
+    def test_pool_is_shared_per_alias_and_database(self, ConnectionPool):
+        ConnectionPool.side_effect = lambda **kwargs: mock.Mock()
+        wrapper = make_wrapper(pool=self.pool_options)
+        pool = wrapper.pool
+        self.assertIs(make_wrapper(pool=self.pool_options).pool, pool)
+        # The test runner renames the database.
+        wrapper.settings_dict["NAME"] = "test_lms"
+        self.assertIsNot(wrapper.pool, pool)
+        self.assertEqual(ConnectionPool.call_count, 2)
+
+    def test_without_pool_options(self, ConnectionPool):
+        wrapper = make_wrapper()
+        self.assertIsNone(wrapper.pool)
+        with mock.patch.object(
+            postgresql_base.DatabaseWrapper, "get_new_connection"
+        ) as get_new_connection:
+            connection = wrapper.get_new_connection({})
+        self.assertIs(connection, get_new_connection.return_value)
+
+        wrapper.connection = connection
+        wrapper._close()
+        connection.close.assert_called_once_with()
+        ConnectionPool.assert_not_called()
+
+    def test_invalid_isolation_level(self, ConnectionPool):
+        wrapper = make_wrapper(pool=self.pool_options)
+        wrapper.settings_dict["OPTIONS"]["isolation_level"] = 42
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.get_new_connection({})
+        ConnectionPool.return_value.getconn.assert_not_called()
+
+    def test_isolation_level_is_set_on_the_connection(self, ConnectionPool):
+        wrapper = make_wrapper(pool=self.pool_options)
+        wrapper.settings_dict["OPTIONS"]["isolation_level"] = 3
+        connection = wrapper.get_new_connection({})
+        self.assertEqual(connection.isolation_level, 3)
+
+    def test_persistent_connections_are_rejected(self, ConnectionPool):
+        wrapper = make_wrapper(pool=self.pool_options, CONN_MAX_AGE=60)
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.pool
+
+    def test_close_pool(self, ConnectionPool):
+        ConnectionPool.side_effect = lambda **kwargs: mock.Mock()
+        wrapper = make_wrapper(pool=self.pool_options)
+        other = make_wrapper("other", pool=self.pool_options)
+        pool, other_pool = wrapper.pool, other.pool
+
+        db_pool.close_pool("pooled", "lms")
+        pool.close.assert_called_once_with()
+        other_pool.close.assert_not_called()
+        # The next connection comes from a new pool.
+        self.assertIsNot(wrapper.pool, pool)
+
+        db_pool.close_pools()
+        other_pool.close.assert_called_once_with()
+        self.assertEqual(db_pool.pool_stats(), {})
+
+    def test_pool_stats(self, ConnectionPool):
+        pool = ConnectionPool.return_value
+        pool.name = "pooled"
+        pool.get_stats.return_value = {"pool_size": 2, "pool_available": 1}
+        make_wrapper(pool=self.pool_options).pool
+        self.assertEqual(
+            db_pool.pool_stats(), {"pooled": {"pool_size": 2, "pool_available": 1}}
+        )
+
+    def test_forked_child_forgets_the_parent_pools(self, ConnectionPool):
+        ConnectionPool.side_effect = lambda **kwargs: mock.Mock()
+        wrapper = make_wrapper(pool=self.pool_options)
+        pool = wrapper.pool
+        db_pool._forget_pools()
+        pool.close.assert_not_called()
+        self.assertIsNot(wrapper.pool, pool)
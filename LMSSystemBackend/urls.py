@@ -15,6 +15,7 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
@@ -22,8 +23,12 @@ urlpatterns = [
     path("admin/", admin.site.urls),
     path("api-auth/", include("rest_framework.urls", namespace="rest_framework")),
     path("api/", include("courses.urls")),
-    path("__debug__/", include("debug_toolbar.urls")),
-    # path('api/notifications', include('notifications.urls')),
+    path("api/reports/", include("reports.urls")),
+    path("api/notifications/", include("notifications.urls")),
     path("accounts/", include("user_profiles.urls")),
-    # path('api/students',include('students.urls')),
+    path("api/students/", include("students.urls")),
+    path("", include("metrics.urls")),
 ]
+
+if settings.DEBUG_TOOLBAR:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
@@ -0,0 +1,53 @@
+"""
+Fast path for read-only list endpoints.
+
+A ``ValuesSerializer`` builds each item of a list straight from a
+``values()`` row. It skips model instances, DRF fields and related objects,
+which on long lists cost more than the query itself. Each one mirrors a
+ModelSerializer and must produce exactly the same items.
+"""
+
+from rest_framework.response import Response
+
+
+class ValuesSerializer:
+    # Lookups each row needs, besides "pk".
+    lookups = ()
+
+    def __init__(self, rows, context=None):
+        self.rows = rows
+        self.context = context or {}
+
+    @classmethod
+    def get_values(cls, queryset):
+        return queryset.values(*dict.fromkeys(("pk", *cls.lookups)))
+
+    def prepare(self, rows):
+        """Load what the rows refer to, once for all of them."""
+
+    def to_representation(self, row):
+        raise NotImplementedError
+
+    @property
+    def data(self):
+        self.prepare(self.rows)
+        return [self.to_representation(row) for row in self.rows]
+
+
+class ValuesListMixin:
+    """
+    ``list()`` through ``values_serializer_class``, paginated like the
+    regular list.
+    """
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.values_serializer_class
+        queryset = serializer_class.get_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        data = serializer_class(rows, context=self.get_serializer_context()).data
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
@@ -0,0 +1,175 @@
+"""
+Deterministic benchmark data: the same configuration and seed always produce
+the same courses, semesters, labs, outcomes, contributions and teachers.
+"""
+
+import random
+from dataclasses import asdict, dataclass, field
+
+from django.db import transaction
+
+from courses.models import (
+    Course,
+    CourseSemester,
+    CourseTeacher,
+    Lab,
+    LabLOContribution,
+    LearningOutcome,
+)
+from user_profiles.models import UserProfile
+
+DEPARTMENTS = ["CSE", "EE", "ME", "CHE", "CE"]
+ROLES = ["Lecturer", "HeadLecturer", "TA"]
+USERNAME = "bench-lecturer"
+
+
+@dataclass
+class DatasetConfig:
+    courses: int = 20
+    semesters: int = 3
+    labs: int = 8
+    outcomes: int = 6
+    outcomes_per_lab: int = 2
+    teachers: int = 10
+    teachers_per_course: int = 3
+    seed: int = 0
+
+    def to_json(self):
+        return asdict(self)
+
+
+@dataclass
+class Dataset:
+    """What the scenarios need to build URLs, indexed by course code."""
+
+    user: UserProfile
+    teachers: list = field(default_factory=list)
+    semesters: dict = field(default_factory=dict)
+    labs: dict = field(default_factory=dict)
+    outcomes: dict = field(default_factory=dict)
+    course_teachers: dict = field(default_factory=dict)
+
+    @property
+    def course_codes(self):
+        return list(self.semesters)
+
+
+def _split_percentages(rng, parts):
+    """``parts`` whole percentages adding up to 100."""
+    cuts = sorted(rng.sample(range(1, 100), parts - 1))
+    return [b - a for a, b in zip([0, *cuts], [*cuts, 100])]
+
+
+@transaction.atomic
+def generate(config):
+    rng = random.Random(config.seed)
+    user = UserProfile.objects.create(
+        username=USERNAME, email=f"{USERNAME}@example.com", is_teacher=True
+    )
+    teachers = UserProfile.objects.bulk_create(
+        UserProfile(
+            username=f"bench-teacher-{i}",
+            email=f"bench-teacher-{i}@example.com",
+            first_name=f"Teacher{i}",
+            is_teacher=True,
+        )
+        for i in range(config.teachers)
+    )
+    courses = Course.objects.bulk_create(
+        Course(
+            course_code=f"BENCH{i:04d}",
+            course_name=f"Benchmark course {i}",
+            department=rng.choice(DEPARTMENTS),
+            creater=user.email,
+        )
+        for i in range(config.courses)
+    )
+    semesters = CourseSemester.objects.bulk_create(
+        CourseSemester(
+            course=course,
+            semester_name=str(231 + j),
+            num_of_lab=config.labs,
+            lab_counter=config.labs,
+        )
+        for course in courses
+        for j in range(config.semesters)
+    )
+    outcomes = LearningOutcome.objects.bulk_create(
+        LearningOutcome(
+            course=course,
+            outcome_code=f"LO{k}",
+            outcome_name=f"Outcome {k} of {course.course_code}",
+        )
+        for course in courses
+        for k in range(1, config.outcomes + 1)
+    )
+    labs = Lab.objects.bulk_create(
+        Lab(
+            course_semester=semester,
+            lab_number=k,
+            lab_name=Lab.make_lab_name(k, lab_type),
+            lab_type=lab_type,
+            weight=round(1 / config.labs, 4),
+        )
+        for semester in semesters
+        for k, lab_type in (
+            (k, rng.choice(Lab.LAB_TYPE_CHOICES)[0]) for k in range(1, config.labs + 1)
+        )
+    )
+
+    dataset = Dataset(user=user, teachers=[teacher.email for teacher in teachers])
+    outcomes_by_course = {}
+    for outcome in outcomes:
+        outcomes_by_course.setdefault(outcome.course_id, []).append(outcome)
+        dataset.outcomes.setdefault(outcome.course.course_code, []).append(
+            outcome.outcome_code
+        )
+    for semester in semesters:
+        dataset.semesters.setdefault(semester.course.course_code, []).append(
+            semester.semester_name
+        )
+
+    contributions = []
+    for lab in labs:
+        semester = lab.course_semester
+        dataset.labs.setdefault(
+            (semester.course.course_code, semester.semester_name), []
+        ).append(lab.lab_name)
+        chosen = rng.sample(
+            outcomes_by_course[semester.course_id],
+            min(config.outcomes_per_lab, config.outcomes),
+        )
+        for outcome, percentage in zip(chosen, _split_percentages(rng, len(chosen))):
+            contributions.append(
+                LabLOContribution(
+                    lab=lab,
+                    outcome=outcome,
+                    course_semester=semester,
+                    contribution_percentage=percentage,
+                )
+            )
+    LabLOContribution.objects.bulk_create(contributions)
+
+    course_teachers = []
+    for course in courses:
+        course_teachers.append(CourseTeacher(course=course, teacher=user, role="Lecturer"))
+        for teacher in rng.sample(teachers, min(config.teachers_per_course, len(teachers))):
+            course_teachers.append(
+                CourseTeacher(course=course, teacher=teacher, role=rng.choice(ROLES))
+            )
+    course_teachers = CourseTeacher.objects.bulk_create(course_teachers)
+
+    semesters_by_course = {}
+    for semester in semesters:
+        semesters_by_course.setdefault(semester.course_id, []).append(semester)
+    Through = CourseTeacher.course_semester.through
+    Through.objects.bulk_create(
+        Through(courseteacher_id=course_teacher.pk, coursesemester_id=semester.pk)
+        for course_teacher in course_teachers
+        for semester in semesters_by_course[course_teacher.course_id]
+    )
+    for course_teacher in course_teachers:
+        dataset.course_teachers.setdefault(course_teacher.course.course_code, []).append(
+            course_teacher.pk
+        )
+    return dataset
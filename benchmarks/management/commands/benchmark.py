@@ -0,0 +1,121 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from benchmarks.dataset import DatasetConfig, generate
+from benchmarks.runner import build_report, run_scenario
+from benchmarks.scenarios import SCENARIOS, uncovered_routes
+from LMSSystemBackend.db.pool import close_pools
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with a deterministic dataset, drive "
+        "every course route with concurrent clients and write a JSON report "
+        "of latency percentiles, throughput and queries per request."
+    )
+
+    def add_arguments(self, parser):
+        defaults = DatasetConfig()
+        for name, value in defaults.to_json().items():
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, default=value)
+        parser.add_argument("--requests", type=int, default=200, help="Per scenario.")
+        parser.add_argument("--concurrency", type=int, default=4)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            help="Only run the named scenarios (repeatable).",
+        )
+        parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Measure with the course cache disabled.",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the test database afterwards (it is reused if it exists).",
+        )
+        parser.add_argument("--output", help="Defaults to benchmark-<commit>.json.")
+
+    def handle(self, *args, **options):
+        scenarios = SCENARIOS
+        if options["scenario"]:
+            scenarios = [s for s in SCENARIOS if s.name in options["scenario"]]
+            unknown = set(options["scenario"]) - {s.name for s in scenarios}
+            if unknown:
+                raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        if connection.vendor == "sqlite" and options["concurrency"] > 1:
+            # The in-memory test database locks whole tables, so concurrent
+            # requests fail with "database table is locked".
+            raise CommandError("SQLite only supports --concurrency 1.")
+        for name in uncovered_routes():
+            self.stderr.write(self.style.WARNING(f"No scenario drives the {name} route."))
+
+        config = DatasetConfig(
+            **{name: options[name] for name in DatasetConfig().to_json()}
+        )
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False, keepdb=options["keepdb"]
+        )
+        try:
+            with override_settings(**self.cache_settings(options["no_cache"])):
+                report = self.run(config, scenarios, options)
+        finally:
+            connection.close()
+            # Pooled connections would keep the test database from being dropped.
+            close_pools()
+            if not options["keepdb"]:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = options["output"] or f"benchmark-{report['commit'][:12]}.json"
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Report written to {output}"))
+
+    def cache_settings(self, disabled):
+        if not disabled:
+            return {}
+        caches = dict(settings.CACHES)
+        caches[settings.COURSE_CACHE_ALIAS] = {
+            "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+        }
+        return {"CACHES": caches}
+
+    def run(self, config, scenarios, options):
+        self.stdout.write(f"Seeding {config} ...")
+        dataset = generate(config)
+
+        results = {}
+        self.stdout.write(
+            f"{'scenario':<22} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'queries':>8} {'errors':>6}"
+        )
+        for scenario in scenarios:
+            result = run_scenario(
+                scenario,
+                dataset,
+                requests=options["requests"],
+                concurrency=options["concurrency"],
+                warmup=options["warmup"],
+                seed=config.seed,
+            )
+            results[scenario.name] = result
+            self.stdout.write(
+                f"{scenario.name:<22} {result.throughput_rps:>8.1f} "
+                f"{result.p50_ms:>8.2f} {result.p95_ms:>8.2f} {result.p99_ms:>8.2f} "
+                f"{result.queries_per_request:>8.1f} {result.errors:>6}"
+            )
+
+        run_config = {
+            "dataset": config.to_json(),
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "warmup": options["warmup"],
+            "course_cache": not options["no_cache"],
+        }
+        return build_report(results, run_config)
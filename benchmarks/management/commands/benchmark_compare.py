@@ -0,0 +1,79 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.runner import load_report
+
+COLUMNS = [
+    ("p50_ms", "p50"),
+    ("p95_ms", "p95"),
+    ("p99_ms", "p99"),
+    ("throughput_rps", "rps"),
+    ("queries_per_request", "queries"),
+]
+
+
+def change(base, head):
+    if not base:
+        return 0.0
+    return (head - base) / base * 100
+
+
+class Command(BaseCommand):
+    help = "Compare two benchmark reports scenario by scenario."
+
+    def add_arguments(self, parser):
+        parser.add_argument("base")
+        parser.add_argument("head")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=10.0,
+            help="Percent slowdown of p95 (or drop of throughput) reported as a regression.",
+        )
+        parser.add_argument(
+            "--fail-on-regression",
+            action="store_true",
+            help="Exit with an error when a scenario regressed.",
+        )
+
+    def handle(self, *args, **options):
+        base, head = load_report(options["base"]), load_report(options["head"])
+        if base["config"] != head["config"]:
+            self.stderr.write(
+                self.style.WARNING("The reports were run with different settings.")
+            )
+        self.stdout.write(
+            f"{base['commit'][:12]} -> {head['commit'][:12]}"
+            f"{' (uncommitted changes)' if head['dirty'] else ''}"
+        )
+        self.stdout.write(
+            f"{'scenario':<22}" + "".join(f" {label:>16}" for _, label in COLUMNS)
+        )
+
+        regressions = []
+        threshold = options["threshold"]
+        for name, head_result in head["scenarios"].items():
+            base_result = base["scenarios"].get(name)
+            if base_result is None:
+                self.stdout.write(f"{name:<22} (new)")
+                continue
+            cells = []
+            for key, _ in COLUMNS:
+                delta = change(base_result[key], head_result[key])
+                cells.append(f"{head_result[key]:>8.2f} {delta:>+6.1f}%")
+            self.stdout.write(f"{name:<22}" + "".join(f" {cell:>16}" for cell in cells))
+
+            if (
+                change(base_result["p95_ms"], head_result["p95_ms"]) > threshold
+                or change(base_result["throughput_rps"], head_result["throughput_rps"])
+                < -threshold
+                or head_result["queries_per_request"] > base_result["queries_per_request"]
+            ):
+                regressions.append(name)
+
+        if regressions:
+            message = f"Regressed: {', '.join(regressions)}"
+            if options["fail_on_regression"]:
+                raise CommandError(message)
+            self.stdout.write(self.style.WARNING(message))
+        else:
+            self.stdout.write(self.style.SUCCESS("No regressions."))
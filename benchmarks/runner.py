@@ -0,0 +1,140 @@
+"""
+Concurrent driver for the scenarios and the reports it produces.
+
+Requests go through Django's test client in worker threads, each with its
+own client and database connection, so the figures cover the whole request
+path (middleware, permissions, queries, serialization) without the noise of
+a network server.
+"""
+
+import json
+import math
+import platform
+import random
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+
+from django.conf import settings
+from django.db import connection
+from django.test import Client
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    throughput_rps: float
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    queries_per_request: float
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def _drive(dataset, scenario, requests):
+    client = Client()
+    client.force_login(dataset.user)
+    samples = []
+    try:
+        for url, body in requests:
+            counter = QueryCounter()
+            start = time.perf_counter()
+            try:
+                with connection.execute_wrapper(counter):
+                    if body is None:
+                        response = getattr(client, scenario.method)(url)
+                    else:
+                        response = getattr(client, scenario.method)(
+                            url, body, content_type="application/json"
+                        )
+                status = response.status_code
+            except Exception:
+                # The test client re-raises what the view raised; one failing
+                # request counts as an error instead of ending the run.
+                status = None
+            samples.append((time.perf_counter() - start, counter.count, status))
+    finally:
+        # Hands the thread's connection back (to the pool when there is one).
+        connection.close()
+    return samples
+
+
+def run_scenario(scenario, dataset, requests, concurrency, warmup, seed):
+    rng = random.Random(f"{seed}-{scenario.name}")
+    planned = [scenario.build(rng, dataset) for _ in range(warmup + requests)]
+    _drive(dataset, scenario, planned[:warmup])
+
+    measured = planned[warmup:]
+    batches = [measured[i::concurrency] for i in range(concurrency)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(
+            executor.map(lambda batch: _drive(dataset, scenario, batch), batches)
+        )
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for batch in results for sample in batch]
+    latencies = sorted(latency * 1000 for latency, _, _ in samples)
+    return ScenarioResult(
+        requests=len(samples),
+        errors=sum(status not in scenario.expected for _, _, status in samples),
+        throughput_rps=len(samples) / elapsed,
+        mean_ms=sum(latencies) / len(latencies),
+        p50_ms=percentile(latencies, 0.50),
+        p95_ms=percentile(latencies, 0.95),
+        p99_ms=percentile(latencies, 0.99),
+        queries_per_request=sum(queries for _, queries, _ in samples) / len(samples),
+    )
+
+
+def git_revision():
+    def git(*args):
+        return subprocess.run(
+            ["git", *args],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+
+    try:
+        return git("rev-parse", "HEAD"), bool(git("status", "--porcelain"))
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+
+
+def build_report(results, config):
+    commit, dirty = git_revision()
+    return {
+        "commit": commit,
+        "dirty": dirty,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "database": connection.vendor,
+        "python": platform.python_version(),
+        "config": config,
+        "scenarios": {name: asdict(result) for name, result in results.items()},
+    }
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
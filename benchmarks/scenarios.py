@@ -0,0 +1,153 @@
+"""
+One scenario per route of ``courses/urls.py``. Each scenario picks a random
+course (and semester, lab, ...) of the dataset for every request, so the
+runs spread over the whole dataset like real traffic does.
+"""
+
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+from django.urls import reverse
+
+from courses.urls import urlpatterns
+
+
+@dataclass
+class Scenario:
+    name: str
+    url_name: str
+    method: str = "get"
+    # Statuses that count as success; writes that the seeded data makes
+    # invalid (e.g. generating labs for a full semester) still exercise the
+    # whole validation path.
+    expected: tuple = (200,)
+    kwargs: object = None
+    body: object = None
+    query: object = None
+
+    def build(self, rng, dataset):
+        kwargs = self.kwargs(rng, dataset) if self.kwargs else {}
+        body = self.body(rng, dataset, kwargs) if self.body else None
+        url = reverse(self.url_name, kwargs=kwargs)
+        if self.query:
+            url = f"{url}?{urlencode(self.query(rng, dataset))}"
+        return url, body
+
+
+def course(rng, dataset):
+    return {"course_code": rng.choice(dataset.course_codes)}
+
+
+def semester(rng, dataset):
+    kwargs = course(rng, dataset)
+    kwargs["semester_name"] = rng.choice(dataset.semesters[kwargs["course_code"]])
+    return kwargs
+
+
+def lab(rng, dataset):
+    kwargs = semester(rng, dataset)
+    key = (kwargs["course_code"], kwargs["semester_name"])
+    kwargs["lab_pk"] = rng.choice(dataset.labs[key])
+    return kwargs
+
+
+def outcome(rng, dataset):
+    kwargs = course(rng, dataset)
+    kwargs["outcome_code"] = rng.choice(dataset.outcomes[kwargs["course_code"]])
+    return kwargs
+
+
+def course_teacher(rng, dataset):
+    kwargs = course(rng, dataset)
+    kwargs["pk"] = rng.choice(dataset.course_teachers[kwargs["course_code"]])
+    return kwargs
+
+
+def lab_outcome(rng, dataset):
+    kwargs = lab(rng, dataset)
+    kwargs["outcome_code"] = rng.choice(dataset.outcomes[kwargs["course_code"]])
+    return kwargs
+
+
+def contribution_body(rng, dataset, kwargs):
+    return {
+        "outcome": rng.choice(dataset.outcomes[kwargs["course_code"]]),
+        "contribution_percentage": "10.00",
+    }
+
+
+def search_query(rng, dataset):
+    # A code prefix matches a tenth of the courses, a name word all of them.
+    course_code = rng.choice(dataset.course_codes)
+    return {"q": rng.choice([course_code[:-1], course_code, "benchmark"])}
+
+
+def assignments_body(rng, dataset, kwargs):
+    # Re-assigns existing teachers too, which updates their role.
+    assignments = []
+    for course_code in rng.sample(dataset.course_codes, min(5, len(dataset.course_codes))):
+        assignments.append(
+            {
+                "teacher": rng.choice(dataset.teachers),
+                "course": course_code,
+                "role": rng.choice(["Lecturer", "HeadLecturer", "TA"]),
+                "course_semester": [rng.choice(dataset.semesters[course_code])],
+            }
+        )
+    return {"assignments": assignments}
+
+
+def clone_body(rng, dataset, kwargs):
+    return {"semester_name": f"clone-{rng.randrange(10**9)}"}
+
+
+# Reads first, so the writes at the end don't change the data they measure.
+SCENARIOS = [
+    Scenario("course-list", "course-list"),
+    Scenario("course-search", "course-search", query=search_query),
+    Scenario("course-detail", "course-detail", kwargs=course),
+    Scenario("course-tree", "course-tree", kwargs=course),
+    Scenario("semester-list", "semester-list", kwargs=course),
+    Scenario("semester-detail", "semester-detail", kwargs=semester),
+    Scenario("teacher-list", "teacher-list", kwargs=course),
+    Scenario("teacher-detail", "teacher-detail", kwargs=course_teacher),
+    Scenario("lab-list", "lab-list", kwargs=semester),
+    Scenario("lab-detail", "lab-detail", kwargs=lab),
+    Scenario("lo-list", "lo-list", kwargs=course),
+    Scenario("lo-detail", "lo-detail", kwargs=outcome),
+    Scenario("contribution-matrix", "contribution-matrix", kwargs=semester),
+    # Most random pairs have no contribution: a 404 still runs the lookup.
+    Scenario("lab-lo-detail", "lab-lo-detail", expected=(200, 404), kwargs=lab_outcome),
+    Scenario(
+        "lab-generate", "lab-generate", method="post", expected=(201, 400), kwargs=semester
+    ),
+    Scenario(
+        "lab-lo-list",
+        "lab-lo-list",
+        method="post",
+        expected=(201, 400),
+        kwargs=lab,
+        body=contribution_body,
+    ),
+    Scenario(
+        "teacher-assignments",
+        "teacher-assignments",
+        method="post",
+        expected=(201,),
+        body=assignments_body,
+    ),
+    Scenario(
+        "semester-clone",
+        "semester-clone",
+        method="post",
+        expected=(201, 400),
+        kwargs=semester,
+        body=clone_body,
+    ),
+]
+
+
+def uncovered_routes():
+    """Names of course routes no scenario drives, to catch new endpoints."""
+    covered = {scenario.url_name for scenario in SCENARIOS}
+    return [p.name for p in urlpatterns if p.name not in covered]
@@ -0,0 +1,48 @@
+"""
+Settings for the benchmarks, which always run in a throwaway test database:
+
+    DJANGO_SETTINGS_MODULE=benchmarks.settings python manage.py benchmark
+
+BENCH_DATABASE=postgres (default) uses the server given by the BENCH_PG_*
+variables, BENCH_DATABASE=sqlite an in-memory SQLite database, which only
+supports --concurrency 1.
+"""
+
+import os
+
+os.environ.setdefault("SECRET_KEY", "benchmarks")
+
+from LMSSystemBackend.settings import *  # noqa: E402,F401,F403
+from LMSSystemBackend.settings import DATABASES, INSTALLED_APPS  # noqa: E402
+
+DEBUG = False
+ALLOWED_HOSTS = ["testserver"]
+INSTALLED_APPS = [*INSTALLED_APPS, "benchmarks.apps.BenchmarksConfig"]
+
+BENCH_DATABASE = os.getenv("BENCH_DATABASE", "postgres")
+
+if BENCH_DATABASE == "sqlite":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("BENCH_SQLITE_NAME", "benchmark.sqlite3"),
+            # Tables are created from the models: the early courses
+            # migrations only run on PostgreSQL.
+            "TEST": {"MIGRATE": False},
+        }
+    }
+else:
+    DATABASES["default"].update(
+        {
+            "NAME": os.getenv("BENCH_PG_NAME", "lms_benchmark"),
+            "USER": os.getenv("BENCH_PG_USER", "postgres"),
+            "PASSWORD": os.getenv("BENCH_PG_PASSWORD", ""),
+            "HOST": os.getenv("BENCH_PG_HOST", "localhost"),
+            "PORT": os.getenv("BENCH_PG_PORT", "5432"),
+        }
+    )
+    DATABASES["default"]["OPTIONS"] = {
+        key: value
+        for key, value in DATABASES["default"]["OPTIONS"].items()
+        if key != "sslmode"
+    }
@@ -1,3 +1,73 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR, ChangeList
 
-# Register your models here.
+from courses.models import Course, CourseSemester, CourseTeacher, Lab, LearningOutcome
+from courses.search import search_courses
+from LMSSystemBackend.admin import EstimatedCountMixin
+
+# Searches only match prefixes of columns with case-insensitive prefix
+# indexes on PostgreSQL (course codes and user emails), so that they don't
+# scan the large tables.
+
+
+class CourseChangeList(ChangeList):
+    def get_ordering(self, request, queryset):
+        # Search results stay best first unless a column is sorted.
+        if "rank" in queryset.query.annotations and ORDER_VAR not in self.params:
+            return ["-rank", "course_code", "pk"]
+        return super().get_ordering(request, queryset)
+
+
+@admin.register(Course)
+class CourseAdmin(EstimatedCountMixin, admin.ModelAdmin):
+    list_display = ["course_code", "course_name", "department", "creater"]
+    ordering = ["course_code"]
+    search_fields = ["course_code"]
+
+    def get_changelist(self, request, **kwargs):
+        return CourseChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        # The catalog search, over the GIN index of code, name and department.
+        if not search_term.strip():
+            return queryset, False
+        return search_courses(queryset, search_term), False
+
+
+@admin.register(CourseSemester)
+class CourseSemesterAdmin(EstimatedCountMixin, admin.ModelAdmin):
+    list_display = ["semester_name", "course", "num_of_lab"]
+    list_select_related = ["course"]
+    ordering = ["course", "semester_name"]
+    search_fields = ["^course__course_code"]
+    autocomplete_fields = ["course"]
+
+    def get_queryset(self, request):
+        # __str__ shows the course code, also in the autocomplete results.
+        return super().get_queryset(request).select_related("course")
+
+
+@admin.register(CourseTeacher)
+class CourseTeacherAdmin(EstimatedCountMixin, admin.ModelAdmin):
+    list_display = ["teacher", "course", "role"]
+    list_select_related = ["teacher", "course"]
+    list_filter = ["role"]
+    search_fields = ["^course__course_code", "^teacher__email"]
+    autocomplete_fields = ["course", "teacher", "course_semester"]
+
+
+@admin.register(Lab)
+class LabAdmin(EstimatedCountMixin, admin.ModelAdmin):
+    list_display = ["lab_name", "lab_type", "weight", "course_semester"]
+    list_select_related = ["course_semester__course"]
+    list_filter = ["lab_type"]
+    search_fields = ["^course_semester__course__course_code"]
+    autocomplete_fields = ["course_semester"]
+
+
+@admin.register(LearningOutcome)
+class LearningOutcomeAdmin(EstimatedCountMixin, admin.ModelAdmin):
+    list_display = ["outcome_code", "outcome_name", "course"]
+    list_select_related = ["course"]
+    search_fields = ["^course__course_code"]
+    autocomplete_fields = ["course"]
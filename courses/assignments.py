@@ -0,0 +1,160 @@
+"""
+Bulk assignment of teachers to courses and semesters.
+
+An assignment names a teacher by email, a course by code, a role and
+semester names of that course. All teachers are resolved with one query, all
+courses with their semesters with another and the existing assignments with
+a third, under a lock of the courses; the new course teachers and their
+semester links are then inserted with one ``bulk_create`` each, in the same
+transaction. Nothing is written unless every assignment is valid.
+
+A teacher already assigned to a course keeps that assignment: its role is
+updated and the missing semesters are added. Semesters are never removed.
+"""
+
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from courses.cache import bump_course_version
+from courses.models import Course, CourseTeacher
+from courses.summary import refresh_course_teachers
+from user_profiles.models import UserProfile
+
+BATCH_SIZE = 1000
+# Only the first errors are reported, so a broken file can't exhaust memory.
+MAX_REPORTED_ERRORS = 100
+
+
+class AssignmentError(Exception):
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid assignment(s).")
+        self.errors = errors
+
+
+@dataclass
+class AssignmentResult:
+    created: int = 0
+    updated: int = 0
+
+    def to_json(self):
+        return {"created": self.created, "updated": self.updated}
+
+
+def resolve_assignments(assignments):
+    """
+    ``{(teacher_id, course_id): (role, semester_ids)}`` of ``assignments``,
+    dicts with ``teacher``, ``course``, ``role`` and ``course_semester``
+    (a list of semester names). Raises ``AssignmentError``.
+    """
+    teacher_ids = dict(
+        UserProfile.objects.filter(
+            email__in={assignment["teacher"] for assignment in assignments}
+        ).values_list("email", "id")
+    )
+    course_ids = {}
+    semester_ids = {}
+    courses = Course.objects.filter(
+        course_code__in={assignment["course"] for assignment in assignments}
+    ).values_list(
+        "course_code", "id", "coursesemester_course__semester_name", "coursesemester_course__id"
+    )
+    for course_code, course_id, semester_name, semester_id in courses:
+        course_ids[course_code] = course_id
+        if semester_id is not None:
+            semester_ids[(course_id, semester_name)] = semester_id
+
+    roles = dict(CourseTeacher.TEACHER_ROLE_CHOICES)
+    resolved = {}
+    errors = []
+    for index, assignment in enumerate(assignments):
+        teacher_id = teacher_ids.get(assignment["teacher"])
+        course_id = course_ids.get(assignment["course"])
+        names = assignment.get("course_semester", [])
+        missing = [name for name in names if (course_id, name) not in semester_ids]
+        if teacher_id is None:
+            error = f"Unknown teacher {assignment['teacher']!r}."
+        elif course_id is None:
+            error = f"Unknown course {assignment['course']!r}."
+        elif assignment["role"] not in roles:
+            error = f"Invalid role {assignment['role']!r}."
+        elif missing:
+            error = f"Unknown semester {missing[0]!r} of course {assignment['course']!r}."
+        elif (teacher_id, course_id) in resolved:
+            error = f"{assignment['teacher']} is assigned to {assignment['course']} twice."
+        else:
+            resolved[(teacher_id, course_id)] = (
+                assignment["role"],
+                [semester_ids[(course_id, name)] for name in names],
+            )
+            continue
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"index": index, "error": error})
+    if errors:
+        raise AssignmentError(errors)
+    return resolved
+
+
+def assign_teachers(assignments):
+    """Apply ``assignments`` (see ``resolve_assignments``) in one transaction."""
+    resolved = resolve_assignments(assignments)
+    course_ids = {course_id for _, course_id in resolved}
+
+    with transaction.atomic():
+        # Concurrent assignments to the same courses queue on the course rows,
+        # so each one sees the course teachers the previous ones created.
+        list(
+            Course.objects.select_for_update()
+            .filter(pk__in=course_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        # The oldest assignment of a teacher to a course is the one kept.
+        existing = {}
+        current = (
+            CourseTeacher.objects.filter(
+                teacher__in={teacher_id for teacher_id, _ in resolved},
+                course__in=course_ids,
+            )
+            .order_by("-pk")
+            .values_list("teacher_id", "course_id", "pk", "role")
+        )
+        for teacher_id, course_id, pk, role in current:
+            existing[(teacher_id, course_id)] = (pk, role)
+
+        created = [
+            CourseTeacher(teacher_id=teacher_id, course_id=course_id, role=role)
+            for (teacher_id, course_id), (role, _) in resolved.items()
+            if (teacher_id, course_id) not in existing
+        ]
+        CourseTeacher.objects.bulk_create(created, batch_size=BATCH_SIZE)
+        updated = [
+            CourseTeacher(pk=existing[key][0], role=role)
+            for key, (role, _) in resolved.items()
+            if key in existing and existing[key][1] != role
+        ]
+        CourseTeacher.objects.bulk_update(updated, ["role"], batch_size=BATCH_SIZE)
+
+        course_teacher_ids = {
+            (course_teacher.teacher_id, course_teacher.course_id): course_teacher.pk
+            for course_teacher in created
+        }
+        for key, (pk, _) in existing.items():
+            course_teacher_ids.setdefault(key, pk)
+        Through = CourseTeacher.course_semester.through
+        Through.objects.bulk_create(
+            [
+                Through(courseteacher_id=course_teacher_ids[key], coursesemester_id=semester_id)
+                for key, (_, semester_ids) in resolved.items()
+                for semester_id in semester_ids
+            ],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+        # bulk_create sends no signals.
+        refresh_course_teachers([course_teacher_ids[key] for key in resolved])
+        for course_code in {assignment["course"] for assignment in assignments}:
+            bump_course_version(course_code)
+
+    return AssignmentResult(created=len(created), updated=len(updated))
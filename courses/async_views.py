@@ -0,0 +1,185 @@
+"""
+Async variants of the hot course read endpoints, routed instead of the DRF
+views when ``ASYNC_VIEWS`` is on (asgi.py turns it on).
+
+Each one wraps its DRF view: authentication, permissions and content
+negotiation still run through the view's ``initial()`` (in a thread, as they
+read the session and the course membership), but the data is loaded on the
+async connection pool, with independent queries awaited together. Requests
+other than GET and HEAD are handed to the DRF view unchanged, and responses
+are identical to the ones the DRF views produce.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+
+from courses import views
+from courses.cache import CachedResponseMixin
+from courses.matrix import (
+    ContributionMatrix,
+    contribution_matrix_axes,
+    contribution_matrix_rows,
+)
+from courses.membership import CourseMembershipMixin
+from courses.models import (
+    CourseSemester,
+    Lab,
+    LabLOContribution,
+    LearningOutcome,
+    TeacherCourseSummary,
+)
+from LMSSystemBackend.db.aio import afetch, afetch_instances
+
+
+class AsyncReadView:
+    view_class = None
+
+    @classmethod
+    def as_view(cls):
+        sync_view = cls.view_class.as_view()
+
+        async def view(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+            return await cls().dispatch(request, *args, **kwargs)
+
+        # Like DRF views: session authentication enforces CSRF itself.
+        view.csrf_exempt = True
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        view = self.view_class()
+        view.args = args
+        view.kwargs = kwargs
+        request = view.initialize_request(request, *args, **kwargs)
+        view.request = request
+        view.headers = view.default_response_headers
+        try:
+            await sync_to_async(self.initial)(view, request, *args, **kwargs)
+            if isinstance(view, CachedResponseMixin):
+                response = await view.aget(request, lambda: self.load(view, request))
+            else:
+                response = await self.load(view, request)
+        except Exception as exc:
+            response = view.handle_exception(exc)
+        return view.finalize_response(request, response, *args, **kwargs)
+
+    def initial(self, view, request, *args, **kwargs):
+        view.initial(request, *args, **kwargs)
+        if isinstance(view, CourseMembershipMixin):
+            # Loaded here so that ``load`` only reads it.
+            view.get_membership()
+
+    async def load(self, view, request):
+        raise NotImplementedError
+
+
+class CourseList(AsyncReadView):
+    view_class = views.CourseList
+
+    async def load(self, view, request):
+        serializer_class = view.values_serializer_class
+        queryset = serializer_class.get_values(
+            TeacherCourseSummary.objects.filter(teacher=request.user)
+        )
+        page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+        serializer = serializer_class(page, context=view.get_serializer_context())
+        return view.get_paginated_response(serializer.data)
+
+
+class CourseSemesterDetail(AsyncReadView):
+    view_class = views.CourseSemesterDetail
+
+    async def load(self, view, request):
+        semester = view.get_membership().get_semester(view.kwargs.get("semester_name"))
+        if semester is None:
+            # Not one of the user's semesters: only tells 404 from 403.
+            semester = await sync_to_async(view.get_object)()
+        view.check_object_permissions(request, semester)
+
+        lab_rows, outcome_rows = contribution_matrix_axes(semester)
+        rows, lab_rows, outcome_rows = await asyncio.gather(
+            afetch(contribution_matrix_rows(semester)),
+            afetch(lab_rows),
+            afetch(outcome_rows),
+        )
+        matrix = ContributionMatrix.from_rows(
+            rows,
+            labs=[name for name, in lab_rows],
+            outcomes=[code for code, in outcome_rows],
+        )
+        context = view.get_serializer_context()
+        context["contribution_matrices"] = {semester.pk: matrix}
+        return views.Response(view.get_serializer(semester, context=context).data)
+
+
+class LabList(AsyncReadView):
+    view_class = views.LabList
+
+    async def load(self, view, request):
+        serializer_class = view.values_serializer_class
+        queryset = serializer_class.get_values(
+            Lab.objects.filter(course_semester=view.get_semester())
+        )
+        page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+        serializer = serializer_class(page, context=view.get_serializer_context())
+        return view.get_paginated_response(serializer.data)
+
+
+class CourseTree(AsyncReadView):
+    view_class = views.CourseTree
+
+    def initial(self, view, request, *args, **kwargs):
+        super().initial(view, request, *args, **kwargs)
+        # Queries the course when the user has no assignment in it (a
+        # superuser), and raises NotFound for a missing one.
+        view.get_course()
+
+    async def load(self, view, request):
+        course = view.get_course()
+        semesters = CourseSemester.objects.filter(course=course).order_by("id")
+        labs = Lab.objects.filter(course_semester__course=course).order_by(
+            "lab_number", "id"
+        )
+        contributions = LabLOContribution.objects.filter(
+            course_semester__course=course
+        ).order_by("outcome__outcome_code")
+        semester_name = request.query_params.get("semester")
+        if semester_name:
+            semesters = semesters.filter(semester_name=semester_name)
+            labs = labs.filter(course_semester__semester_name=semester_name)
+            contributions = contributions.filter(
+                course_semester__semester_name=semester_name
+            )
+
+        semesters, labs, contributions, outcomes = await asyncio.gather(
+            afetch_instances(semesters),
+            afetch_instances(labs),
+            afetch_instances(
+                contributions, fields=["id", "lab_id", "outcome_id", "contribution_percentage"]
+            ),
+            afetch_instances(
+                LearningOutcome.objects.filter(course=course).order_by("outcome_code")
+            ),
+        )
+        if semester_name and not semesters:
+            raise views.exceptions.NotFound("The requested semester does not exist.")
+
+        outcomes_by_id = {outcome.pk: outcome for outcome in outcomes}
+        labs_by_id = {}
+        for lab in labs:
+            lab.tree_contributions = []
+            labs_by_id[lab.pk] = lab
+        for contribution in contributions:
+            contribution.outcome = outcomes_by_id.get(contribution.outcome_id)
+            labs_by_id[contribution.lab_id].tree_contributions.append(contribution)
+        semesters_by_id = {}
+        for semester in semesters:
+            semester.tree_labs = []
+            semesters_by_id[semester.pk] = semester
+        for lab in labs:
+            semesters_by_id[lab.course_semester_id].tree_labs.append(lab)
+        course.tree_semesters = semesters
+        course.tree_outcomes = outcomes
+        return views.Response(view.get_serializer(course).data)
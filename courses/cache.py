@@ -0,0 +1,303 @@
+"""
+Versioned cache and conditional GET support for the read endpoints of the
+course tree.
+
+Every course has a version (a ``time_ns`` timestamp) stored in the cache.
+Cached responses embed the version in their key, so bumping it makes all of
+the course's entries unreachable at once; they then age out through the
+backend's own eviction. Versions are bumped by the signal handlers in
+``courses.signals`` and, for bulk writes that skip signals, by the code doing
+the write. The version also serves as the ETag and Last-Modified of the
+responses, so unchanged resources are revalidated without building a body.
+
+In a shared cache versions never expire. In a per-process one (local memory)
+a worker never sees the bumps made by the others, so there versions expire
+after ``COURSE_VERSION_TIMEOUT`` seconds, which bounds how long a worker
+serves stale entries and 304s.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from courses.models import Course, CourseSemester
+from LMSSystemBackend.db.router import read_alias
+
+
+def get_cache():
+    return caches[settings.COURSE_CACHE_ALIAS]
+
+
+class CacheStats:
+    """Hit and miss counters of this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def reset(self):
+        with self._lock:
+            self.hits = self.misses = 0
+
+    def to_json(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
+
+
+stats = CacheStats()
+
+
+def _version_key(course_code):
+    return f"courses:version:{course_code}"
+
+
+def get_course_version(course_code):
+    cache = get_cache()
+    key = _version_key(course_code)
+    version = cache.get(key)
+    if version is None:
+        # First read, or the version was evicted: start a new one. add() keeps
+        # a version set concurrently by another process.
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=settings.COURSE_VERSION_TIMEOUT):
+            version = cache.get(key, version)
+    return version
+
+
+async def aget_course_version(course_code):
+    cache = get_cache()
+    key = _version_key(course_code)
+    version = await cache.aget(key)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(key, version, timeout=settings.COURSE_VERSION_TIMEOUT):
+            version = await cache.aget(key, version)
+    return version
+
+
+class PendingBumps:
+    """
+    The courses a transaction invalidates, bumped once each when it commits,
+    and the codes of the courses and semesters it has looked up.
+    """
+
+    def __init__(self):
+        self.course_codes = set()
+        self.by_course = {}
+        self.by_semester = {}
+        self.flushed = False
+
+    def flush(self):
+        self.flushed = True
+        version = time.time_ns()
+        get_cache().set_many(
+            {_version_key(code): version for code in self.course_codes},
+            timeout=settings.COURSE_VERSION_TIMEOUT,
+        )
+
+    def is_pending(self, connection):
+        return not self.flushed and any(
+            func == self.flush for _, func, _ in connection.run_on_commit
+        )
+
+
+def pending_bumps():
+    """
+    The ``PendingBumps`` of the current transaction, flushed on commit, or
+    ``None`` outside of one. There is one per savepoint level: a rolled back
+    savepoint drops its bumps with its ``on_commit`` hook.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        return None
+    # Blocks without a savepoint (None) are rolled back with the one around.
+    level = tuple(sid for sid in connection.savepoint_ids if sid is not None)
+    # Savepoint ids are reused by later transactions, so a level only counts
+    # while its hook is registered.
+    levels = {
+        key: bumps
+        for key, bumps in getattr(connection, "course_version_bumps", {}).items()
+        if key == level[: len(key)] and bumps.is_pending(connection)
+    }
+    if level not in levels:
+        levels[level] = PendingBumps()
+        transaction.on_commit(levels[level].flush)
+    connection.course_version_bumps = levels
+    return levels[level]
+
+
+def bump_course_version(course_code):
+    """
+    Invalidate every cached response of the course once the current
+    transaction commits, so no reader can cache the data it replaces.
+    """
+    if course_code is None:
+        return
+    bumps = pending_bumps()
+    if bumps is None:
+        get_cache().set(
+            _version_key(course_code),
+            time.time_ns(),
+            timeout=settings.COURSE_VERSION_TIMEOUT,
+        )
+    else:
+        bumps.course_codes.add(course_code)
+
+
+def course_code_for(instance):
+    """
+    The code of the course a ``courses`` model instance belongs to, looked up
+    once per course or semester in a transaction.
+    """
+    if isinstance(instance, Course):
+        return instance.course_code
+    bumps = pending_bumps()
+    if hasattr(instance, "course_id"):
+        if instance._meta.get_field("course").is_cached(instance):
+            return instance.course.course_code
+        cached, key = getattr(bumps, "by_course", {}), instance.course_id
+        courses = Course.objects.filter(pk=instance.course_id)
+    else:
+        if instance._meta.get_field("course_semester").is_cached(instance):
+            semester = instance.course_semester
+            if CourseSemester.course.field.is_cached(semester):
+                return semester.course.course_code
+        cached, key = getattr(bumps, "by_semester", {}), instance.course_semester_id
+        courses = Course.objects.filter(
+            coursesemester_course=instance.course_semester_id
+        )
+    if key not in cached:
+        cached[key] = courses.values_list("course_code", flat=True).first()
+    return cached[key]
+
+
+def may_cache(version):
+    """
+    Whether a response read at ``version`` may be cached. Replicas can lag
+    behind the write that set a recent version, so what they return is only
+    cached once the version is older than the lag they are allowed.
+    """
+    if read_alias.get() is None:
+        return True
+    return time.time_ns() - version > settings.REPLICA_STICKY_SECONDS * 10**9
+
+
+def response_cache_key(course_code, version, view_name, semester_name=None, query=""):
+    return f"courses:{course_code}:{version}:{view_name}:{semester_name or ''}:{query}"
+
+
+class CachedResponseMixin:
+    """
+    Answer GET requests from the course version: a conditional request whose
+    ETag or Last-Modified still matches gets a 304 before any data is read,
+    and other successful responses are served from the course cache.
+
+    Neither the version nor the cache key depends on the user, so every check
+    of the uncached response must run first: the request permissions run in
+    ``initial`` as usual, followed by ``check_cache_permissions`` for those
+    applying to an object. The async views call ``initial`` too.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in ("GET", "HEAD"):
+            self.check_cache_permissions()
+
+    def check_cache_permissions(self):
+        """
+        Views with object permissions resolve their object here, which runs
+        ``check_object_permissions``.
+        """
+
+    def get_response_cache_key(self, version):
+        return response_cache_key(
+            self.kwargs.get("course_code"),
+            version,
+            type(self).__name__,
+            self.kwargs.get("semester_name"),
+            self.request.GET.urlencode(),
+        )
+
+    def get_etag(self, version):
+        # JSON and the browsable API are different representations.
+        return f'"{version}-{self.request.accepted_renderer.format}"'
+
+    def get_validators(self, version):
+        return {
+            "ETag": self.get_etag(version),
+            "Last-Modified": http_date(version // 10**9),
+        }
+
+    def get_not_modified(self, request, validators, version):
+        not_modified = get_conditional_response(
+            request, etag=validators["ETag"], last_modified=version // 10**9
+        )
+        if not_modified is not None:
+            self.set_validators(not_modified, validators)
+        return not_modified
+
+    def get(self, request, *args, **kwargs):
+        version = get_course_version(self.kwargs.get("course_code"))
+        validators = self.get_validators(version)
+        not_modified = self.get_not_modified(request, validators, version)
+        if not_modified is not None:
+            return not_modified
+
+        cache = get_cache()
+        key = self.get_response_cache_key(version)
+        data = cache.get(key)
+        stats.record(hit=data is not None)
+        if data is not None:
+            return self.set_validators(Response(data), validators)
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200 and may_cache(version):
+            cache.set(key, response.data, timeout=settings.COURSE_CACHE_TIMEOUT)
+            self.set_validators(response, validators)
+        return response
+
+    async def aget(self, request, load):
+        """``get`` for the async views, with ``load`` building the response."""
+        version = await aget_course_version(self.kwargs.get("course_code"))
+        validators = self.get_validators(version)
+        not_modified = self.get_not_modified(request, validators, version)
+        if not_modified is not None:
+            return not_modified
+
+        cache = get_cache()
+        key = self.get_response_cache_key(version)
+        data = await cache.aget(key)
+        stats.record(hit=data is not None)
+        if data is not None:
+            return self.set_validators(Response(data), validators)
+
+        response = await load()
+        if response.status_code == 200 and may_cache(version):
+            await cache.aset(key, response.data, timeout=settings.COURSE_CACHE_TIMEOUT)
+            self.set_validators(response, validators)
+        return response
+
+    def set_validators(self, response, validators):
+        for header, value in validators.items():
+            response[header] = value
+        # Clients may keep the response but must revalidate it before use.
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
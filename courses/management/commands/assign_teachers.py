@@ -0,0 +1,52 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.assignments import AssignmentError, assign_teachers
+
+COLUMNS = ("teacher", "course", "role", "course_semester")
+
+
+class Command(BaseCommand):
+    help = (
+        "Assign teachers to courses and semesters from a CSV file with the "
+        "columns teacher (email), course (code), role and course_semester "
+        "(semester names separated by ';')."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path")
+        parser.add_argument("--encoding", default="utf-8-sig")
+
+    def handle(self, *args, **options):
+        with open(options["csv_path"], encoding=options["encoding"], newline="") as f:
+            reader = csv.DictReader(f)
+            missing = set(COLUMNS) - set(reader.fieldnames or ())
+            if missing:
+                raise CommandError(f"The CSV header must contain {', '.join(COLUMNS)}.")
+            assignments = [
+                {
+                    "teacher": (row["teacher"] or "").strip(),
+                    "course": (row["course"] or "").strip(),
+                    "role": (row["role"] or "").strip(),
+                    "course_semester": [
+                        name.strip()
+                        for name in (row["course_semester"] or "").split(";")
+                        if name.strip()
+                    ],
+                }
+                for row in reader
+            ]
+
+        try:
+            result = assign_teachers(assignments)
+        except AssignmentError as e:
+            for error in e.errors:
+                # Line 1 is the header.
+                self.stderr.write(f"line {error['index'] + 2}: {error['error']}")
+            raise CommandError(str(e))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {result.created} and updated {result.updated} assignments."
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from courses.summary import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the course list summaries of every course teacher."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            summaries = rebuild_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {summaries} course summaries."))
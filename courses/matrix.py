@@ -0,0 +1,150 @@
+import re
+
+from django.db.models import Prefetch
+
+from courses.models import CourseSemester, Lab, LabLOContribution, LearningOutcome
+
+
+MATRIX_ATTR = "matrix_contributions"
+MATRIX_LABS_ATTR = "matrix_labs"
+MATRIX_OUTCOMES_ATTR = "matrix_outcomes"
+
+
+def natural_sort_key(name):
+    """Natural order for lab names and outcome codes (Lab9 before Lab10)."""
+    return [
+        int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)
+    ]
+
+
+def contribution_matrix_rows(semester):
+    """``(lab_name, outcome_code, percentage)`` rows for ``from_rows``."""
+    return LabLOContribution.objects.filter(course_semester=semester).values_list(
+        "lab__lab_name", "outcome__outcome_code", "contribution_percentage"
+    )
+
+
+def contribution_matrix_axes(semester):
+    """
+    ``(lab_name,)`` rows of the semester's labs and ``(outcome_code,)`` rows
+    of its course's outcomes, the axes for ``from_rows``.
+    """
+    return (
+        Lab.objects.filter(course_semester=semester).values_list("lab_name"),
+        LearningOutcome.objects.filter(course=semester.course_id).values_list(
+            "outcome_code"
+        ),
+    )
+
+
+def contribution_matrix_prefetches():
+    """
+    The queries that feed ``ContributionMatrix.for_semester``; add them to any
+    ``CourseSemester`` queryset with ``prefetch_related``.
+    """
+    return [
+        Prefetch(
+            "contribution_semester",
+            queryset=LabLOContribution.objects.select_related("lab", "outcome").only(
+                "course_semester",
+                "contribution_percentage",
+                "lab__lab_name",
+                "outcome__outcome_code",
+            ),
+            to_attr=MATRIX_ATTR,
+        ),
+        Prefetch(
+            "lab_set",
+            queryset=Lab.objects.only("course_semester", "lab_name"),
+            to_attr=MATRIX_LABS_ATTR,
+        ),
+        Prefetch(
+            "course__outcome_course",
+            queryset=LearningOutcome.objects.only("course", "outcome_code"),
+            to_attr=MATRIX_OUTCOMES_ATTR,
+        ),
+    ]
+
+
+class ContributionMatrix:
+    """
+    Lab x learning outcome contribution percentages of one semester: the
+    semester's labs are rows, its course's outcome codes are columns and every
+    cell holds a percentage (0 when the lab does not contribute to the
+    outcome).
+    """
+
+    def __init__(self, labs, outcomes, cells):
+        self.labs = list(labs)
+        self.outcomes = list(outcomes)
+        self.cells = cells
+
+    @classmethod
+    def from_contributions(cls, contributions, labs=(), outcomes=()):
+        return cls.from_rows(
+            (
+                (
+                    contribution.lab.lab_name,
+                    contribution.outcome and contribution.outcome.outcome_code,
+                    contribution.contribution_percentage,
+                )
+                for contribution in contributions
+            ),
+            labs,
+            outcomes,
+        )
+
+    @classmethod
+    def from_rows(cls, rows, labs=(), outcomes=()):
+        """
+        Build from ``(lab_name, outcome_code, percentage)`` rows. ``labs`` and
+        ``outcomes`` name every row and column, so that labs and outcomes
+        without contributions show as zeros.
+        """
+        values = {}
+        for lab, outcome, percentage in rows:
+            if outcome is None:
+                continue
+            values[(lab, outcome)] = float(percentage)
+        labs = sorted({*labs, *(lab for lab, _ in values)}, key=natural_sort_key)
+        outcomes = sorted(
+            {*outcomes, *(outcome for _, outcome in values)}, key=natural_sort_key
+        )
+        cells = [[values.get((lab, outcome), 0.0) for outcome in outcomes] for lab in labs]
+        return cls(labs, outcomes, cells)
+
+    @classmethod
+    def for_semester(cls, semester):
+        """
+        Build the matrix from the contributions, labs and outcomes prefetched
+        with ``contribution_matrix_prefetches``, querying those that weren't.
+        """
+        contributions = getattr(semester, MATRIX_ATTR, None)
+        if contributions is None:
+            contributions = contribution_matrix_prefetches()[0].queryset.filter(
+                course_semester=semester
+            )
+        lab_rows, outcome_rows = contribution_matrix_axes(semester)
+        labs = getattr(semester, MATRIX_LABS_ATTR, None)
+        if labs is not None:
+            lab_rows = [(lab.lab_name,) for lab in labs]
+        course = None
+        if CourseSemester.course.field.is_cached(semester):
+            course = semester.course
+        outcomes = getattr(course, MATRIX_OUTCOMES_ATTR, None)
+        if outcomes is not None:
+            outcome_rows = [(outcome.outcome_code,) for outcome in outcomes]
+        labs = [name for name, in lab_rows]
+        outcomes = [code for code, in outcome_rows]
+        return cls.from_contributions(contributions, labs, outcomes)
+
+    def get(self, lab_name, outcome_code):
+        try:
+            row = self.labs.index(lab_name)
+            column = self.outcomes.index(outcome_code)
+        except ValueError:
+            return 0.0
+        return self.cells[row][column]
+
+    def to_json(self):
+        return {"labs": self.labs, "outcomes": self.outcomes, "cells": self.cells}
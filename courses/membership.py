@@ -0,0 +1,107 @@
+from rest_framework import exceptions
+
+from courses.models import Course, CourseSemester, CourseTeacher
+
+
+class CourseMembership:
+    """
+    The requesting user's teaching assignments for one course, loaded with a
+    single query and shared by the permission classes and the views.
+    """
+
+    def __init__(self, course_code, course=None, roles=(), semesters=()):
+        self.course_code = course_code
+        self.roles = frozenset(roles)
+        self.semesters = {semester.semester_name: semester for semester in semesters}
+        self._course = course
+
+    @property
+    def is_member(self):
+        return bool(self.roles)
+
+    @property
+    def semester_ids(self):
+        return {semester.pk for semester in self.semesters.values()}
+
+    def has_semester(self, semester_name):
+        return semester_name in self.semesters
+
+    def get_semester(self, semester_name):
+        return self.semesters.get(semester_name)
+
+    @property
+    def course(self):
+        """
+        The course instance; only hits the database when the user has no
+        assignment in it (e.g. a superuser managing someone else's course).
+        """
+        if self._course is None:
+            self._course = Course.objects.filter(course_code=self.course_code).first()
+        return self._course
+
+
+def _field_names(model):
+    return [field.attname for field in model._meta.concrete_fields if not field.is_relation]
+
+
+def load_course_membership(user, course_code):
+    course_fields = _field_names(Course)
+    semester_fields = _field_names(CourseSemester)
+    rows = CourseTeacher.objects.filter(
+        teacher=user, course__course_code=course_code
+    ).values_list(
+        "role",
+        *(f"course__{field}" for field in course_fields),
+        *(f"course_semester__{field}" for field in semester_fields),
+    )
+
+    course = None
+    roles = set()
+    semesters = {}
+    for role, *values in rows:
+        course_values = values[: len(course_fields)]
+        semester_values = values[len(course_fields) :]
+        if course is None:
+            course = Course.from_db(rows.db, course_fields, course_values)
+        roles.add(role)
+        semester_id = semester_values[semester_fields.index("id")]
+        if semester_id is not None and semester_id not in semesters:
+            semester = CourseSemester.from_db(rows.db, semester_fields, semester_values)
+            semester.course = course
+            semesters[semester_id] = semester
+
+    return CourseMembership(course_code, course, roles, semesters.values())
+
+
+def get_course_membership(request, course_code):
+    """
+    Return the membership of ``request.user`` for ``course_code``, querying it
+    at most once per request.
+    """
+    cache = getattr(request, "_course_memberships", None)
+    if cache is None:
+        cache = request._course_memberships = {}
+    if course_code not in cache:
+        user = request.user
+        if user is None or not user.is_authenticated or course_code is None:
+            cache[course_code] = CourseMembership(course_code)
+        else:
+            cache[course_code] = load_course_membership(user, course_code)
+    return cache[course_code]
+
+
+class CourseMembershipMixin:
+    def get_membership(self):
+        return get_course_membership(self.request, self.kwargs.get("course_code"))
+
+    def get_course(self):
+        course = self.get_membership().course
+        if course is None:
+            raise exceptions.NotFound("The requested course does not exist.")
+        return course
+
+    def get_semester(self):
+        semester = self.get_membership().get_semester(self.kwargs.get("semester_name"))
+        if semester is None:
+            raise exceptions.NotFound("The requested semester does not exist.")
+        return semester
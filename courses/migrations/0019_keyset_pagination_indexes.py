@@ -0,0 +1,33 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0018_remove_lablocontribution_learning_outcome_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursesemester',
+            index=models.Index(fields=['course', 'id'], name='courses_cou_course__62d376_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='courseteacher',
+            index=models.Index(fields=['teacher', 'id'], name='courses_cou_teacher_b58813_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='courseteacher',
+            index=models.Index(fields=['course', 'id'], name='courses_cou_course__9bbafd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lab',
+            index=models.Index(fields=['course_semester', 'lab_name'], name='courses_lab_course__96128f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='learningoutcome',
+            index=models.Index(fields=['course', 'id'], name='courses_lea_course__01ffe4_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+import re
+
+from django.db import migrations, models
+
+
+def populate_lab_numbers(apps, schema_editor):
+    CourseSemester = apps.get_model("courses", "CourseSemester")
+    Lab = apps.get_model("courses", "Lab")
+
+    labs = list(Lab.objects.only("lab_name", "course_semester"))
+    counters = {}
+    for lab in labs:
+        match = re.match(r"Lab(\d+)", lab.lab_name)
+        lab.lab_number = int(match.group(1)) if match else 0
+        counters[lab.course_semester_id] = max(
+            counters.get(lab.course_semester_id, 0), lab.lab_number
+        )
+    Lab.objects.bulk_update(labs, ["lab_number"], batch_size=500)
+    for semester_id, lab_counter in counters.items():
+        CourseSemester.objects.filter(pk=semester_id).update(lab_counter=lab_counter)
+
+
+def copy_contribution_lab_names(apps, schema_editor):
+    LabLOContribution = apps.get_model("courses", "LabLOContribution")
+    LabLOContribution.objects.update(lab_name=models.F("lab_id"))
+
+
+class Migration(migrations.Migration):
+    """
+    First of three steps giving Lab a surrogate primary key, so that lab names
+    only have to be unique within their semester: number the existing labs
+    and keep a per-semester counter, and remember each contribution's lab by
+    name before the old key goes away.
+    """
+
+    dependencies = [
+        ("courses", "0019_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="coursesemester",
+            name="lab_counter",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="lab",
+            name="lab_number",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_lab_numbers, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name="lablocontribution",
+            name="lab_name",
+            field=models.CharField(max_length=50, null=True),
+        ),
+        migrations.RunPython(copy_contribution_lab_names, migrations.RunPython.noop),
+    ]
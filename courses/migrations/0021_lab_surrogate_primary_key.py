@@ -0,0 +1,58 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def relink_contribution_labs(apps, schema_editor):
+    Lab = apps.get_model("courses", "Lab")
+    LabLOContribution = apps.get_model("courses", "LabLOContribution")
+    # Lab names are still globally unique at this point.
+    LabLOContribution.objects.update(
+        lab=Subquery(Lab.objects.filter(lab_name=OuterRef("lab_name")).values("id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+    """Swap Lab's primary key from lab_name to id and re-point contributions."""
+
+    dependencies = [
+        ("courses", "0020_lab_number_and_semester_lab_counter"),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name="lablocontribution",
+            name="lab",
+        ),
+        migrations.RemoveIndex(
+            model_name="lab",
+            name="courses_lab_course__96128f_idx",
+        ),
+        migrations.AlterField(
+            model_name="lab",
+            name="lab_name",
+            field=models.CharField(max_length=50),
+        ),
+        migrations.AddField(
+            model_name="lab",
+            name="id",
+            field=models.BigAutoField(
+                auto_created=True,
+                primary_key=True,
+                serialize=False,
+                verbose_name="ID",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="lablocontribution",
+            name="lab",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="contribution_lab",
+                to="courses.lab",
+            ),
+        ),
+        migrations.RunPython(relink_contribution_labs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0021_lab_surrogate_primary_key"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="lablocontribution",
+            name="lab",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="contribution_lab",
+                to="courses.lab",
+            ),
+        ),
+        migrations.RemoveField(
+            model_name="lablocontribution",
+            name="lab_name",
+        ),
+        migrations.AddIndex(
+            model_name="lab",
+            index=models.Index(
+                fields=["course_semester", "id"], name="courses_lab_course__7e96ef_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="lab",
+            constraint=models.UniqueConstraint(
+                fields=("course_semester", "lab_name"),
+                name="unique_lab_name_per_semester",
+            ),
+        ),
+    ]
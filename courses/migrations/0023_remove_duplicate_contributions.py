@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+def remove_duplicate_contributions(apps, schema_editor):
+    LabLOContribution = apps.get_model("courses", "LabLOContribution")
+    # Keep the most recent row of every (lab, outcome) pair.
+    latest = (
+        LabLOContribution.objects.values("lab", "outcome")
+        .annotate(latest_id=models.Max("id"), rows=models.Count("id"))
+        .filter(rows__gt=1)
+    )
+    for pair in latest:
+        LabLOContribution.objects.filter(
+            lab=pair["lab"], outcome=pair["outcome"], id__lt=pair["latest_id"]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0022_lab_name_unique_per_semester"),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_contributions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0023_remove_duplicate_contributions"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="lablocontribution",
+            constraint=models.UniqueConstraint(
+                fields=("lab", "outcome"), name="unique_contribution_per_lab_outcome"
+            ),
+        ),
+    ]
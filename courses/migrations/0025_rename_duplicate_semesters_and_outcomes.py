@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def rename_duplicates(model, field):
+    """
+    Give every row but the oldest of each (course, ``field``) group a unique
+    name ending in ``~<id>``, so that no data is lost and the duplicates can
+    be merged or deleted by hand.
+    """
+    max_length = model._meta.get_field(field).max_length
+    groups = (
+        model.objects.values("course", field)
+        .annotate(first_id=models.Min("id"), rows=models.Count("id"))
+        .filter(rows__gt=1)
+    )
+    for group in groups:
+        duplicates = model.objects.filter(
+            course=group["course"], **{field: group[field]}, id__gt=group["first_id"]
+        )
+        for row in duplicates:
+            suffix = f"~{row.id}"
+            setattr(row, field, getattr(row, field)[: max_length - len(suffix)] + suffix)
+            row.save(update_fields=[field])
+
+
+def rename_duplicate_semesters_and_outcomes(apps, schema_editor):
+    rename_duplicates(apps.get_model("courses", "CourseSemester"), "semester_name")
+    rename_duplicates(apps.get_model("courses", "LearningOutcome"), "outcome_code")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0024_lablocontribution_unique_contribution_per_lab_outcome"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            rename_duplicate_semesters_and_outcomes, migrations.RunPython.noop
+        ),
+    ]
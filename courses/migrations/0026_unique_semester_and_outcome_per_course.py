@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0025_rename_duplicate_semesters_and_outcomes"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="coursesemester",
+            constraint=models.UniqueConstraint(
+                fields=("course", "semester_name"),
+                name="unique_semester_name_per_course",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="learningoutcome",
+            constraint=models.UniqueConstraint(
+                fields=("course", "outcome_code"),
+                name="unique_outcome_code_per_course",
+            ),
+        ),
+    ]
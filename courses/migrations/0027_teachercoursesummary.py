@@ -0,0 +1,76 @@
+# Generated by Django 4.2.10 on 2026-10-18 09:23
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_summaries(apps, schema_editor):
+    CourseTeacher = apps.get_model("courses", "CourseTeacher")
+    Lab = apps.get_model("courses", "Lab")
+    LearningOutcome = apps.get_model("courses", "LearningOutcome")
+    TeacherCourseSummary = apps.get_model("courses", "TeacherCourseSummary")
+
+    semesters = {}
+    links = (
+        CourseTeacher.course_semester.through.objects.order_by("id")
+        .values_list("courseteacher_id", "coursesemester_id", "coursesemester__semester_name")
+    )
+    for course_teacher_id, semester_id, semester_name in links.iterator():
+        semesters.setdefault(course_teacher_id, []).append((semester_id, semester_name))
+    lab_counts = dict(
+        Lab.objects.order_by().values_list("course_semester").annotate(models.Count("id"))
+    )
+    outcome_counts = dict(
+        LearningOutcome.objects.order_by().values_list("course").annotate(models.Count("id"))
+    )
+
+    course_teachers = CourseTeacher.objects.values_list(
+        "pk", "teacher_id", "course_id", "course__course_code", "course__course_name", "role"
+    )
+    summaries = []
+    for pk, teacher_id, course_id, course_code, course_name, role in course_teachers.iterator():
+        assigned = semesters.get(pk, [])
+        summaries.append(
+            TeacherCourseSummary(
+                course_teacher_id=pk,
+                teacher_id=teacher_id,
+                course_id=course_id,
+                course_code=course_code,
+                course_name=course_name,
+                role=role,
+                semester_names=[name for _, name in assigned],
+                lab_count=sum(lab_counts.get(semester_id, 0) for semester_id, _ in assigned),
+                outcome_count=outcome_counts.get(course_id, 0),
+            )
+        )
+    TeacherCourseSummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('courses', '0026_unique_semester_and_outcome_per_course'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeacherCourseSummary',
+            fields=[
+                ('course_teacher', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='courses.courseteacher')),
+                ('course_code', models.CharField(max_length=50, null=True)),
+                ('course_name', models.CharField(max_length=255)),
+                ('role', models.CharField(max_length=100)),
+                ('semester_names', models.JSONField(default=list)),
+                ('lab_count', models.PositiveIntegerField(default=0)),
+                ('outcome_count', models.PositiveIntegerField(default=0)),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='courses.course')),
+                ('teacher', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['teacher', 'course_teacher'], name='courses_tea_teacher_04db1c_idx')],
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+# PostgreSQL only, and the trigram ones only where pg_trgm is available; see
+# courses/search.py. They are not declared on the model, which would make
+# them fail on other databases.
+
+
+def search_indexes():
+    return [
+        GinIndex(
+            SearchVector("course_code", "course_name", "department", config="simple"),
+            name="course_search_idx",
+        ),
+    ]
+
+
+def trigram_indexes():
+    return [
+        GinIndex(OpClass("course_code", name="gin_trgm_ops"), name="course_code_trgm_idx"),
+        GinIndex(OpClass("course_name", name="gin_trgm_ops"), name="course_name_trgm_idx"),
+    ]
+
+
+def trigram_available(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        return cursor.fetchone() is not None
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Course = apps.get_model("courses", "Course")
+    indexes = search_indexes()
+    if trigram_available(schema_editor):
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        indexes += trigram_indexes()
+    for index in indexes:
+        schema_editor.add_index(Course, index)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for index in search_indexes() + trigram_indexes():
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0027_teachercoursesummary"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,35 @@
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+# Case-insensitive prefix index on course codes for the admin searches, see
+# user_profiles migration 0005.
+
+
+def prefix_index():
+    return models.Index(
+        OpClass(Upper("course_code"), name="text_pattern_ops"), name="course_code_prefix_idx"
+    )
+
+
+def create_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("courses", "Course"), prefix_index())
+
+
+def drop_prefix_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"DROP INDEX IF EXISTS {schema_editor.quote_name(prefix_index().name)}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0028_course_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_index, drop_prefix_index),
+    ]
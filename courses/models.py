@@ -1,4 +1,6 @@
-from django.db import models
+import re
+
+from django.db import models, transaction
 from user_profiles.models import UserProfile
 from django.core.validators import MaxValueValidator, MinValueValidator
 
@@ -33,6 +35,38 @@ class CourseSemester(models.Model):
         Course, related_name="coursesemester_course", on_delete=models.CASCADE
     )
     num_of_lab = models.IntegerField()
+    # Last lab number handed out in this semester, see allocate_lab_numbers().
+    lab_counter = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "semester_name"],
+                name="unique_semester_name_per_course",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["course", "id"]),
+        ]
+
+    def allocate_lab_numbers(self, count=1):
+        """
+        Reserve ``count`` consecutive lab numbers for this semester.
+
+        The counter row is incremented in place, so concurrent writers queue
+        on its row lock and never receive the same number.
+        """
+        semesters = CourseSemester.objects.filter(pk=self.pk)
+        with transaction.atomic(savepoint=False):
+            semesters.update(lab_counter=models.F("lab_counter") + count)
+            self.lab_counter = semesters.values_list("lab_counter", flat=True).get()
+        return range(self.lab_counter - count + 1, self.lab_counter + 1)
+
+    def reserve_lab_number(self, lab_number):
+        """Keep the counter ahead of a lab number chosen by hand."""
+        CourseSemester.objects.filter(pk=self.pk, lab_counter__lt=lab_number).update(
+            lab_counter=lab_number
+        )
 
     def __str__(self):
         return f"Semester {self.semester_name} of {self.course.course_code}"
@@ -47,19 +81,39 @@ class Lab(models.Model):
     weight = models.FloatField(
         validators=[MinValueValidator(0.0), MaxValueValidator(1.0)]
     )
-    lab_name = models.CharField(primary_key=True, max_length=50, unique=True)
+    lab_number = models.PositiveIntegerField(default=0)
+    lab_name = models.CharField(max_length=50)
     lab_type = models.CharField(max_length=50, choices=LAB_TYPE_CHOICES)
 
     course_semester = models.ForeignKey(CourseSemester, on_delete=models.CASCADE)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course_semester", "lab_name"],
+                name="unique_lab_name_per_semester",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["course_semester", "id"]),
+        ]
+
+    @staticmethod
+    def make_lab_name(lab_number, lab_type):
+        return f"Lab{lab_number}-{lab_type}"
+
+    @staticmethod
+    def parse_lab_number(lab_name):
+        match = re.match(r"Lab(\d+)", lab_name)
+        return int(match.group(1)) if match else 0
+
     def save(self, *args, **kwargs):
         if not self.lab_name:
-            last_lab = Lab.objects.order_by("-lab_name").first()
-            if last_lab:
-                lab_number = int(last_lab.lab_name.split("-")[0].replace("Lab", "")) + 1
-            else:
-                lab_number = 1
-            self.lab_name = f"Lab{lab_number}-{self.lab_type}"
+            (self.lab_number,) = self.course_semester.allocate_lab_numbers()
+            self.lab_name = self.make_lab_name(self.lab_number, self.lab_type)
+        elif self._state.adding:
+            self.lab_number = self.parse_lab_number(self.lab_name)
+            self.course_semester.reserve_lab_number(self.lab_number)
 
         super().save(*args, **kwargs)
 
@@ -75,6 +129,17 @@ class LearningOutcome(models.Model):
         Course, related_name="outcome_course", on_delete=models.CASCADE
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["course", "outcome_code"],
+                name="unique_outcome_code_per_course",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["course", "id"]),
+        ]
+
     def __str__(self):
         return f"{self.outcome_code}-{self.outcome_name}"
 
@@ -96,6 +161,13 @@ class LabLOContribution(models.Model):
         CourseSemester, related_name="contribution_semester", on_delete=models.CASCADE
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["lab", "outcome"], name="unique_contribution_per_lab_outcome"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.learning_outcome.outcome_code}-{self.contribution_percentage} of {self.lab.lab_name}"
 
@@ -118,5 +190,44 @@ class CourseTeacher(models.Model):
         CourseSemester, related_name="courseteacher_semester"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["teacher", "id"]),
+            models.Index(fields=["course", "id"]),
+        ]
+
     def __str__(self):
         return f"{self.teacher.first_name} -{self.role}"
+
+
+class TeacherCourseSummary(models.Model):
+    """
+    One row per course teacher, holding what the course list shows so that
+    it reads a teacher's courses with a single index scan. Kept up to date
+    by ``courses.summary``.
+    """
+
+    course_teacher = models.OneToOneField(
+        CourseTeacher,
+        primary_key=True,
+        related_name="summary",
+        on_delete=models.CASCADE,
+    )
+    teacher = models.ForeignKey(UserProfile, on_delete=models.CASCADE, db_index=False)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    course_code = models.CharField(max_length=50, null=True)
+    course_name = models.CharField(max_length=255)
+    role = models.CharField(max_length=100)
+    # In the order they were assigned.
+    semester_names = models.JSONField(default=list)
+    # Labs of the teacher's semesters and outcomes of the course.
+    lab_count = models.PositiveIntegerField(default=0)
+    outcome_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["teacher", "course_teacher"]),
+        ]
+
+    def __str__(self):
+        return f"{self.course_code} - {self.course_name}"
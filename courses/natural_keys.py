@@ -0,0 +1,50 @@
+"""
+Resolution of the natural keys in course URLs to primary keys.
+
+Each level of a path is unique within its parent: ``course_code``, then the
+semester name within its course, the lab name within its semester and the
+outcome code within its course. A whole path therefore resolves with one
+query, and every join in it is a seek on one of those unique indexes.
+"""
+
+from dataclasses import dataclass
+
+from courses.models import Course
+
+
+@dataclass(frozen=True)
+class CoursePath:
+    course_id: int
+    semester_id: int = None
+    lab_id: int = None
+    outcome_id: int = None
+
+
+def resolve_path(course_code, semester_name=None, lab_name=None, outcome_code=None):
+    """
+    The ids along ``course_code`` / ``semester_name`` / ``lab_name`` and of
+    ``outcome_code`` in the course, or ``None`` if any of them doesn't exist.
+    A lab name needs a semester name.
+    """
+    filters = {"course_code": course_code}
+    fields = ["id"]
+    if semester_name is not None:
+        filters["coursesemester_course__semester_name"] = semester_name
+        fields.append("coursesemester_course__id")
+    if lab_name is not None:
+        filters["coursesemester_course__lab__lab_name"] = lab_name
+        fields.append("coursesemester_course__lab__id")
+    if outcome_code is not None:
+        filters["outcome_course__outcome_code"] = outcome_code
+        fields.append("outcome_course__id")
+
+    row = Course.objects.filter(**filters).values_list(*fields).first()
+    if row is None:
+        return None
+    ids = iter(row)
+    return CoursePath(
+        course_id=next(ids),
+        semester_id=next(ids) if semester_name is not None else None,
+        lab_id=next(ids) if lab_name is not None else None,
+        outcome_id=next(ids) if outcome_code is not None else None,
+    )
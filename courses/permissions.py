@@ -1,14 +1,10 @@
-from rest_framework import permissions, exceptions
-from courses.models import CourseTeacher, Course, CourseSemester, Lab
+from rest_framework import permissions
+from courses.membership import get_course_membership
 
 
 class IsTeacherForCourse(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
-        return (
-            CourseTeacher.objects.filter(course=obj, teacher=request.user)
-            .select_related("course", "teacher")
-            .exists()
-        )
+        return get_course_membership(request, obj.course_code).is_member
 
 
 class CanAccessSemesterObj(permissions.BasePermission):
@@ -17,13 +13,8 @@ class CanAccessSemesterObj(permissions.BasePermission):
         course_code = view.kwargs.get("course_code")
         user = request.user
         if user is not None and course_code is not None:
-            return (
-                CourseTeacher.objects.filter(
-                    course__course_code=course_code, teacher=user, course_semester=obj
-                )
-                .prefetch_related("course_semester")
-                .exists()
-            )
+            membership = get_course_membership(request, course_code)
+            return obj.pk in membership.semester_ids
         return False
 
 
@@ -34,15 +25,8 @@ class CanManageLabData(permissions.BasePermission):
         semester_name = view.kwargs.get("semester_name")
         user = request.user
         if user is not None and course_code is not None and semester_name is not None:
-            return (
-                CourseTeacher.objects.filter(
-                    course__course_code=course_code,
-                    teacher=user,
-                    course_semester__semester_name=semester_name,
-                )
-                .prefetch_related("course_semester")
-                .exists()
-            )
+            membership = get_course_membership(request, course_code)
+            return membership.has_semester(semester_name)
         return False
 
 
@@ -50,15 +34,9 @@ class CanManageCourseData(permissions.BasePermission):
     def has_permission(self, request, view):
         user = request.user
         if user.is_authenticated:
-            course_teacher_query = (
-                CourseTeacher.objects.filter(
-                    course__course_code=view.kwargs.get("course_code"), teacher=user
-                )
-                .prefetch_related("course_semester")
-                .exists()
-            )
-            return user.is_superuser or course_teacher_query
-        return false
+            membership = get_course_membership(request, view.kwargs.get("course_code"))
+            return user.is_superuser or membership.is_member
+        return False
 
 
 class IsLecturerOrHeadLecturer(permissions.BasePermission):
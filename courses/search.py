@@ -0,0 +1,104 @@
+"""
+Course catalog search over ``course_code``, ``course_name`` and
+``department``.
+
+On PostgreSQL every word of the query is matched as a prefix against a
+``tsvector`` of the three columns, which a GIN index on the same expression
+serves, and ranked with ``ts_rank``. When the ``pg_trgm`` extension is
+installed, names and codes that merely resemble the query (typos, partial
+words) match too, through trigram GIN indexes, and the trigram similarity
+adds to the rank. Migration 0028 creates the indexes.
+
+Other databases fall back to unindexed ``icontains`` matching, ranked by
+whether the course code starts with the query; good enough for local
+testing.
+"""
+
+import re
+
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import Case, Count, F, Q, Value, When
+from django.db.models.functions import Greatest
+
+SEARCH_CONFIG = "simple"
+MAX_FACETS = 50
+
+# alias -> whether pg_trgm is installed there
+_trigram_installed = {}
+
+
+def search_vector():
+    # Must stay identical to the expression of the "course_search_idx" index.
+    return SearchVector("course_code", "course_name", "department", config=SEARCH_CONFIG)
+
+
+def query_words(text):
+    return re.findall(r"\w+", text.lower())
+
+
+def has_trigram(alias):
+    if alias not in _trigram_installed:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_installed[alias] = cursor.fetchone() is not None
+    return _trigram_installed[alias]
+
+
+def search_courses(queryset, text):
+    """
+    The courses of ``queryset`` matching ``text``, annotated with ``rank``
+    and ordered by it, best first.
+    """
+    words = query_words(text)
+    if not words:
+        return queryset.none()
+
+    alias = queryset.db
+    if connections[alias].vendor != "postgresql":
+        matches = Q()
+        for word in words:
+            matches &= (
+                Q(course_code__icontains=word)
+                | Q(course_name__icontains=word)
+                | Q(department__icontains=word)
+            )
+        rank = Case(
+            When(course_code__istartswith=text.strip(), then=Value(1.0)),
+            default=Value(0.0),
+        )
+        return queryset.filter(matches).annotate(rank=rank).order_by("-rank", "course_code")
+
+    # Every word as a prefix: "intro prog" finds "Introduction to Programming".
+    query = SearchQuery(
+        " & ".join(f"{word}:*" for word in words), config=SEARCH_CONFIG, search_type="raw"
+    )
+    queryset = queryset.annotate(search=search_vector())
+    matches = Q(search=query)
+    rank = SearchRank(F("search"), query)
+    if has_trigram(alias):
+        text = " ".join(words)
+        matches |= Q(TrigramWordSimilar(F("course_code"), text)) | Q(
+            TrigramWordSimilar(F("course_name"), text)
+        )
+        rank = rank + Greatest(
+            TrigramWordSimilarity(text, "course_code"),
+            TrigramWordSimilarity(text, "course_name"),
+        )
+    return queryset.filter(matches).annotate(rank=rank).order_by("-rank", "course_code")
+
+
+def department_facets(courses):
+    """Number of ``courses`` per department, largest first."""
+    return list(
+        courses.order_by()
+        .values("department")
+        .annotate(count=Count("id"))
+        .order_by("-count", "department")[:MAX_FACETS]
+    )
@@ -1,4 +1,11 @@
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from courses.models import (
     Course,
     CourseTeacher,
@@ -7,6 +14,10 @@ from courses.models import (
     LearningOutcome,
     LabLOContribution,
 )
+from courses.cache import bump_course_version
+from courses.matrix import ContributionMatrix
+from courses.summary import refresh_semester
+from LMSSystemBackend.values import ValuesSerializer
 from user_profiles.models import UserProfile
 
 
@@ -45,6 +56,53 @@ class CourseReadSerializer(serializers.ModelSerializer):
         fields = ["course", "course_semester", "teacher"]
 
 
+class CourseSummaryValuesSerializer(ValuesSerializer):
+    """
+    ``CourseReadSerializer`` for ``TeacherCourseSummary`` rows, plus the
+    teacher's role and the lab and outcome counts.
+    """
+
+    lookups = (
+        "course_code",
+        "course_name",
+        "semester_names",
+        "teacher",
+        "role",
+        "lab_count",
+        "outcome_count",
+    )
+
+    def to_representation(self, row):
+        return {
+            "course": f"{row['course_code']} - {row['course_name']}",
+            "course_semester": row["semester_names"],
+            "teacher": row["teacher"],
+            "role": row["role"],
+            "lab_count": row["lab_count"],
+            "outcome_count": row["outcome_count"],
+        }
+
+
+class CourseSearchSerializer(serializers.Serializer):
+    """Query parameters of the course search."""
+
+    q = serializers.CharField(max_length=100)
+    department = serializers.CharField(max_length=100, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class CourseSearchValuesSerializer(ValuesSerializer):
+    lookups = ("course_code", "course_name", "department")
+
+    def to_representation(self, row):
+        return {
+            "pk": row["pk"],
+            "course_code": row["course_code"],
+            "course_name": row["course_name"],
+            "department": row["department"],
+        }
+
+
 class CourseSemesterSerializer(serializers.ModelSerializer):
     course = serializers.StringRelatedField(read_only=True)
 
@@ -114,18 +172,27 @@ class CourseTeacherSerializer(serializers.ModelSerializer):
             )
 
     def create(self, validated_data):
-        course_semester_data = validated_data.pop("course_semester", [])
-        course_teacher = CourseTeacher.objects.create(**validated_data)
-        for cs_data in course_semester_data:
-            try:
-                target_course_semester = CourseSemester.objects.get(pk=cs_data.pk)
-                course_teacher.course_semester.add(target_course_semester)
-            except CourseSemester.DoesNotExist as e:
-                course_teacher.delete()
-                raise serializers.ValidationError({"course_semester": [str(e)]})
+        # The semesters were resolved by the field, with one query.
+        course_semesters = validated_data.pop("course_semester", [])
+        with transaction.atomic():
+            course_teacher = CourseTeacher.objects.create(**validated_data)
+            course_teacher.course_semester.set(course_semesters)
         return course_teacher
 
 
+class TeacherAssignmentSerializer(serializers.Serializer):
+    teacher = serializers.EmailField()
+    course = serializers.CharField(max_length=50)
+    role = serializers.ChoiceField(choices=CourseTeacher.TEACHER_ROLE_CHOICES)
+    course_semester = serializers.ListField(
+        child=serializers.CharField(max_length=50), default=list
+    )
+
+
+class TeacherAssignmentListSerializer(serializers.Serializer):
+    assignments = TeacherAssignmentSerializer(many=True, allow_empty=False)
+
+
 class LabSerializer(serializers.ModelSerializer):
     course_semester = serializers.ReadOnlyField(source="course_semester.semester_name")
     course = serializers.ReadOnlyField(source="course_semester.course.course_code")
@@ -139,7 +206,131 @@ class LabSerializer(serializers.ModelSerializer):
             "course_semester",
             "course",
         )
-        lookup_field = ["semester_name", "course__course_code", "pk"]
+        # Left out, the name is allocated from the semester's lab counter.
+        extra_kwargs = {"lab_name": {"required": False}}
+        lookup_field = ["semester_name", "course__course_code", "lab_name"]
+
+
+class LabValuesSerializer(ValuesSerializer):
+    """``LabSerializer`` for the labs of the view's semester."""
+
+    lookups = ("lab_name", "lab_type", "weight")
+
+    def prepare(self, rows):
+        self.semester = self.context["view"].get_semester()
+
+    def to_representation(self, row):
+        return {
+            "lab_name": row["lab_name"],
+            "lab_type": row["lab_type"],
+            "weight": row["weight"],
+            "course_semester": self.semester.semester_name,
+            "course": self.semester.course.course_code,
+        }
+
+
+class CourseSemesterCloneSerializer(serializers.Serializer):
+    """
+    Copies a semester's labs, lab-outcome contributions and teachers into a
+    new semester of the same course, with one ``bulk_create`` each.
+    """
+
+    semester_name = serializers.CharField(max_length=50)
+
+    def create(self, validated_data):
+        source = validated_data["course_semester"]
+        with transaction.atomic():
+            semester = CourseSemester.objects.create(
+                course=validated_data["course"],
+                semester_name=validated_data["semester_name"],
+                num_of_lab=source.num_of_lab,
+                lab_counter=source.lab_counter,
+            )
+
+            source_labs = list(
+                Lab.objects.filter(course_semester=source)
+                .order_by("id")
+                .values_list("id", "lab_number", "lab_name", "lab_type", "weight")
+            )
+            labs = Lab.objects.bulk_create(
+                Lab(
+                    course_semester=semester,
+                    lab_number=lab_number,
+                    lab_name=lab_name,
+                    lab_type=lab_type,
+                    weight=weight,
+                )
+                for _, lab_number, lab_name, lab_type, weight in source_labs
+            )
+            lab_ids = {row[0]: lab.pk for row, lab in zip(source_labs, labs)}
+
+            LabLOContribution.objects.bulk_create(
+                LabLOContribution(
+                    course_semester=semester,
+                    lab_id=lab_ids[lab_id],
+                    outcome_id=outcome_id,
+                    contribution_percentage=percentage,
+                )
+                for lab_id, outcome_id, percentage in LabLOContribution.objects.filter(
+                    lab__course_semester=source
+                ).values_list("lab_id", "outcome_id", "contribution_percentage")
+            )
+
+            Through = CourseTeacher.course_semester.through
+            Through.objects.bulk_create(
+                Through(courseteacher_id=course_teacher_id, coursesemester=semester)
+                for course_teacher_id in Through.objects.filter(
+                    coursesemester=source
+                ).values_list("courseteacher_id", flat=True)
+            )
+            # bulk_create sends no signals. Both commit or roll back with the
+            # copy, like the signal handlers'.
+            refresh_semester(semester.pk)
+            bump_course_version(semester.course.course_code)
+        return semester
+
+
+class LabGenerateSerializer(serializers.Serializer):
+    """
+    Creates the labs a semester is still missing to reach ``num_of_lab`` in a
+    single ``bulk_create``, numbering them from the semester's lab counter.
+    """
+
+    lab_type = serializers.ChoiceField(choices=Lab.LAB_TYPE_CHOICES, default="InLab")
+    weight = serializers.FloatField(min_value=0.0, max_value=1.0, required=False)
+
+    def create(self, validated_data):
+        semester = validated_data["course_semester"]
+        lab_type = validated_data["lab_type"]
+        with transaction.atomic():
+            # Concurrent requests queue on the semester row, so each one
+            # counts the labs the previous ones created.
+            num_of_lab = (
+                CourseSemester.objects.select_for_update()
+                .values_list("num_of_lab", flat=True)
+                .get(pk=semester.pk)
+            )
+            missing = num_of_lab - Lab.objects.filter(course_semester=semester).count()
+            if missing <= 0:
+                raise serializers.ValidationError(
+                    {
+                        api_settings.NON_FIELD_ERRORS_KEY: [
+                            f"This semester already has its {num_of_lab} labs."
+                        ]
+                    }
+                )
+            weight = validated_data.get("weight", round(1 / num_of_lab, 4))
+            lab_numbers = semester.allocate_lab_numbers(missing)
+            return Lab.objects.bulk_create(
+                Lab(
+                    lab_number=lab_number,
+                    lab_name=Lab.make_lab_name(lab_number, lab_type),
+                    lab_type=lab_type,
+                    weight=weight,
+                    course_semester=semester,
+                )
+                for lab_number in lab_numbers
+            )
 
 
 class LearningOutcomeSerializer(serializers.ModelSerializer):
@@ -151,6 +342,24 @@ class LearningOutcomeSerializer(serializers.ModelSerializer):
         lookup_field = ["course__course_code", "outcome_code"]
 
 
+class LearningOutcomeValuesSerializer(ValuesSerializer):
+    """``LearningOutcomeSerializer`` for the outcomes of the view's course."""
+
+    lookups = ("outcome_code", "outcome_name", "outcome_description")
+
+    def prepare(self, rows):
+        self.course = str(self.context["view"].get_course())
+
+    def to_representation(self, row):
+        return {
+            "pk": row["pk"],
+            "outcome_code": row["outcome_code"],
+            "outcome_name": row["outcome_name"],
+            "outcome_description": row["outcome_description"],
+            "course": self.course,
+        }
+
+
 class LabLOContributionSerializer(serializers.ModelSerializer):
     lab = serializers.StringRelatedField(read_only=True)
     course_semester = serializers.StringRelatedField(read_only=True)
@@ -186,8 +395,159 @@ class CourseSemesterReadSerializer(serializers.ModelSerializer):
         lookup_field = ["semester_name", "course"]
 
     def get_lab_lo_contributions(self, instance):
-        return (
-            LabLOContribution.objects.filter(course_semester=instance)
-            .select_related("course_semester", "lab", "outcome")
-            .values_list("lab", "outcome__outcome_code", "contribution_percentage")
+        # Matrices already loaded by the caller, keyed by semester pk.
+        matrices = self.context.get("contribution_matrices", {})
+        matrix = matrices.get(instance.pk) or ContributionMatrix.for_semester(instance)
+        return matrix.to_json()
+
+
+class ContributionMatrixSerializer(serializers.Serializer):
+    """
+    Replaces a semester's lab x outcome contributions with the matrix encoding
+    of ``ContributionMatrix``. Labs left out of ``labs`` keep their
+    contributions; a zero cell removes that contribution.
+    """
+
+    labs = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+    outcomes = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+    cells = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.DecimalField(
+                max_digits=5, decimal_places=2, min_value=0, max_value=100
+            )
+        )
+    )
+
+    def validate(self, attrs):
+        labs, outcomes, cells = attrs["labs"], attrs["outcomes"], attrs["cells"]
+        if len(set(labs)) != len(labs):
+            raise serializers.ValidationError({"labs": ["Labs must be unique."]})
+        if len(set(outcomes)) != len(outcomes):
+            raise serializers.ValidationError({"outcomes": ["Outcomes must be unique."]})
+        if len(cells) != len(labs) or any(len(row) != len(outcomes) for row in cells):
+            raise serializers.ValidationError(
+                {"cells": ["Expected one row per lab and one cell per outcome."]}
+            )
+
+        semester = self.context["view"].get_semester()
+        lab_ids = dict(
+            Lab.objects.filter(course_semester=semester, lab_name__in=labs).values_list(
+                "lab_name", "id"
+            )
+        )
+        outcome_ids = dict(
+            LearningOutcome.objects.filter(
+                course=semester.course_id, outcome_code__in=outcomes
+            ).values_list("outcome_code", "id")
+        )
+        errors = {}
+        unknown_labs = [lab for lab in labs if lab not in lab_ids]
+        if unknown_labs:
+            errors["labs"] = [f"Unknown labs in this semester: {', '.join(unknown_labs)}."]
+        unknown_outcomes = [outcome for outcome in outcomes if outcome not in outcome_ids]
+        if unknown_outcomes:
+            errors["outcomes"] = [
+                f"Unknown outcomes in this course: {', '.join(unknown_outcomes)}."
+            ]
+        bad_rows = [lab for lab, row in zip(labs, cells) if sum(row) != Decimal(100)]
+        if bad_rows:
+            errors["cells"] = [
+                f"Contributions must sum to 100 for each lab: {', '.join(bad_rows)}."
+            ]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        attrs["lab_ids"] = [lab_ids[lab] for lab in labs]
+        attrs["outcome_ids"] = [outcome_ids[outcome] for outcome in outcomes]
+        return attrs
+
+    def create(self, validated_data):
+        semester = validated_data["course_semester"]
+        kept = {}
+        contributions = []
+        for lab_id, row in zip(validated_data["lab_ids"], validated_data["cells"]):
+            for outcome_id, percentage in zip(validated_data["outcome_ids"], row):
+                if percentage:
+                    kept.setdefault(lab_id, []).append(outcome_id)
+                    contributions.append(
+                        LabLOContribution(
+                            lab_id=lab_id,
+                            outcome_id=outcome_id,
+                            course_semester=semester,
+                            contribution_percentage=percentage,
+                        )
+                    )
+
+        with transaction.atomic():
+            LabLOContribution.objects.filter(
+                reduce(
+                    or_,
+                    (
+                        Q(lab_id=lab_id) & ~Q(outcome_id__in=outcome_ids)
+                        for lab_id, outcome_ids in kept.items()
+                    ),
+                )
+            ).delete()
+            LabLOContribution.objects.bulk_create(
+                contributions,
+                update_conflicts=True,
+                unique_fields=["lab", "outcome"],
+                update_fields=["contribution_percentage"],
+            )
+        return semester
+
+
+class TreeContributionSerializer(serializers.ModelSerializer):
+    outcome = serializers.SlugRelatedField(read_only=True, slug_field="outcome_code")
+
+    class Meta:
+        model = LabLOContribution
+        fields = ("outcome", "contribution_percentage")
+
+
+class TreeLabSerializer(serializers.ModelSerializer):
+    contributions = TreeContributionSerializer(
+        source="tree_contributions", many=True, read_only=True
+    )
+
+    class Meta:
+        model = Lab
+        fields = ("lab_name", "lab_type", "weight", "contributions")
+
+
+class TreeSemesterSerializer(serializers.ModelSerializer):
+    labs = TreeLabSerializer(source="tree_labs", many=True, read_only=True)
+
+    class Meta:
+        model = CourseSemester
+        fields = ("pk", "semester_name", "num_of_lab", "labs")
+
+
+class TreeOutcomeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LearningOutcome
+        fields = ("pk", "outcome_code", "outcome_name", "outcome_description")
+
+
+class CourseTreeSerializer(serializers.ModelSerializer):
+    """
+    A course with its outcomes and its semesters, labs and contributions,
+    read from the ``tree_*`` attributes set by ``CourseTree``'s prefetches.
+    """
+
+    outcomes = TreeOutcomeSerializer(source="tree_outcomes", many=True, read_only=True)
+    semesters = TreeSemesterSerializer(
+        source="tree_semesters", many=True, read_only=True
+    )
+
+    class Meta:
+        model = Course
+        fields = (
+            "pk",
+            "course_code",
+            "course_name",
+            "department",
+            "creater",
+            "outcomes",
+            "semesters",
         )
@@ -0,0 +1,125 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from courses.cache import bump_course_version, course_code_for
+from courses.summary import refresh_course, refresh_course_teachers, refresh_semester
+from courses.models import (
+    Course,
+    CourseSemester,
+    CourseTeacher,
+    Lab,
+    LabLOContribution,
+    LearningOutcome,
+)
+
+CACHED_MODELS = (Course, CourseSemester, CourseTeacher, Lab, LabLOContribution, LearningOutcome)
+
+
+def origin_model(origin):
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+def deleted_directly(sender, origin):
+    # Rows deleted along with their parent are covered by the parent's refresh.
+    return origin_model(origin) is sender
+
+
+def invalidate_course(sender, instance, **kwargs):
+    bump_course_version(course_code_for(instance))
+
+
+def invalidate_deleted_course(sender, instance, origin=None, **kwargs):
+    # Rows deleted along with a cached parent are covered by the parent's bump.
+    if deleted_directly(sender, origin) or origin_model(origin) not in CACHED_MODELS:
+        bump_course_version(course_code_for(instance))
+
+
+for model in CACHED_MODELS:
+    post_save.connect(invalidate_course, sender=model, dispatch_uid=f"cache-save-{model.__name__}")
+    post_delete.connect(
+        invalidate_deleted_course, sender=model, dispatch_uid=f"cache-delete-{model.__name__}"
+    )
+
+
+@receiver(m2m_changed, sender=CourseTeacher.course_semester.through)
+def invalidate_course_teacher_semesters(sender, instance, action, **kwargs):
+    if action.startswith("post_"):
+        bump_course_version(course_code_for(instance))
+
+
+@receiver(pre_save, sender=Course)
+def invalidate_renamed_course(sender, instance, raw=False, **kwargs):
+    # Entries cached under the old code must not be served to a course that
+    # takes it over later.
+    if raw or instance.pk is None:
+        return
+    old_code = Course.objects.filter(pk=instance.pk).values_list("course_code", flat=True).first()
+    if old_code != instance.course_code:
+        bump_course_version(old_code)
+
+
+# Course list summaries, see courses.summary.
+
+
+@receiver(post_save, sender=CourseTeacher)
+def summarize_course_teacher(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_course_teachers([instance.pk])
+
+
+@receiver(m2m_changed, sender=CourseTeacher.course_semester.through)
+def summarize_course_teacher_semesters(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if not reverse:
+        refresh_course_teachers([instance.pk])
+    elif pk_set is not None:
+        refresh_course_teachers(pk_set)
+    else:
+        # Cleared from the semester's side: which teachers it had is gone.
+        refresh_course(instance.course_id)
+
+
+@receiver(post_save, sender=Course)
+def summarize_course(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        refresh_course(instance.pk)
+
+
+@receiver(post_save, sender=CourseSemester)
+def summarize_semester(sender, instance, created, raw=False, **kwargs):
+    if not raw and not created:
+        refresh_semester(instance.pk)
+
+
+
+
+@receiver(post_delete, sender=CourseSemester)
+def summarize_deleted_semester(sender, instance, origin=None, **kwargs):
+    if deleted_directly(sender, origin):
+        refresh_course(instance.course_id)
+
+
+@receiver(post_save, sender=Lab)
+def summarize_new_lab(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        refresh_semester(instance.course_semester_id)
+
+
+@receiver(post_delete, sender=Lab)
+def summarize_deleted_lab(sender, instance, origin=None, **kwargs):
+    if deleted_directly(sender, origin):
+        refresh_semester(instance.course_semester_id)
+
+
+@receiver(post_save, sender=LearningOutcome)
+def summarize_new_outcome(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        refresh_course(instance.course_id)
+
+
+@receiver(post_delete, sender=LearningOutcome)
+def summarize_deleted_outcome(sender, instance, origin=None, **kwargs):
+    if deleted_directly(sender, origin):
+        refresh_course(instance.course_id)
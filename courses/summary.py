@@ -0,0 +1,116 @@
+"""
+Maintenance of ``TeacherCourseSummary``, the course list's read model.
+
+Rows are recomputed for the course teachers a write affects, never for the
+whole table: the signals in ``courses.signals`` call ``refresh_course``,
+``refresh_semester`` or ``refresh_course_teachers`` inside the writing
+transaction, so a summary commits or rolls back with its source rows. Bulk
+writes send no signals and call them directly. ``rebuild_summaries`` (the
+``rebuild_course_summaries`` command) recomputes everything.
+"""
+
+from django.db.models import Count
+
+from courses.models import CourseTeacher, Lab, LearningOutcome, TeacherCourseSummary
+
+BATCH_SIZE = 1000
+
+SUMMARY_FIELDS = [
+    "teacher",
+    "course",
+    "course_code",
+    "course_name",
+    "role",
+    "semester_names",
+    "lab_count",
+    "outcome_count",
+]
+
+
+def build_summaries(course_teachers):
+    """Unsaved summaries of the ``CourseTeacher`` queryset, with four queries."""
+    course_teachers = list(
+        course_teachers.values_list(
+            "pk", "teacher_id", "course_id", "course__course_code", "course__course_name", "role"
+        )
+    )
+    if not course_teachers:
+        return []
+
+    semesters = {}
+    semester_ids = set()
+    links = (
+        CourseTeacher.course_semester.through.objects.filter(
+            courseteacher__in=[row[0] for row in course_teachers]
+        )
+        .order_by("id")
+        .values_list("courseteacher_id", "coursesemester_id", "coursesemester__semester_name")
+    )
+    for course_teacher_id, semester_id, semester_name in links:
+        semesters.setdefault(course_teacher_id, []).append((semester_id, semester_name))
+        semester_ids.add(semester_id)
+
+    lab_counts = dict(
+        Lab.objects.filter(course_semester__in=semester_ids)
+        .order_by()
+        .values_list("course_semester")
+        .annotate(Count("id"))
+    )
+    outcome_counts = dict(
+        LearningOutcome.objects.filter(course__in={row[2] for row in course_teachers})
+        .order_by()
+        .values_list("course")
+        .annotate(Count("id"))
+    )
+
+    summaries = []
+    for pk, teacher_id, course_id, course_code, course_name, role in course_teachers:
+        assigned = semesters.get(pk, [])
+        summaries.append(
+            TeacherCourseSummary(
+                course_teacher_id=pk,
+                teacher_id=teacher_id,
+                course_id=course_id,
+                course_code=course_code,
+                course_name=course_name,
+                role=role,
+                semester_names=[name for _, name in assigned],
+                lab_count=sum(lab_counts.get(semester_id, 0) for semester_id, _ in assigned),
+                outcome_count=outcome_counts.get(course_id, 0),
+            )
+        )
+    return summaries
+
+
+def save_summaries(summaries):
+    TeacherCourseSummary.objects.bulk_create(
+        summaries,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["course_teacher"],
+        update_fields=SUMMARY_FIELDS,
+    )
+
+
+def refresh_course_teachers(course_teacher_ids):
+    save_summaries(build_summaries(CourseTeacher.objects.filter(pk__in=course_teacher_ids)))
+
+
+def refresh_course(course_id):
+    """After the course itself, its outcomes or its semesters changed."""
+    save_summaries(build_summaries(CourseTeacher.objects.filter(course_id=course_id)))
+
+
+def refresh_semester(semester_id):
+    """After the semester was renamed or its labs changed."""
+    save_summaries(
+        build_summaries(CourseTeacher.objects.filter(course_semester=semester_id))
+    )
+
+
+def rebuild_summaries():
+    """Recompute every summary; returns how many there are."""
+    ids = list(CourseTeacher.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        refresh_course_teachers(ids[start : start + BATCH_SIZE])
+    return len(ids)
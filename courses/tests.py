@@ -1,3 +1,1362 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.management import call_command
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    IntegrityError,
+    OperationalError,
+    connection,
+    connections,
+    transaction,
+)
+from django.db.migrations.executor import MigrationExecutor
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date, parse_http_date
+from rest_framework import renderers
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from courses import async_views
+from courses.assignments import assign_teachers
+from courses.cache import get_cache, get_course_version, may_cache
+from courses.matrix import ContributionMatrix, contribution_matrix_prefetches
+from courses.membership import get_course_membership
+from courses.models import (
+    Course,
+    CourseSemester,
+    CourseTeacher,
+    Lab,
+    LabLOContribution,
+    LearningOutcome,
+    TeacherCourseSummary,
+)
+from courses.natural_keys import CoursePath, resolve_path
+from courses.serializers import (
+    CourseReadSerializer,
+    LabSerializer,
+    LearningOutcomeSerializer,
+)
+from LMSSystemBackend.db import router
+from LMSSystemBackend.renderers import JSONRenderer
+from notifications.models import Notification
+from user_profiles.models import UserProfile
+
+
+def make_teacher(name, **kwargs):
+    return UserProfile.objects.create_user(
+        username=name,
+        email=f"{name}@example.com",
+        password="x",
+        is_teacher=True,
+        **kwargs,
+    )
+
+
+class CourseTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.course = Course.objects.create(
+            course_code="CS101",
+            course_name="Programming",
+            department="CS",
+            creater="a@example.com",
+        )
+        cls.semester = CourseSemester.objects.create(
+            semester_name="Fall", course=cls.course, num_of_lab=0
+        )
+        cls.member = make_teacher("member")
+        course_teacher = CourseTeacher.objects.create(
+            course=cls.course, teacher=cls.member, role="Lecturer"
+        )
+        course_teacher.course_semester.add(cls.semester)
+        cls.outsider = make_teacher("outsider")
+
+    def setUp(self):
+        get_cache().clear()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+
+class CourseMembershipTests(CourseTestCase):
+    def test_membership_is_loaded_once_per_request(self):
+        request = RequestFactory().get("/")
+        request.user = self.member
+        with self.assertNumQueries(1):
+            membership = get_course_membership(request, "CS101")
+            self.assertIs(get_course_membership(request, "CS101"), membership)
+        self.assertEqual(membership.roles, {"Lecturer"})
+        self.assertEqual(membership.course, self.course)
+        self.assertEqual(membership.semester_ids, {self.semester.pk})
+
+    def test_course_data_permissions(self):
+        admin = make_teacher("admin", is_superuser=True)
+        url = "/api/courses/CS101/outcomes"
+        for user, status in [(self.member, 200), (admin, 200), (self.outsider, 403)]:
+            with self.subTest(user=user.username):
+                self.assertEqual(self.client_for(user).get(url).status_code, status)
+
+
+class KeysetPaginationTests(CourseTestCase):
+    def test_pages_follow_the_key(self):
+        LearningOutcome.objects.bulk_create(
+            LearningOutcome(course=self.course, outcome_code=f"LO{i}", outcome_name="")
+            for i in range(1, 6)
+        )
+        client = self.client_for(self.member)
+        response = client.get("/api/courses/CS101/outcomes?page_size=2").json()
+        codes = [outcome["outcome_code"] for outcome in response["results"]]
+        # Inserted meanwhile, past the cursor: nothing is skipped or repeated.
+        LearningOutcome.objects.create(course=self.course, outcome_code="LO0")
+        # The version bump waits for a commit that TestCase never makes.
+        get_cache().clear()
+        while response["next"]:
+            response = client.get(response["next"]).json()
+            codes += [outcome["outcome_code"] for outcome in response["results"]]
+        self.assertEqual(codes, ["LO1", "LO2", "LO3", "LO4", "LO5", "LO0"])
+        self.assertIsNone(response["next"])
+        self.assertIsNotNone(response["previous"])
+
+
+class CachedResponsePermissionTests(CourseTestCase):
+    urls = ["/api/courses/CS101/", "/api/courses/CS101/semesters/Fall"]
+
+    def test_outsider_is_denied_a_cached_response(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.client_for(self.member).get(url).status_code, 200)
+                self.assertEqual(
+                    self.client_for(self.outsider).get(url).status_code, 403
+                )
+
+    def test_outsider_gets_no_not_modified(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                etag = self.client_for(self.member).get(url)["ETag"]
+                response = self.client_for(self.outsider).get(
+                    url, HTTP_IF_NONE_MATCH=etag
+                )
+                self.assertEqual(response.status_code, 403)
+
+    def test_member_gets_cached_response(self):
+        client = self.client_for(self.member)
+        url = self.urls[1]
+        etag = client.get(url)["ETag"]
+        self.assertEqual(client.get(url).status_code, 200)
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class ConditionalGetTests(CourseTestCase):
+    url = "/api/courses/CS101/semesters/Fall"
+
+    def test_matching_etag_is_not_modified(self):
+        client = self.client_for(self.member)
+        response = client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        response = client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_write_changes_the_etag(self):
+        client = self.client_for(self.member)
+        etag = client.get(self.url)["ETag"]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.semester.num_of_lab = 3
+            self.semester.save()
+
+        response = client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["num_of_lab"], 3)
+
+    def test_if_modified_since(self):
+        client = self.client_for(self.member)
+        last_modified = client.get(self.url)["Last-Modified"]
+        response = client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        earlier = http_date(parse_http_date(last_modified) - 3600)
+        response = client.get(self.url, HTTP_IF_MODIFIED_SINCE=earlier)
+        self.assertEqual(response.status_code, 200)
+
+    def test_outsider_gets_no_not_modified(self):
+        response = self.client_for(self.member).get(self.url)
+        for header, value in [
+            ("HTTP_IF_NONE_MATCH", response["ETag"]),
+            ("HTTP_IF_MODIFIED_SINCE", response["Last-Modified"]),
+        ]:
+            with self.subTest(header=header):
+                response = self.client_for(self.outsider).get(
+                    self.url, **{header: value}
+                )
+                self.assertEqual(response.status_code, 403)
+
+
+class CacheInvalidationTests(TransactionTestCase):
+    def setUp(self):
+        get_cache().clear()
+        course = Course.objects.create(
+            course_code="CS101",
+            course_name="Programming",
+            department="CS",
+            creater="a@example.com",
+        )
+        member = make_teacher("member")
+        CourseTeacher.objects.create(course=course, teacher=member, role="Lecturer")
+        self.client = APIClient()
+        self.client.force_authenticate(member)
+
+    def outcome_codes(self):
+        response = self.client.get("/api/courses/CS101/outcomes")
+        return [outcome["outcome_code"] for outcome in response.json()["results"]]
+
+    def test_write_invalidates_cached_responses(self):
+        self.assertEqual(self.outcome_codes(), [])
+        response = self.client.post(
+            "/api/courses/CS101/outcomes",
+            {"outcome_code": "LO1", "outcome_name": "Outcome 1"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.outcome_codes(), ["LO1"])
+
+
+class CourseVersionTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+
+    def test_version_is_kept(self):
+        self.assertEqual(get_course_version("CS101"), get_course_version("CS101"))
+
+    @override_settings(COURSE_VERSION_TIMEOUT=0)
+    def test_version_expires(self):
+        # What a worker holding a local cache does once its version is old.
+        self.assertLess(get_course_version("CS101"), get_course_version("CS101"))
+
+
+class CourseVersionBumpTests(CourseTestCase):
+    def add_semester(self, name, labs):
+        semester = CourseSemester.objects.create(
+            semester_name=name, course=self.course, num_of_lab=labs
+        )
+        outcome, _ = LearningOutcome.objects.get_or_create(
+            course=self.course, outcome_code="LO1"
+        )
+        labs = Lab.objects.bulk_create(
+            Lab(
+                course_semester=semester,
+                lab_number=number,
+                lab_name=f"Lab{number}",
+                lab_type="InLab",
+                weight=1,
+            )
+            for number in range(1, labs + 1)
+        )
+        LabLOContribution.objects.bulk_create(
+            LabLOContribution(
+                lab=lab,
+                outcome=outcome,
+                course_semester=semester,
+                contribution_percentage=10,
+            )
+            for lab in labs
+        )
+        return semester
+
+    def test_delete_queries_do_not_grow_with_the_rows(self):
+        small, large = self.add_semester("Spring", 1), self.add_semester("Summer", 10)
+        with CaptureQueriesContext(connection) as one_lab:
+            small.delete()
+        with self.assertNumQueries(len(one_lab)):
+            large.delete()
+
+    def test_course_is_bumped_once_per_transaction(self):
+        semester = self.add_semester("Spring", 5)
+        version = get_course_version("CS101")
+        with mock.patch.object(get_cache(), "set_many") as set_many:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with transaction.atomic():
+                    Lab.objects.filter(
+                        course_semester=semester, lab_number__gt=3
+                    ).delete()
+                    semester.delete()
+                    self.semester.save()
+        self.assertEqual(len(callbacks), 1)
+        [keys], kwargs = set_many.call_args
+        self.assertEqual(list(keys), ["courses:version:CS101"])
+
+        with self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            self.semester.save()
+        self.assertGreater(get_course_version("CS101"), version)
+
+    def test_rolled_back_bumps_are_dropped(self):
+        other = Course.objects.create(
+            course_code="MA201", course_name="Algebra", department="Math"
+        )
+        with mock.patch.object(get_cache(), "set_many") as set_many:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with transaction.atomic():
+                    with self.assertRaises(IntegrityError), transaction.atomic():
+                        other.save()
+                        CourseSemester.objects.create(
+                            semester_name="Fall", course=self.course, num_of_lab=0
+                        )
+                    self.semester.save()
+        self.assertEqual(len(callbacks), 1)
+        [keys], kwargs = set_many.call_args
+        self.assertEqual(list(keys), ["courses:version:CS101"])
+
+
+@override_settings(ASYNC_DB_POOL=None)
+class AsyncViewTests(CourseTestCase):
+    def get_semester(self, user):
+        request = APIRequestFactory().get("/api/courses/CS101/semesters/Fall")
+        force_authenticate(request, user)
+        view = async_views.CourseSemesterDetail.as_view()
+        return async_to_sync(view)(request, course_code="CS101", semester_name="Fall")
+
+    def test_outsider_is_denied_a_cached_response(self):
+        self.assertEqual(self.get_semester(self.member).status_code, 200)
+        self.assertEqual(self.get_semester(self.outsider).status_code, 403)
+
+    def get_tree(self, user, course_code="CS101"):
+        request = APIRequestFactory().get(f"/api/courses/{course_code}/tree")
+        force_authenticate(request, user)
+        view = async_views.CourseTree.as_view()
+        return async_to_sync(view)(request, course_code=course_code)
+
+    def test_tree_for_superuser_without_assignment(self):
+        admin = make_teacher("admin", is_superuser=True)
+        response = self.get_tree(admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["course_code"], "CS101")
+
+    def test_tree_of_missing_course(self):
+        admin = make_teacher("admin", is_superuser=True)
+        self.assertEqual(self.get_tree(admin, "NOPE").status_code, 404)
+
+    def test_lists_match_the_sync_views(self):
+        for number, weight in [(1, 1), (2, Decimal("0.25"))]:
+            Lab.objects.create(
+                course_semester=self.semester,
+                lab_number=number,
+                lab_name=f"Lab{number}",
+                lab_type="InLab",
+                weight=weight,
+            )
+        cases = [
+            ("/api/courses/", async_views.CourseList, {}),
+            (
+                "/api/courses/CS101/semesters/Fall/labs",
+                async_views.LabList,
+                {"course_code": "CS101", "semester_name": "Fall"},
+            ),
+        ]
+        # Both serve the lists from values() rows, not instances.
+        no_instances = mock.patch.object(
+            LabSerializer, "to_representation", side_effect=AssertionError
+        )
+        for url, view_class, kwargs in cases:
+            with self.subTest(url=url), no_instances:
+                expected = self.client_for(self.member).get(url).json()
+                get_cache().clear()
+                request = APIRequestFactory().get(url)
+                force_authenticate(request, self.member)
+                response = async_to_sync(view_class.as_view())(request, **kwargs)
+                self.assertEqual(json.loads(response.render().content), expected)
+
+
+class LabGenerateTestCase(TransactionTestCase):
+    url = "/api/courses/CS101/semesters/Fall/generate-labs"
+
+    def setUp(self):
+        course = Course.objects.create(
+            course_code="CS101",
+            course_name="Programming",
+            department="CS",
+            creater="a@example.com",
+        )
+        self.semester = CourseSemester.objects.create(
+            semester_name="Fall", course=course, num_of_lab=4
+        )
+        self.member = make_teacher("member")
+        course_teacher = CourseTeacher.objects.create(
+            course=course, teacher=self.member, role="Lecturer"
+        )
+        course_teacher.course_semester.add(self.semester)
+
+    def generate(self):
+        client = APIClient()
+        client.force_authenticate(self.member)
+        try:
+            return client.post(self.url).status_code
+        finally:
+            connection.close()
+
+
+class LabGenerateTests(LabGenerateTestCase):
+    def test_generates_missing_labs_once(self):
+        self.assertEqual(self.generate(), 201)
+        self.assertEqual(self.generate(), 400)
+        self.assertEqual(Lab.objects.filter(course_semester=self.semester).count(), 4)
+
+    def test_lab_names_come_from_the_counter(self):
+        self.assertEqual(self.generate(), 201)
+        client = APIClient()
+        client.force_authenticate(self.member)
+        response = client.post(
+            "/api/courses/CS101/semesters/Fall/labs",
+            {"lab_type": "PreLab", "weight": 0.1},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["lab_name"], "Lab5-PreLab")
+        names = Lab.objects.order_by("lab_number").values_list("lab_name", flat=True)
+        self.assertEqual(
+            list(names), [*(f"Lab{n}-InLab" for n in range(1, 5)), "Lab5-PreLab"]
+        )
+
+
+# SQLite locks whole tables, so the requests fail instead of waiting.
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentLabGenerateTests(LabGenerateTestCase):
+    def test_concurrent_requests_generate_missing_labs_once(self):
+        with ThreadPoolExecutor(4) as executor:
+            statuses = list(executor.map(lambda _: self.generate(), range(4)))
+        self.assertEqual(sorted(statuses), [201, 400, 400, 400])
+        self.assertEqual(Lab.objects.filter(course_semester=self.semester).count(), 4)
+
+
+@skipUnless(
+    connection.vendor == "postgresql", "The courses migrations need PostgreSQL."
+)
+class LabKeyMigrationTests(TransactionTestCase):
+    """Migrations 0020-0022 on labs that were keyed by their name."""
+
+    migrate_from = [("courses", "0019_keyset_pagination_indexes")]
+    migrate_to = [("courses", "0022_lab_name_unique_per_semester")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_labs_get_numbers_ids_and_their_contributions(self):
+        apps = self.migrate(self.migrate_from)
+        Course = apps.get_model("courses", "Course")
+        CourseSemester = apps.get_model("courses", "CourseSemester")
+        Lab = apps.get_model("courses", "Lab")
+        LearningOutcome = apps.get_model("courses", "LearningOutcome")
+        LabLOContribution = apps.get_model("courses", "LabLOContribution")
+
+        course = Course.objects.create(
+            course_code="CS101", course_name="Programming", department="CS"
+        )
+        outcome = LearningOutcome.objects.create(
+            course=course, outcome_code="LO1", outcome_name="Design"
+        )
+        fall, spring = (
+            CourseSemester.objects.create(
+                course=course, semester_name=name, num_of_lab=2
+            )
+            for name in ("Fall", "Spring")
+        )
+        for semester, lab_name in [
+            (fall, "Lab1-InLab"),
+            (fall, "Lab12-PreLab"),
+            (spring, "Lab2-InLab"),
+            (spring, "Quiz"),
+        ]:
+            lab = Lab.objects.create(
+                course_semester=semester, lab_name=lab_name, lab_type="InLab", weight=1
+            )
+            LabLOContribution.objects.create(
+                lab=lab,
+                outcome=outcome,
+                course_semester=semester,
+                contribution_percentage=len(lab_name),
+            )
+
+        apps = self.migrate(self.migrate_to)
+        CourseSemester = apps.get_model("courses", "CourseSemester")
+        Lab = apps.get_model("courses", "Lab")
+        LabLOContribution = apps.get_model("courses", "LabLOContribution")
+        self.assertEqual(
+            sorted(
+                Lab.objects.values_list(
+                    "course_semester__semester_name", "lab_name", "lab_number"
+                )
+            ),
+            [
+                ("Fall", "Lab1-InLab", 1),
+                ("Fall", "Lab12-PreLab", 12),
+                ("Spring", "Lab2-InLab", 2),
+                ("Spring", "Quiz", 0),
+            ],
+        )
+        self.assertEqual(
+            dict(CourseSemester.objects.values_list("semester_name", "lab_counter")),
+            {"Fall": 12, "Spring": 2},
+        )
+        self.assertEqual(
+            sorted(
+                LabLOContribution.objects.values_list(
+                    "lab__lab_name", "lab__course_semester", "contribution_percentage"
+                )
+            ),
+            [
+                ("Lab1-InLab", fall.pk, 10),
+                ("Lab12-PreLab", fall.pk, 12),
+                ("Lab2-InLab", spring.pk, 10),
+                ("Quiz", spring.pk, 4),
+            ],
+        )
+        self.assertEqual(
+            Lab.objects.values("id").distinct().count(), Lab.objects.count()
+        )
+
+
+class AssignTeachersTestCase(TransactionTestCase):
+    def setUp(self):
+        self.course = Course.objects.create(
+            course_code="CS101",
+            course_name="Programming",
+            department="CS",
+            creater="a@example.com",
+        )
+        CourseSemester.objects.create(
+            semester_name="Fall", course=self.course, num_of_lab=0
+        )
+        self.teacher = make_teacher("teacher")
+
+    def assign(self, role):
+        try:
+            return assign_teachers(
+                [
+                    {
+                        "teacher": self.teacher.email,
+                        "course": "CS101",
+                        "role": role,
+                        "course_semester": ["Fall"],
+                    }
+                ]
+            )
+        finally:
+            connection.close()
+
+
+class AssignTeachersTests(AssignTeachersTestCase):
+    def test_existing_assignment_is_updated(self):
+        self.assertEqual(self.assign("TA").created, 1)
+        result = self.assign("Lecturer")
+        self.assertEqual((result.created, result.updated), (0, 1))
+        self.assertEqual(CourseTeacher.objects.get().role, "Lecturer")
+
+
+# SQLite locks whole tables, so the assignments fail instead of waiting.
+@skipUnlessDBFeature("has_select_for_update")
+class ConcurrentAssignTeachersTests(AssignTeachersTestCase):
+    def test_concurrent_assignments_create_one_course_teacher(self):
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(self.assign, ["TA"] * 4))
+        self.assertEqual(sum(result.created for result in results), 1)
+        self.assertEqual(CourseTeacher.objects.filter(course=self.course).count(), 1)
+
+
+class TeacherAssignmentBulkTests(CourseTestCase):
+    url = "/api/teacher-assignments"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        CourseSemester.objects.create(
+            semester_name="Spring", course=cls.course, num_of_lab=0
+        )
+        cls.ta = make_teacher("ta")
+
+    def post(self, user, *assignments):
+        return self.client_for(user).post(
+            self.url, {"assignments": list(assignments)}, format="json"
+        )
+
+    def assignment(self, teacher, role="TA", semesters=("Fall", "Spring")):
+        return {
+            "teacher": teacher.email,
+            "course": "CS101",
+            "role": role,
+            "course_semester": list(semesters),
+        }
+
+    def test_assign(self):
+        response = self.post(
+            self.member,
+            self.assignment(self.ta),
+            self.assignment(self.member, "HeadLecturer", ["Fall"]),
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"created": 1, "updated": 1})
+        self.assertEqual(
+            sorted(
+                CourseTeacher.objects.values_list(
+                    "teacher__username", "role", "course_semester__semester_name"
+                )
+            ),
+            [
+                ("member", "HeadLecturer", "Fall"),
+                ("ta", "TA", "Fall"),
+                ("ta", "TA", "Spring"),
+            ],
+        )
+
+    def test_only_teachers_of_the_courses_may_assign(self):
+        response = self.post(self.outsider, self.assignment(self.ta))
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(CourseTeacher.objects.filter(teacher=self.ta).exists())
+
+    def test_invalid_assignments_assign_nothing(self):
+        response = self.post(
+            self.member,
+            self.assignment(self.ta),
+            self.assignment(self.outsider, semesters=["Winter"]),
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(),
+            {"assignments": {"1": ["Unknown semester 'Winter' of course 'CS101'."]}},
+        )
+        self.assertFalse(CourseTeacher.objects.filter(teacher=self.ta).exists())
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as f:
+            f.write("teacher,course,role,course_semester\n")
+            f.write("ta@example.com,CS101,TA,Fall;Spring\n")
+            f.flush()
+            stdout = io.StringIO()
+            call_command("assign_teachers", f.name, stdout=stdout)
+        self.assertIn("Created 1 and updated 0 assignments.", stdout.getvalue())
+        self.assertEqual(
+            CourseTeacher.objects.get(teacher=self.ta).course_semester.count(), 2
+        )
+
+
+class ContributionMatrixShapeTests(SimpleTestCase):
+    def test_dense_matrix_in_natural_order(self):
+        matrix = ContributionMatrix.from_rows(
+            [
+                ("Lab10", "LO2", Decimal("25.00")),
+                ("Lab9", "LO10", Decimal("50.00")),
+                ("Lab9", None, Decimal("10.00")),
+            ],
+            labs=["Lab10", "Lab9", "Lab2"],
+            outcomes=["LO10", "LO2", "LO1"],
+        )
+        self.assertEqual(
+            matrix.to_json(),
+            {
+                "labs": ["Lab2", "Lab9", "Lab10"],
+                "outcomes": ["LO1", "LO2", "LO10"],
+                "cells": [
+                    [0.0, 0.0, 0.0],
+                    [0.0, 0.0, 50.0],
+                    [0.0, 25.0, 0.0],
+                ],
+            },
+        )
+        self.assertEqual(matrix.get("Lab10", "LO2"), 25.0)
+        self.assertEqual(matrix.get("Lab2", "LO2"), 0.0)
+        self.assertEqual(matrix.get("Lab99", "LO2"), 0.0)
+
+
+class SemesterListMatrixTests(CourseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        outcome = LearningOutcome.objects.create(
+            course=cls.course, outcome_code="LO1", outcome_name="Design"
+        )
+        LearningOutcome.objects.create(
+            course=cls.course, outcome_code="LO2", outcome_name="Test"
+        )
+        lab10, _ = (
+            Lab.objects.create(
+                course_semester=cls.semester,
+                lab_number=number,
+                lab_name=f"Lab{number}",
+                lab_type="InLab",
+                weight=0.5,
+            )
+            for number in (10, 9)
+        )
+        # Lab9 has no contributions.
+        LabLOContribution.objects.create(
+            lab=lab10,
+            outcome=outcome,
+            course_semester=cls.semester,
+            contribution_percentage=75,
+        )
+        CourseSemester.objects.create(
+            semester_name="Spring", course=cls.course, num_of_lab=0
+        )
+
+    def test_semester_list(self):
+        response = self.client_for(self.member).get("/api/courses/CS101/semesters")
+        self.assertEqual(response.status_code, 200)
+        spring = CourseSemester.objects.get(semester_name="Spring")
+        self.assertEqual(
+            response.json()["results"],
+            [
+                {
+                    "pk": self.semester.pk,
+                    "semester_name": "Fall",
+                    "num_of_lab": 0,
+                    "course": "CS101 - Programming",
+                    "lab_lo_contributions": {
+                        "labs": ["Lab9", "Lab10"],
+                        "outcomes": ["LO1", "LO2"],
+                        "cells": [[0.0, 0.0], [75.0, 0.0]],
+                    },
+                },
+                {
+                    "pk": spring.pk,
+                    "semester_name": "Spring",
+                    "num_of_lab": 0,
+                    "course": "CS101 - Programming",
+                    "lab_lo_contributions": {
+                        "labs": [],
+                        "outcomes": ["LO1", "LO2"],
+                        "cells": [],
+                    },
+                },
+            ],
+        )
+
+    def test_matrices_are_prefetched(self):
+        semester = (
+            CourseSemester.objects.select_related("course")
+            .prefetch_related(*contribution_matrix_prefetches())
+            .get(pk=self.semester.pk)
+        )
+        with self.assertNumQueries(0):
+            matrix = ContributionMatrix.for_semester(semester)
+        self.assertEqual(matrix.labs, ["Lab9", "Lab10"])
+        self.assertEqual(
+            ContributionMatrix.for_semester(self.semester).to_json(), matrix.to_json()
+        )
+
+
+class ContributionMatrixTests(CourseTestCase):
+    expected = {
+        "labs": ["Lab1", "Lab2"],
+        "outcomes": ["LO1", "LO2"],
+        "cells": [[50.0, 0.0], [0.0, 0.0]],
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        lab1, _ = (
+            Lab.objects.create(
+                course_semester=cls.semester,
+                lab_number=number,
+                lab_name=f"Lab{number}",
+                lab_type="InLab",
+                weight=0.5,
+            )
+            for number in (1, 2)
+        )
+        lo1, _ = (
+            LearningOutcome.objects.create(
+                course=cls.course, outcome_code=code, outcome_name=code
+            )
+            for code in ("LO1", "LO2")
+        )
+        LabLOContribution.objects.create(
+            lab=lab1,
+            outcome=lo1,
+            course_semester=cls.semester,
+            contribution_percentage=50,
+        )
+
+    def test_labs_and_outcomes_without_contributions_are_included(self):
+        client = self.client_for(self.member)
+        response = client.get("/api/courses/CS101/semesters/Fall/contributions")
+        self.assertEqual(response.json(), self.expected)
+        response = client.get("/api/courses/CS101/semesters/Fall")
+        self.assertEqual(response.json()["lab_lo_contributions"], self.expected)
+        response = client.get("/api/courses/CS101/semesters")
+        semester = response.json()["results"][0]
+        self.assertEqual(semester["lab_lo_contributions"], self.expected)
+
+    def test_matrix_is_replaced(self):
+        client = self.client_for(self.member)
+        url = "/api/courses/CS101/semesters/Fall/contributions"
+        matrix = {
+            "labs": ["Lab1", "Lab2"],
+            "outcomes": ["LO1", "LO2"],
+            "cells": [[0, 100], [40, 60]],
+        }
+        response = client.put(url, matrix, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {**matrix, "cells": [[0.0, 100.0], [40.0, 60.0]]},
+        )
+        self.assertEqual(LabLOContribution.objects.count(), 3)
+
+    def test_invalid_matrix_is_rejected(self):
+        client = self.client_for(self.member)
+        response = client.put(
+            "/api/courses/CS101/semesters/Fall/contributions",
+            {"labs": ["Lab1", "Lab9"], "outcomes": ["LO1"], "cells": [[100], [50]]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"labs", "cells"})
+        self.assertEqual(LabLOContribution.objects.count(), 1)
+
+    @override_settings(ASYNC_DB_POOL=None)
+    def test_async_semester_detail(self):
+        request = APIRequestFactory().get("/api/courses/CS101/semesters/Fall")
+        force_authenticate(request, self.member)
+        view = async_views.CourseSemesterDetail.as_view()
+        response = async_to_sync(view)(
+            request, course_code="CS101", semester_name="Fall"
+        )
+        self.assertEqual(response.data["lab_lo_contributions"], self.expected)
+
+
+class CourseTreeTests(CourseTestCase):
+    url = "/api/courses/CS101/tree"
+
+    def add_semester(self, name, labs):
+        semester = CourseSemester.objects.create(
+            semester_name=name, course=self.course, num_of_lab=labs
+        )
+        outcome = LearningOutcome.objects.create(
+            course=self.course, outcome_code=f"LO-{name}", outcome_name=name
+        )
+        for number in range(1, labs + 1):
+            lab = Lab.objects.create(
+                course_semester=semester,
+                lab_number=number,
+                lab_name=f"Lab{number}",
+                lab_type="InLab",
+                weight=1 / labs,
+            )
+            LabLOContribution.objects.create(
+                lab=lab,
+                outcome=outcome,
+                course_semester=semester,
+                contribution_percentage=100,
+            )
+
+    def get_tree(self):
+        get_cache().clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client_for(self.member).get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+
+    def test_tree(self):
+        self.add_semester("Spring", 2)
+        tree, _ = self.get_tree()
+        self.assertEqual(tree["course_code"], "CS101")
+        self.assertEqual(
+            [outcome["outcome_code"] for outcome in tree["outcomes"]], ["LO-Spring"]
+        )
+        semesters = {
+            semester["semester_name"]: semester for semester in tree["semesters"]
+        }
+        self.assertEqual(semesters["Fall"]["labs"], [])
+        labs = semesters["Spring"]["labs"]
+        self.assertEqual([lab["lab_name"] for lab in labs], ["Lab1", "Lab2"])
+        self.assertEqual(labs[0]["contributions"][0]["outcome"], "LO-Spring")
+
+    def test_queries_do_not_grow_with_the_course(self):
+        self.add_semester("Spring", 1)
+        _, queries = self.get_tree()
+        self.add_semester("Summer", 5)
+        self.assertEqual(self.get_tree()[1], queries)
+
+    @override_settings(ASYNC_DB_POOL=None)
+    def test_async_tree_matches(self):
+        self.add_semester("Spring", 2)
+        tree, _ = self.get_tree()
+        request = APIRequestFactory().get(self.url)
+        force_authenticate(request, self.member)
+        response = async_to_sync(async_views.CourseTree.as_view())(
+            request, course_code="CS101"
+        )
+        self.assertEqual(json.loads(response.render().content), tree)
+
+
+class NaturalKeyTests(CourseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.lab = Lab.objects.create(
+            course_semester=cls.semester,
+            lab_number=1,
+            lab_name="Lab1",
+            lab_type="InLab",
+            weight=1,
+        )
+        cls.outcome = LearningOutcome.objects.create(
+            course=cls.course, outcome_code="LO1", outcome_name="Design"
+        )
+        CourseSemester.objects.create(
+            semester_name="Spring", course=cls.course, num_of_lab=0
+        )
+
+    def test_resolve_path(self):
+        with self.assertNumQueries(1):
+            path = resolve_path("CS101", "Fall", "Lab1", "LO1")
+        self.assertEqual(
+            path,
+            CoursePath(self.course.pk, self.semester.pk, self.lab.pk, self.outcome.pk),
+        )
+        self.assertEqual(resolve_path("CS101"), CoursePath(self.course.pk))
+        self.assertIsNone(resolve_path("CS101", "Fall", "Lab2"))
+        self.assertIsNone(resolve_path("CS999"))
+
+    def test_duplicate_semester_is_rejected(self):
+        client = self.client_for(self.member)
+        response = client.post(
+            "/api/courses/CS101/semesters", {"semester_name": "Fall", "num_of_lab": 1}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("semester_name", response.json())
+        response = client.patch(
+            "/api/courses/CS101/semesters/Fall", {"semester_name": "Spring"}
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.course.coursesemester_course.count(), 2)
+
+    def test_duplicate_outcome_is_rejected(self):
+        client = self.client_for(self.member)
+        response = client.post(
+            "/api/courses/CS101/outcomes",
+            {"outcome_code": "LO1", "outcome_name": "Again"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("outcome_code", response.json())
+        self.assertEqual(self.course.outcome_course.count(), 1)
+
+    def test_semester_outside_membership(self):
+        client = self.client_for(self.outsider)
+        self.assertEqual(
+            client.get("/api/courses/CS101/semesters/Fall").status_code, 403
+        )
+        self.assertEqual(
+            client.get("/api/courses/CS101/semesters/Winter").status_code, 404
+        )
+
+
+class ValuesSerializerTests(CourseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for number in (1, 2):
+            Lab.objects.create(
+                course_semester=cls.semester,
+                lab_number=number,
+                lab_name=f"Lab{number}",
+                lab_type="InLab",
+                weight=0.25 * number,
+            )
+            LearningOutcome.objects.create(
+                course=cls.course,
+                outcome_code=f"LO{number}",
+                outcome_name="Design",
+                outcome_description="Désigns   programs",
+            )
+
+    def assertMatchesModelSerializer(self, url, serializer_class, queryset):
+        response = self.client_for(self.member).get(url)
+        self.assertEqual(response.status_code, 200)
+        expected = serializer_class(queryset, many=True).data
+        self.assertEqual(response.json()["results"], json.loads(json.dumps(expected)))
+
+    def test_labs(self):
+        self.assertMatchesModelSerializer(
+            "/api/courses/CS101/semesters/Fall/labs",
+            LabSerializer,
+            Lab.objects.order_by("pk"),
+        )
+
+    def test_outcomes(self):
+        self.assertMatchesModelSerializer(
+            "/api/courses/CS101/outcomes",
+            LearningOutcomeSerializer,
+            LearningOutcome.objects.order_by("pk"),
+        )
+
+    def test_renderer_matches_drf(self):
+        data = {
+            "text": "Désigns   programs",
+            "weight": 0.5,
+            "when": timezone.now(),
+            "items": [Decimal("1.50"), None, True],
+        }
+        self.assertEqual(
+            JSONRenderer().render(data), renderers.JSONRenderer().render(data)
+        )
+
+
+@override_settings(DATABASE_REPLICAS={DEFAULT_DB_ALIAS: 1})
+class ReplicaRoutingTests(CourseTestCase):
+    def tearDown(self):
+        router._down_until.clear()
+
+    def test_parse_replicas(self):
+        primary = {"NAME": "lms", "HOST": "db", "PORT": "5432", "USER": "lms"}
+        databases, weights = router.parse_replicas("ro-1:5433/lms_ro=2, ro-2", primary)
+        self.assertEqual(weights, {"replica1": 2.0, "replica2": 1.0})
+        self.assertEqual(
+            databases["replica1"],
+            {
+                "NAME": "lms_ro",
+                "HOST": "ro-1",
+                "PORT": "5433",
+                "USER": "lms",
+                "TEST": {"MIRROR": DEFAULT_DB_ALIAS},
+            },
+        )
+        self.assertEqual(databases["replica2"]["NAME"], "lms")
+        self.assertEqual(router.parse_replicas("", primary), ({}, {}))
+
+    def test_routes_safe_requests_of_replica_apps(self):
+        factory = RequestFactory()
+        sticky = factory.get("/api/courses/")
+        sticky.COOKIES[router.STICKY_COOKIE] = "1"
+        for request, routed in [
+            (factory.get("/api/courses/CS101/outcomes"), True),
+            (factory.post("/api/courses/CS101/outcomes"), False),
+            (sticky, False),
+            (factory.get("/api/notifications/"), False),
+            (factory.get("/missing"), False),
+        ]:
+            with self.subTest(method=request.method, path=request.path):
+                self.assertEqual(router.routes_to_replica(request), routed)
+
+    def test_router_reads_replica_apps_from_the_request_alias(self):
+        token = router.read_alias.set("replica1")
+        try:
+            self.assertEqual(Course.objects.all().db, "replica1")
+            self.assertEqual(UserProfile.objects.all().db, "replica1")
+            self.assertEqual(Notification.objects.all().db, DEFAULT_DB_ALIAS)
+            self.assertEqual(
+                router.ReplicaRouter().db_for_write(Course), DEFAULT_DB_ALIAS
+            )
+            self.assertFalse(may_cache(time.time_ns()))
+        finally:
+            router.read_alias.reset(token)
+        self.assertEqual(Course.objects.all().db, DEFAULT_DB_ALIAS)
+        self.assertTrue(may_cache(time.time_ns()))
+
+    def test_unavailable_replica_is_skipped(self):
+        with mock.patch.object(
+            connections[DEFAULT_DB_ALIAS],
+            "ensure_connection",
+            side_effect=OperationalError,
+        ) as ensure_connection:
+            self.assertIsNone(router.choose_replica())
+            self.assertIsNone(router.choose_replica())
+        self.assertEqual(ensure_connection.call_count, 1)
+
+    def test_write_makes_the_client_sticky(self):
+        client = self.client_for(self.member)
+        response = client.get("/api/courses/CS101/outcomes")
+        self.assertNotIn(router.STICKY_COOKIE, response.cookies)
+        response = client.post(
+            "/api/courses/CS101/outcomes",
+            {"outcome_code": "LO1", "outcome_name": "Design"},
+        )
+        self.assertEqual(response.status_code, 201)
+        cookie = response.cookies[router.STICKY_COOKIE]
+        self.assertEqual(cookie["max-age"], settings.REPLICA_STICKY_SECONDS)
+
+
+class TeacherCourseSummaryTests(CourseTestCase):
+    def course_list(self):
+        response = self.client_for(self.member).get("/api/courses/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def summary(self):
+        return TeacherCourseSummary.objects.get(course_teacher__teacher=self.member)
+
+    def test_course_list(self):
+        Lab.objects.create(
+            course_semester=self.semester,
+            lab_number=1,
+            lab_name="Lab1",
+            lab_type="InLab",
+            weight=1,
+        )
+        LearningOutcome.objects.create(course=self.course, outcome_code="LO1")
+        expected = CourseReadSerializer(
+            CourseTeacher.objects.filter(teacher=self.member), many=True
+        ).data
+        self.assertEqual(
+            self.course_list(),
+            [
+                {
+                    **expected[0],
+                    "role": "Lecturer",
+                    "lab_count": 1,
+                    "outcome_count": 1,
+                }
+            ],
+        )
+
+    def test_queries_do_not_grow_with_the_courses(self):
+        with CaptureQueriesContext(connection) as one_course:
+            self.course_list()
+        for code in ("CS102", "CS103", "CS104"):
+            course = Course.objects.create(course_code=code, course_name=code)
+            semester = CourseSemester.objects.create(
+                semester_name="Fall", course=course, num_of_lab=0
+            )
+            CourseTeacher.objects.create(
+                course=course, teacher=self.member, role="Lecturer"
+            ).course_semester.add(semester)
+        get_cache().clear()
+        with self.assertNumQueries(len(one_course)):
+            self.assertEqual(len(self.course_list()), 4)
+
+    def test_summary_follows_writes(self):
+        course_teacher = CourseTeacher.objects.get(teacher=self.member)
+        spring = CourseSemester.objects.create(
+            semester_name="Spring", course=self.course, num_of_lab=0
+        )
+        course_teacher.course_semester.add(spring)
+        self.assertEqual(self.summary().semester_names, ["Fall", "Spring"])
+
+        lab = Lab.objects.create(
+            course_semester=spring,
+            lab_number=1,
+            lab_name="Lab1",
+            lab_type="InLab",
+            weight=1,
+        )
+        outcome = LearningOutcome.objects.create(course=self.course, outcome_code="LO1")
+        self.assertEqual(
+            (self.summary().lab_count, self.summary().outcome_count), (1, 1)
+        )
+
+        spring.semester_name = "Summer"
+        spring.save()
+        self.course.course_name = "Programming I"
+        self.course.save()
+        summary = self.summary()
+        self.assertEqual(summary.semester_names, ["Fall", "Summer"])
+        self.assertEqual(summary.course_name, "Programming I")
+
+        lab.delete()
+        outcome.delete()
+        self.assertEqual(
+            (self.summary().lab_count, self.summary().outcome_count), (0, 0)
+        )
+
+        spring.courseteacher_semester.clear()
+        self.assertEqual(self.summary().semester_names, ["Fall"])
+        self.semester.delete()
+        self.assertEqual(self.summary().semester_names, [])
+
+    def test_rebuild(self):
+        TeacherCourseSummary.objects.all().delete()
+        stdout = io.StringIO()
+        call_command("rebuild_course_summaries", stdout=stdout)
+        self.assertIn("Rebuilt 1 course summaries.", stdout.getvalue())
+        self.assertEqual(self.summary().semester_names, ["Fall"])
+
+
+class SemesterCloneTests(CourseTestCase):
+    url = "/api/courses/CS101/semesters/Fall/clone"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.outcome = LearningOutcome.objects.create(
+            course=cls.course, outcome_code="LO1"
+        )
+        for number in (1, 2):
+            lab = Lab.objects.create(
+                course_semester=cls.semester,
+                lab_number=number,
+                lab_name=f"Lab{number}",
+                lab_type="InLab",
+                weight=0.5,
+            )
+            LabLOContribution.objects.create(
+                lab=lab,
+                outcome=cls.outcome,
+                course_semester=cls.semester,
+                contribution_percentage=10 * number,
+            )
+
+    def test_clone(self):
+        response = self.client_for(self.member).post(
+            self.url, {"semester_name": "Spring"}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["semester_name"], "Spring")
+        spring = CourseSemester.objects.get(semester_name="Spring")
+        self.assertEqual(
+            list(
+                spring.lab_set.order_by("lab_number").values_list(
+                    "lab_number", "lab_name", "lab_type", "weight"
+                )
+            ),
+            [(1, "Lab1", "InLab", 0.5), (2, "Lab2", "InLab", 0.5)],
+        )
+        self.assertEqual(
+            sorted(
+                LabLOContribution.objects.filter(course_semester=spring).values_list(
+                    "lab__lab_name",
+                    "lab__course_semester",
+                    "outcome",
+                    "contribution_percentage",
+                )
+            ),
+            [
+                ("Lab1", spring.pk, self.outcome.pk, 10),
+                ("Lab2", spring.pk, self.outcome.pk, 20),
+            ],
+        )
+        self.assertEqual(
+            list(spring.courseteacher_semester.values_list("teacher", flat=True)),
+            [self.member.pk],
+        )
+        summary = TeacherCourseSummary.objects.get(course_teacher__teacher=self.member)
+        self.assertEqual(summary.semester_names, ["Fall", "Spring"])
+        self.assertEqual(summary.lab_count, 4)
+        # The source is left as it was.
+        self.assertEqual(self.semester.lab_set.count(), 2)
+
+    def test_clone_bumps_the_course_version_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client_for(self.member).post(
+                self.url, {"semester_name": "Spring"}
+            )
+        self.assertEqual(response.status_code, 201)
+        version = get_course_version("CS101")
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_course_version("CS101"), version)
+
+    def test_existing_name_is_rejected(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client_for(self.member).post(
+                self.url, {"semester_name": "Fall"}
+            )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("semester_name", response.json())
+        self.assertEqual(Lab.objects.count(), 2)
+        self.assertEqual(callbacks, [])
+
+    def test_other_integrity_errors_are_not_reported_as_duplicates(self):
+        error = IntegrityError("violates foreign key constraint")
+        with mock.patch.object(
+            LabLOContribution.objects, "bulk_create", side_effect=error
+        ), self.captureOnCommitCallbacks() as callbacks:
+            with self.assertRaises(IntegrityError):
+                self.client_for(self.member).post(self.url, {"semester_name": "Spring"})
+        self.assertFalse(CourseSemester.objects.filter(semester_name="Spring").exists())
+        summary = TeacherCourseSummary.objects.get(course_teacher__teacher=self.member)
+        self.assertEqual(summary.semester_names, ["Fall"])
+        self.assertEqual(callbacks, [])
+
+    def test_outsider_cannot_clone(self):
+        response = self.client_for(self.outsider).post(
+            self.url, {"semester_name": "Spring"}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(CourseSemester.objects.filter(semester_name="Spring").exists())
+
+
+class CourseSearchTests(CourseTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Course.objects.create(
+            course_code="CS201",
+            course_name="Introduction to Programming",
+            department="CS",
+        )
+        Course.objects.create(
+            course_code="MA201", course_name="Linear Algebra", department="Math"
+        )
+        Course.objects.create(
+            course_code="MA301",
+            course_name="Programming for Mathematicians",
+            department="Math",
+        )
+
+    def search(self, **params):
+        response = self.client_for(self.member).get("/api/courses/search", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def codes(self, **params):
+        return [course["course_code"] for course in self.search(**params)["results"]]
+
+    def test_every_word_matches_as_a_prefix(self):
+        self.assertEqual(self.codes(q="intro prog"), ["CS201"])
+        self.assertEqual(self.codes(q="LINEAR"), ["MA201"])
+        self.assertEqual(set(self.codes(q="prog")), {"CS101", "CS201", "MA301"})
+
+    def test_department_narrows_results_not_facets(self):
+        response = self.search(q="prog", department="Math")
+        self.assertEqual(
+            response["results"],
+            [
+                {
+                    "pk": Course.objects.get(course_code="MA301").pk,
+                    "course_code": "MA301",
+                    "course_name": "Programming for Mathematicians",
+                    "department": "Math",
+                }
+            ],
+        )
+        self.assertEqual(
+            response["facets"],
+            {
+                "department": [
+                    {"department": "CS", "count": 2},
+                    {"department": "Math", "count": 1},
+                ]
+            },
+        )
+
+    def test_limit(self):
+        self.assertEqual(len(self.codes(q="prog", limit=2)), 2)
+
+    def test_query_is_required(self):
+        response = self.client_for(self.member).get("/api/courses/search")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.search(q="--")["results"], [])
@@ -1,11 +1,26 @@
+from django.conf import settings
 from django.urls import path
-from courses import views
+from courses import async_views, views
+
+# Under ASGI the hot read endpoints are served by async views.
+read_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path("courses/", views.CourseList.as_view(), name="course-list"),
+    path("courses/", read_views.CourseList.as_view(), name="course-list"),
+    path("courses/search", views.CourseSearch.as_view(), name="course-search"),
+    path(
+        "teacher-assignments",
+        views.TeacherAssignmentBulk.as_view(),
+        name="teacher-assignments",
+    ),
     path(
         "courses/<str:course_code>/", views.CourseDetail.as_view(), name="course-detail"
     ),
+    path(
+        "courses/<str:course_code>/tree",
+        read_views.CourseTree.as_view(),
+        name="course-tree",
+    ),
     path(
         "courses/<str:course_code>/semesters",
         views.CourseSemesterList.as_view(),
@@ -13,9 +28,14 @@ urlpatterns = [
     ),
     path(
         "courses/<str:course_code>/semesters/<str:semester_name>",
-        views.CourseSemesterDetail.as_view(),
+        read_views.CourseSemesterDetail.as_view(),
         name="semester-detail",
     ),
+    path(
+        "courses/<str:course_code>/semesters/<str:semester_name>/clone",
+        views.CourseSemesterClone.as_view(),
+        name="semester-clone",
+    ),
     path(
         "courses/<str:course_code>/teachers",
         views.CourseTeacherList.as_view(),
@@ -28,9 +48,14 @@ urlpatterns = [
     ),
     path(
         "courses/<str:course_code>/semesters/<str:semester_name>/labs",
-        views.LabList.as_view(),
+        read_views.LabList.as_view(),
         name="lab-list",
     ),
+    path(
+        "courses/<str:course_code>/semesters/<str:semester_name>/generate-labs",
+        views.LabGenerate.as_view(),
+        name="lab-generate",
+    ),
     path(
         "courses/<str:course_code>/semesters/<str:semester_name>/labs/<str:lab_pk>",
         views.LabDetail.as_view(),
@@ -46,6 +71,11 @@ urlpatterns = [
         views.LearningOutcomeDetail.as_view(),
         name="lo-detail",
     ),
+    path(
+        "courses/<str:course_code>/semesters/<str:semester_name>/contributions",
+        views.ContributionMatrixDetail.as_view(),
+        name="contribution-matrix",
+    ),
     path(
         "courses/<str:course_code>/semesters/<str:semester_name>/labs/<str:lab_pk>/contributions",
         views.LabLOList.as_view(),
@@ -5,8 +5,12 @@ from courses.models import (
     Lab,
     LearningOutcome,
     LabLOContribution,
+    TeacherCourseSummary,
 )
-from rest_framework import exceptions, serializers
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from rest_framework import exceptions, serializers, status
+from rest_framework.response import Response
 
 
 from courses.serializers import (
@@ -14,14 +18,33 @@ from courses.serializers import (
     CourseReadSerializer,
     CourseSemesterSerializer,
     CourseSemesterReadSerializer,
+    CourseSemesterCloneSerializer,
     CourseTeacherSerializer,
+    TeacherAssignmentListSerializer,
     LabSerializer,
+    LabGenerateSerializer,
     LearningOutcomeSerializer,
     LabLOContributionSerializer,
+    ContributionMatrixSerializer,
+    CourseTreeSerializer,
+    CourseSummaryValuesSerializer,
+    CourseSearchSerializer,
+    CourseSearchValuesSerializer,
+    LabValuesSerializer,
+    LearningOutcomeValuesSerializer,
 )
 from rest_framework import generics
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import IsAuthenticated
+from courses.assignments import AssignmentError, assign_teachers
+from courses.cache import CachedResponseMixin, bump_course_version
+from courses.matrix import ContributionMatrix, contribution_matrix_prefetches
+from courses.membership import CourseMembershipMixin
+from courses.natural_keys import resolve_path
+from courses.search import department_facets, search_courses
+from courses.summary import refresh_semester
+from LMSSystemBackend.values import ValuesListMixin
 from courses.permissions import (
     IsLecturerOrHeadLecturer,
     IsTeacherForCourse,
@@ -32,8 +55,70 @@ from courses.permissions import (
 from user_profiles.permissions import IsTeacher
 
 
-class CourseList(generics.ListCreateAPIView):
+def violates(error, model, constraint_name):
+    """Whether the ``IntegrityError`` is a violation of ``model``'s constraint."""
+    diag = getattr(error.__cause__, "diag", None)
+    if diag is not None:
+        return diag.constraint_name == constraint_name
+    # SQLite names the columns instead of the constraint.
+    (constraint,) = (c for c in model._meta.constraints if c.name == constraint_name)
+    columns = ", ".join(
+        f"{model._meta.db_table}.{model._meta.get_field(field).column}"
+        for field in constraint.fields
+    )
+    return str(error) == f"UNIQUE constraint failed: {columns}"
+
+
+def save_unique(serializer, model, constraint_name, field, message, **kwargs):
+    """
+    Save, reporting a violation of ``model``'s unique constraint on ``field``
+    as a 400. Other integrity errors propagate.
+    """
+    try:
+        with transaction.atomic():
+            serializer.save(**kwargs)
+    except IntegrityError as e:
+        if not violates(e, model, constraint_name):
+            raise
+        raise serializers.ValidationError({field: [message]})
+
+
+def save_lab(serializer, **kwargs):
+    save_unique(
+        serializer,
+        Lab,
+        "unique_lab_name_per_semester",
+        "lab_name",
+        "A lab with this name already exists in this semester.",
+        **kwargs,
+    )
+
+
+def save_semester(serializer, **kwargs):
+    save_unique(
+        serializer,
+        CourseSemester,
+        "unique_semester_name_per_course",
+        "semester_name",
+        "A semester with this name already exists in this course.",
+        **kwargs,
+    )
+
+
+def save_outcome(serializer, **kwargs):
+    save_unique(
+        serializer,
+        LearningOutcome,
+        "unique_outcome_code_per_course",
+        "outcome_code",
+        "An outcome with this code already exists in this course.",
+        **kwargs,
+    )
+
+
+class CourseList(ValuesListMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated, IsTeacher]
+    values_serializer_class = CourseSummaryValuesSerializer
 
     def get_serializer_class(self):
         if self.request.method in ["POST"]:
@@ -47,14 +132,12 @@ class CourseList(generics.ListCreateAPIView):
             if self.request.method in ["POST"]:
                 queryset = Course.objects.filter(courseteacher_course__teacher=user)
             else:
-                queryset = CourseTeacher.objects.filter(teacher=user).select_related(
-                    "teacher"
-                )
+                queryset = TeacherCourseSummary.objects.filter(teacher=user)
         else:
             if self.request.method in ["POST"]:
                 queryset = Course.objects.none()
             else:
-                queryset = CourseTeacher.objects.none()
+                queryset = TeacherCourseSummary.objects.none()
 
         return queryset
 
@@ -62,7 +145,37 @@ class CourseList(generics.ListCreateAPIView):
         serializer.save(creater=self.request.user.email)
 
 
-class CourseDetail(generics.RetrieveUpdateDestroyAPIView):
+class CourseSearch(generics.GenericAPIView):
+    """
+    Catalog search by code, name and department, best matches first, with
+    the number of matches per department. ``?q=`` is required; ``department``
+    narrows the results (not the facets) and ``limit`` caps them.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = CourseSearchSerializer
+
+    def get(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+
+        courses = search_courses(Course.objects.all(), params["q"])
+        results = courses
+        if "department" in params:
+            results = results.filter(department=params["department"])
+        rows = CourseSearchValuesSerializer.get_values(results)[: params["limit"]]
+        return Response(
+            {
+                "results": CourseSearchValuesSerializer(rows).data,
+                "facets": {"department": department_facets(courses)},
+            }
+        )
+
+
+class CourseDetail(
+    CachedResponseMixin, CourseMembershipMixin, generics.RetrieveUpdateDestroyAPIView
+):
     permission_classes = [IsAuthenticated, IsTeacher, IsTeacherForCourse]
     serializer_class = CourseSerializer
     queryset = Course.objects.all()
@@ -70,41 +183,90 @@ class CourseDetail(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = ["course_code"]
 
     def get_object(self):
-        user = self.request.user
-        queryset = self.get_queryset()
-        course_code = self.kwargs.get("course_code")
-        try:
-            obj = get_object_or_404(queryset, course_code=course_code)
-        except exceptions.NotFound:
-            raise exceptions.NotFound("The requested course does not exist.")
+        membership = self.get_membership()
+        if membership.is_member:
+            obj = membership.course
+        else:
+            queryset = self.get_queryset()
+            course_code = self.kwargs.get("course_code")
+            try:
+                obj = get_object_or_404(queryset, course_code=course_code)
+            except exceptions.NotFound:
+                raise exceptions.NotFound("The requested course does not exist.")
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def check_cache_permissions(self):
+        self.get_object()
 
-class CourseSemesterList(generics.ListCreateAPIView):
-    permission_classes = [IsAuthenticated, IsTeacher]
-    lookup_url_kwarg = ["course_code"]
-    serializer_class = CourseSemesterSerializer
 
-    def check_permissions(self, request):
-        course_code = self.kwargs.get("course_code")
-        return CourseTeacher.objects.get(
-            course__course_code=course_code, teacher=request.user
+class CourseTree(CachedResponseMixin, CourseMembershipMixin, generics.RetrieveAPIView):
+    """
+    The whole course in one response, loaded with one query per level
+    (semesters, labs, contributions, outcomes) however large it is.
+    """
+
+    permission_classes = [IsAuthenticated, IsTeacher, CanManageCourseData]
+    serializer_class = CourseTreeSerializer
+
+    def get_prefetches(self):
+        semesters = CourseSemester.objects.order_by("id")
+        semester_name = self.request.query_params.get("semester")
+        if semester_name:
+            semesters = semesters.filter(semester_name=semester_name)
+        contributions = (
+            LabLOContribution.objects.select_related("outcome")
+            .only("lab", "contribution_percentage", "outcome__outcome_code")
+            .order_by("outcome__outcome_code")
         )
+        labs = Lab.objects.order_by("lab_number", "id").prefetch_related(
+            Prefetch("contribution_lab", contributions, to_attr="tree_contributions")
+        )
+        return [
+            Prefetch(
+                "coursesemester_course",
+                semesters.prefetch_related(Prefetch("lab_set", labs, to_attr="tree_labs")),
+                to_attr="tree_semesters",
+            ),
+            Prefetch(
+                "outcome_course",
+                LearningOutcome.objects.order_by("outcome_code"),
+                to_attr="tree_outcomes",
+            ),
+        ]
+
+    def get_object(self):
+        course = self.get_course()
+        prefetch_related_objects([course], *self.get_prefetches())
+        if self.request.query_params.get("semester") and not course.tree_semesters:
+            raise exceptions.NotFound("The requested semester does not exist.")
+        return course
+
+
+class CourseSemesterList(CourseMembershipMixin, generics.ListCreateAPIView):
+    permission_classes = [IsAuthenticated, IsTeacher, CanManageCourseData]
+    lookup_url_kwarg = ["course_code"]
+
+    def get_serializer_class(self):
+        if self.request.method in ["POST"]:
+            return CourseSemesterSerializer
+        return CourseSemesterReadSerializer
 
     def get_queryset(self):
         queryset = CourseSemester.objects.filter(
             course__course_code=self.kwargs.get("course_code")
         ).select_related("course")
+        if self.request.method in ["GET"]:
+            queryset = queryset.prefetch_related(*contribution_matrix_prefetches())
         return queryset
 
     def perform_create(self, serializer):
-        serializer.save(
-            course=Course.objects.get(course_code=self.kwargs.get("course_code"))
-        )
+        save_semester(serializer, course=self.get_course())
 
 
-class CourseSemesterDetail(generics.RetrieveUpdateDestroyAPIView):
+class CourseSemesterDetail(
+    CachedResponseMixin, CourseMembershipMixin, generics.RetrieveUpdateDestroyAPIView
+):
     permission_classes = [IsAuthenticated, IsTeacher, CanAccessSemesterObj]
     serializer_class = CourseSemesterSerializer
     lookup_url_kwarg = ["semester_name", "course_code"]
@@ -118,17 +280,46 @@ class CourseSemesterDetail(generics.RetrieveUpdateDestroyAPIView):
     def get_object(self):
         course_code = self.kwargs.get("course_code")
         semester_name = self.kwargs.get("semester_name")
-        obj = get_object_or_404(
-            CourseSemester.objects.filter(
-                course__course_code=course_code
-            ).select_related("course"),
-            semester_name=semester_name,
-        )
+        obj = self.get_membership().get_semester(semester_name)
+        if obj is None:
+            # Not one of the user's semesters: only tells 404 from 403.
+            path = resolve_path(course_code, semester_name)
+            if path is None:
+                raise Http404
+            obj = CourseSemester(
+                pk=path.semester_id,
+                course_id=path.course_id,
+                semester_name=semester_name,
+            )
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def check_cache_permissions(self):
+        self.get_object()
+
+    def perform_update(self, serializer):
+        save_semester(serializer)
+
+
+class CourseSemesterClone(CourseMembershipMixin, generics.GenericAPIView):
+    """Copy the semester's labs, contributions and teachers into a new semester."""
+
+    permission_classes = [IsAuthenticated, CanManageLabData]
+    serializer_class = CourseSemesterCloneSerializer
+
+    def post(self, request, *args, **kwargs):
+        source = self.get_semester()
+        course = self.get_course()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        save_semester(serializer, course_semester=source, course=course)
+        return Response(
+            CourseSemesterSerializer(serializer.instance).data,
+            status=status.HTTP_201_CREATED,
+        )
+
 
-class CourseTeacherList(generics.ListCreateAPIView):
+class CourseTeacherList(CourseMembershipMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated, CanManageCourseData]
     lookup_url_kwarg = ["course_code"]
     serializer_class = CourseTeacherSerializer
@@ -148,8 +339,41 @@ class CourseTeacherList(generics.ListCreateAPIView):
         ).prefetch_related("course_semester")
 
     def perform_create(self, serializer):
-        target_course = Course.objects.get(course_code=self.kwargs.get("course_code"))
-        serializer.save(course=target_course)
+        serializer.save(course=self.get_course())
+
+
+class TeacherAssignmentBulk(generics.GenericAPIView):
+    """
+    Assign many teachers to courses and semesters at once, see
+    ``courses.assignments``. The user must teach every course named.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = TeacherAssignmentListSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        assignments = serializer.validated_data["assignments"]
+
+        course_codes = {assignment["course"] for assignment in assignments}
+        if not request.user.is_superuser:
+            taught = CourseTeacher.objects.filter(
+                teacher=request.user, course__course_code__in=course_codes
+            ).values_list("course__course_code", flat=True)
+            denied = course_codes.difference(taught)
+            if denied:
+                raise exceptions.PermissionDenied(
+                    f"You do not teach {', '.join(sorted(denied))}."
+                )
+
+        try:
+            result = assign_teachers(assignments)
+        except AssignmentError as e:
+            raise serializers.ValidationError(
+                {"assignments": {error["index"]: [error["error"]] for error in e.errors}}
+            )
+        return Response(result.to_json(), status=status.HTTP_201_CREATED)
 
 
 class CourseTeacherDetail(generics.RetrieveUpdateDestroyAPIView):
@@ -172,31 +396,41 @@ class CourseTeacherDetail(generics.RetrieveUpdateDestroyAPIView):
         return obj
 
 
-class LabList(generics.ListCreateAPIView):
+class LabList(
+    CachedResponseMixin,
+    ValuesListMixin,
+    CourseMembershipMixin,
+    generics.ListCreateAPIView,
+):
     permission_classes = [IsAuthenticated, CanManageLabData]
     serializer_class = LabSerializer
+    values_serializer_class = LabValuesSerializer
 
     def get_queryset(self):
-        course_code = self.kwargs.get("course_code")
-        semester_name = self.kwargs.get("semester_name")
-        return Lab.objects.filter(
-            course_semester__semester_name=semester_name,
-            course_semester__course__course_code=course_code,
-        ).select_related("course_semester")
+        return Lab.objects.filter(course_semester=self.get_semester()).select_related(
+            "course_semester__course"
+        )
 
     def perform_create(self, serializer):
-        course_code = self.kwargs.get("course_code")
-        semester_name = self.kwargs.get("semester_name")
-        try:
-            target_semester = CourseSemester.objects.get(
-                semester_name=semester_name, course__course_code=course_code
-            )
-        except CourseSemester.DoesNotExist as e:
-            raise serializers.ValidationError({"semester": [str(e)]})
-        serializer.save(course_semester=target_semester)
+        save_lab(serializer, course_semester=self.get_semester())
+
+
+class LabGenerate(CourseMembershipMixin, generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, CanManageLabData]
+    serializer_class = LabGenerateSerializer
 
+    def post(self, request, *args, **kwargs):
+        semester = self.get_semester()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        labs = serializer.save(course_semester=semester)
+        # bulk_create sends no signals.
+        bump_course_version(semester.course.course_code)
+        refresh_semester(semester.pk)
+        return Response(LabSerializer(labs, many=True).data, status=status.HTTP_201_CREATED)
 
-class LabDetail(generics.RetrieveUpdateDestroyAPIView):
+
+class LabDetail(CourseMembershipMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated, CanManageLabData]
     serializer_class = LabSerializer
     queryset = Lab.objects.all()
@@ -204,23 +438,27 @@ class LabDetail(generics.RetrieveUpdateDestroyAPIView):
     lookup_field = ["semester_name", "course_code", "lab_pk"]
 
     def get_object(self):
-        course_code = self.kwargs.get("course_code")
-        semester_name = self.kwargs.get("semester_name")
+        semester = self.get_semester()
         lab_pk = self.kwargs.get("lab_pk")
         queryset = self.get_queryset()
-        obj = get_object_or_404(
-            queryset,
-            course_semester__course__course_code=course_code,
-            course_semester__semester_name=semester_name,
-            pk=lab_pk,
-        )
+        obj = get_object_or_404(queryset, course_semester=semester, lab_name=lab_pk)
+        obj.course_semester = semester
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def perform_update(self, serializer):
+        save_lab(serializer)
 
-class LearningOutcomeList(generics.ListCreateAPIView):
+
+class LearningOutcomeList(
+    CachedResponseMixin,
+    ValuesListMixin,
+    CourseMembershipMixin,
+    generics.ListCreateAPIView,
+):
     permission_classes = [IsAuthenticated, CanManageCourseData]
     serializer_class = LearningOutcomeSerializer
+    values_serializer_class = LearningOutcomeValuesSerializer
     lookup_url_kwarg = ["course_code"]
 
     def get_queryset(self):
@@ -229,8 +467,7 @@ class LearningOutcomeList(generics.ListCreateAPIView):
         ).select_related("course")
 
     def perform_create(self, serializer):
-        target_course = Course.objects.get(course_code=self.kwargs.get("course_code"))
-        serializer.save(course=target_course)
+        save_outcome(serializer, course=self.get_course())
 
 
 class LearningOutcomeDetail(generics.RetrieveUpdateDestroyAPIView):
@@ -247,59 +484,74 @@ class LearningOutcomeDetail(generics.RetrieveUpdateDestroyAPIView):
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def perform_update(self, serializer):
+        save_outcome(serializer)
+
 
-class LabLOList(generics.CreateAPIView):
+class LabLOList(CourseMembershipMixin, generics.CreateAPIView):
     permission_classes = [IsAuthenticated, CanManageLabData]
     serializer_class = LabLOContributionSerializer
     lookup_url_kwarg = ["semester_name", "course_code", "lab_pk"]
     lookup_field = ["semester_name", "course_code", "lab_pk"]
 
     def get_queryset(self):
-        course_code = self.kwargs.get("course_code")
-        semester_name = self.kwargs.get("semester_name")
         return LabLOContribution.objects.filter(
-            course_semester__semester_name=semester_name,
-            course_semester__course__course_code=course_code,
-            lab__lab_name=lab_pk,
+            course_semester=self.get_semester(),
+            lab__lab_name=self.kwargs.get("lab_pk"),
         ).select_related("course_semester", "lab")
 
     def perform_create(self, serializer):
-        course_code = self.kwargs.get("course_code")
-        semester_name = self.kwargs.get("semester_name")
+        semester = self.get_semester()
         lab_name = self.kwargs.get("lab_pk")
         try:
-            target_lab = Lab.objects.get(
-                course_semester__semester_name=semester_name,
-                course_semester__course__course_code=course_code,
-                lab_name=lab_name,
-            )
+            target_lab = Lab.objects.get(course_semester=semester, lab_name=lab_name)
         except Lab.DoesNotExist as e:
             raise serializers.ValidationError({"Lab": [str(e)]})
 
-        serializer.save(
+        save_unique(
+            serializer,
+            LabLOContribution,
+            "unique_contribution_per_lab_outcome",
+            "outcome",
+            "This lab already contributes to this outcome.",
             lab=target_lab,
-            course_semester=target_lab.course_semester,
+            course_semester=semester,
         )
 
 
-class LabLODetail(generics.RetrieveUpdateDestroyAPIView):
+class LabLODetail(CourseMembershipMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated, CanManageLabData]
     serializer_class = LabLOContributionSerializer
     lookup_url_kwarg = ["semester_name", "course_code", "lab_pk", "outcome_code"]
     lookup_field = ["semester_name", "course_code", "lab_pk", "outcome_code"]
 
     def get_object(self):
-        course_code = self.kwargs.get("course_code")
-        semester_name = self.kwargs.get("semester_name")
+        semester = self.get_semester()
         lab_name = self.kwargs.get("lab_pk")
         outcome_code = self.kwargs.get("outcome_code")
         obj = get_object_or_404(
             LabLOContribution.objects.filter(
-                course_semester__semester_name=semester_name,
-                lab__lab_name=lab_name,
-                course_semester__course__course_code=course_code,
-            ).select_related("course_semester", "lab"),
+                course_semester=semester, lab__lab_name=lab_name
+            ).select_related("lab", "outcome"),
             outcome__outcome_code=outcome_code,
         )
+        obj.course_semester = semester
         self.check_object_permissions(self.request, obj)
         return obj
+
+
+class ContributionMatrixDetail(CourseMembershipMixin, generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, CanManageLabData]
+    serializer_class = ContributionMatrixSerializer
+
+    def get(self, request, *args, **kwargs):
+        semester = self.get_semester()
+        return Response(ContributionMatrix.for_semester(semester).to_json())
+
+    def put(self, request, *args, **kwargs):
+        semester = self.get_semester()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(course_semester=semester)
+        bump_course_version(semester.course.course_code)
+        return Response(ContributionMatrix.for_semester(semester).to_json())
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from metrics import prometheus
+from metrics.registry import LATENCY_BUCKETS, read_snapshots
+
+
+def histogram_quantile(quantile, buckets, counts):
+    """Upper bound of the bucket holding the quantile (None if past the last)."""
+    total = sum(counts)
+    if not total:
+        return None
+    cumulative = 0
+    for bound, count in zip(list(buckets) + [None], counts):
+        cumulative += count
+        if cumulative >= quantile * total:
+            return bound
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the request metrics the server processes wrote to METRICS_DIR, "
+        "as a per-endpoint summary or in the Prometheus text format."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dir", default=settings.METRICS_DIR)
+        parser.add_argument(
+            "--format", choices=["table", "prometheus"], default="table"
+        )
+
+    def handle(self, *args, **options):
+        if not options["dir"]:
+            raise CommandError("Set METRICS_DIR on the server, or pass --dir.")
+        snapshot = read_snapshots(options["dir"])
+        if options["format"] == "prometheus":
+            self.stdout.write(prometheus.render(snapshot), ending="")
+            return
+
+        self.stdout.write(
+            f"{'endpoint':<40} {'requests':>8} {'mean ms':>8} {'p95 <=':>7} "
+            f"{'p99 <=':>7} {'queries':>7} {'db %':>5} {'kB':>7}"
+        )
+        for key, endpoint in sorted(snapshot["endpoints"].items()):
+            latency = endpoint["latency"]
+            requests = sum(latency["counts"])
+            if not requests:
+                continue
+            p95, p99 = (
+                histogram_quantile(q, LATENCY_BUCKETS, latency["counts"])
+                for q in (0.95, 0.99)
+            )
+            sizes = endpoint["size"]
+            sized = sum(sizes["counts"])
+            self.stdout.write(
+                f"{key:<40} {requests:>8} "
+                f"{latency['sum'] / requests * 1000:>8.1f} "
+                f"{_seconds(p95):>7} {_seconds(p99):>7} "
+                f"{endpoint['queries']['sum'] / requests:>7.1f} "
+                f"{endpoint['db_time'] / latency['sum'] * 100 if latency['sum'] else 0:>5.0f} "
+                f"{sizes['sum'] / sized / 1024 if sized else 0:>7.1f}"
+            )
+
+
+def _seconds(bound):
+    return "inf" if bound is None else f"{bound:g}s"
@@ -0,0 +1,75 @@
+"""Rendering of metrics snapshots in the Prometheus text format."""
+
+from metrics.registry import HISTOGRAMS
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HISTOGRAM_METRICS = {
+    "latency": (
+        "lms_http_request_duration_seconds",
+        "Time spent handling requests.",
+    ),
+    "queries": (
+        "lms_db_queries_per_request",
+        "Database queries run by each request.",
+    ),
+    "size": (
+        "lms_http_response_size_bytes",
+        "Size of the response bodies (streamed responses are not counted).",
+    ),
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _format_bound(bound):
+    return repr(float(bound))
+
+
+def render(snapshot):
+    endpoints = sorted(
+        (key.rsplit(" ", 1), endpoint) for key, endpoint in snapshot["endpoints"].items()
+    )
+    lines = [
+        "# HELP lms_http_requests_total Requests handled.",
+        "# TYPE lms_http_requests_total counter",
+    ]
+    for (view, method), endpoint in endpoints:
+        for status, count in sorted(endpoint["statuses"].items()):
+            labels = _labels(view=view, method=method, status=status)
+            lines.append(f"lms_http_requests_total{{{labels}}} {count}")
+
+    lines += [
+        "# HELP lms_db_query_duration_seconds_total Time spent in database queries.",
+        "# TYPE lms_db_query_duration_seconds_total counter",
+    ]
+    for (view, method), endpoint in endpoints:
+        labels = _labels(view=view, method=method)
+        lines.append(f"lms_db_query_duration_seconds_total{{{labels}}} {endpoint['db_time']}")
+
+    for name, buckets in HISTOGRAMS.items():
+        metric, help_text = HISTOGRAM_METRICS[name]
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+        for (view, method), endpoint in endpoints:
+            histogram = endpoint[name]
+            labels = _labels(view=view, method=method)
+            cumulative = 0
+            bounds = [_format_bound(bound) for bound in buckets] + ["+Inf"]
+            for bound, count in zip(bounds, histogram["counts"]):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{metric}_sum{{{labels}}} {histogram['sum']}")
+            lines.append(f"{metric}_count{{{labels}}} {cumulative}")
+
+    for metric, values in sorted(snapshot["samples"].items()):
+        kind = "counter" if metric.endswith("_total") else "gauge"
+        lines.append(f"# TYPE {metric} {kind}")
+        for labels, value in sorted(values.items()):
+            lines.append(f"{metric}{{{labels}}} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,184 @@
+"""
+Per-process request metrics.
+
+Every thread records into its own buffer, so the request path takes no lock:
+a lock is only taken when a thread creates its buffer. Readers merge the
+buffers of all threads into a snapshot; a value being written while it is
+read is simply picked up by the next snapshot.
+
+Snapshots are plain JSON-compatible dicts so that the worker processes of a
+server can write them to ``METRICS_DIR`` and have them summed by the
+``/metrics`` endpoint or the ``metrics`` management command.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+
+from django.conf import settings
+
+from courses.cache import stats as cache_stats
+from LMSSystemBackend.db.pool import pool_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+HISTOGRAMS = {
+    "latency": LATENCY_BUCKETS,
+    "queries": QUERY_BUCKETS,
+    "size": SIZE_BUCKETS,
+}
+
+
+def _new_histogram(buckets):
+    # One count per bucket plus the +Inf bucket, and the sum of observations.
+    return {"counts": [0] * (len(buckets) + 1), "sum": 0}
+
+
+def _new_endpoint():
+    return {
+        "statuses": {},
+        "db_time": 0.0,
+        **{name: _new_histogram(buckets) for name, buckets in HISTOGRAMS.items()},
+    }
+
+
+def _observe(histogram, buckets, value):
+    histogram["counts"][bisect_left(buckets, value)] += 1
+    histogram["sum"] += value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._local = threading.local()
+        self._buffers = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _buffer(self):
+        try:
+            return self._local.buffer
+        except AttributeError:
+            buffer = self._local.buffer = {}
+            with self._lock:
+                self._buffers.append(buffer)
+            return buffer
+
+    def observe(self, view, method, status, latency, queries, db_time, size):
+        buffer = self._buffer()
+        key = f"{view} {method}"
+        endpoint = buffer.get(key)
+        if endpoint is None:
+            endpoint = buffer[key] = _new_endpoint()
+        statuses = endpoint["statuses"]
+        status = str(status)
+        statuses[status] = statuses.get(status, 0) + 1
+        endpoint["db_time"] += db_time
+        _observe(endpoint["latency"], LATENCY_BUCKETS, latency)
+        _observe(endpoint["queries"], QUERY_BUCKETS, queries)
+        if size is not None:
+            _observe(endpoint["size"], SIZE_BUCKETS, size)
+
+    def snapshot(self):
+        with self._lock:
+            buffers = list(self._buffers)
+        endpoints = merge_endpoints(
+            # Copy each thread's entries in one step so a key added meanwhile
+            # can't break the iteration.
+            dict(list(buffer.items()))
+            for buffer in buffers
+        )
+        return {"endpoints": endpoints, "samples": collect_process_samples()}
+
+    def reset(self):
+        with self._lock:
+            for buffer in self._buffers:
+                buffer.clear()
+
+    def flush_due(self):
+        """
+        Whether the flush interval has passed since the last flush; the caller
+        then flushes.
+        """
+        if not settings.METRICS_DIR:
+            return False
+        now = time.monotonic()
+        if now - self._last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return False
+        self._last_flush = now
+        return True
+
+    def maybe_flush(self):
+        """Write this process's snapshot to METRICS_DIR every flush interval."""
+        if self.flush_due():
+            self.flush(settings.METRICS_DIR)
+
+    def flush(self, directory):
+        path = Path(directory) / f"metrics-{os.getpid()}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.snapshot()))
+        os.replace(tmp_path, path)
+
+
+def merge_endpoints(endpoint_maps):
+    merged = {}
+    for endpoints in endpoint_maps:
+        for key, endpoint in endpoints.items():
+            target = merged.setdefault(key, _new_endpoint())
+            for status, count in endpoint["statuses"].items():
+                target["statuses"][status] = target["statuses"].get(status, 0) + count
+            target["db_time"] += endpoint["db_time"]
+            for name in HISTOGRAMS:
+                target[name]["sum"] += endpoint[name]["sum"]
+                target[name]["counts"] = [
+                    a + b for a, b in zip(target[name]["counts"], endpoint[name]["counts"])
+                ]
+    return merged
+
+
+def merge_snapshots(snapshots):
+    snapshots = list(snapshots)
+    samples = {}
+    for snapshot in snapshots:
+        for name, values in snapshot["samples"].items():
+            target = samples.setdefault(name, {})
+            for labels, value in values.items():
+                target[labels] = target.get(labels, 0) + value
+    return {
+        "endpoints": merge_endpoints(snapshot["endpoints"] for snapshot in snapshots),
+        "samples": samples,
+    }
+
+
+def collect_process_samples():
+    """
+    Connection pool and course cache figures of this process, as
+    ``{metric: {labels: value}}``; they are summed across processes.
+    """
+    samples = {
+        "lms_course_cache_lookups_total": {
+            'result="hit"': cache_stats.hits,
+            'result="miss"': cache_stats.misses,
+        }
+    }
+    for alias, stats in pool_stats().items():
+        for stat, value in stats.items():
+            samples.setdefault(f"lms_db_pool_{stat}", {})[f'alias="{alias}"'] = value
+    return samples
+
+
+def read_snapshots(directory):
+    """Merge the snapshots the worker processes wrote to ``directory``."""
+    snapshots = []
+    for path in Path(directory).glob("metrics-*.json"):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return merge_snapshots(snapshots)
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,73 @@
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.http import HttpRequest, HttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from metrics.middleware import RequestMetricsMiddleware
+from metrics.registry import registry
+
+
+class RequestMetricsMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        registry.reset()
+        self.addCleanup(registry.reset)
+
+    def flushed(self):
+        (path,) = Path(self.directory.name).glob("metrics-*.json")
+        return json.loads(path.read_text())["endpoints"]
+
+    def test_async_flush_runs_off_the_event_loop(self):
+        async def get_response(request):
+            return HttpResponse("ok")
+
+        flush = registry.flush
+        loops = []
+
+        def record_flush(directory):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            flush(directory)
+
+        middleware = RequestMetricsMiddleware(get_response)
+        request = HttpRequest()
+        request.method = "GET"
+        with override_settings(
+            METRICS_DIR=self.directory.name, METRICS_FLUSH_INTERVAL=0
+        ):
+            with mock.patch.object(registry, "flush", record_flush):
+                asyncio.run(middleware(request))
+        self.assertEqual(loops, [None])
+        self.assertIn("unmatched GET", self.flushed())
+
+    def test_sync_flush(self):
+        middleware = RequestMetricsMiddleware(lambda request: HttpResponse("ok"))
+        request = HttpRequest()
+        request.method = "GET"
+        with override_settings(
+            METRICS_DIR=self.directory.name, METRICS_FLUSH_INTERVAL=0
+        ):
+            middleware(request)
+        self.assertIn("unmatched GET", self.flushed())
+
+
+@override_settings(METRICS_DIR=None, METRICS_TOKEN="secret")
+class MetricsViewTests(TestCase):
+    def test_token_is_required(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong")
+        self.assertEqual(response.status_code, 403)
+
+    def test_requests_are_exported(self):
+        registry.reset()
+        self.client.get("/metrics")
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('view="metrics"', response.content.decode())
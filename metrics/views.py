@@ -0,0 +1,31 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+from metrics import prometheus
+from metrics.registry import read_snapshots, registry
+
+
+def is_authorized(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        header = request.headers.get("Authorization", "")
+        if hmac.compare_digest(header.encode(), f"Bearer {token}".encode()):
+            return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+def collect():
+    """The metrics of every worker when they share METRICS_DIR, else of this one."""
+    directory = settings.METRICS_DIR
+    if not directory:
+        return registry.snapshot()
+    registry.flush(directory)
+    return read_snapshots(directory)
+
+
+def metrics(request):
+    if not is_authorized(request):
+        return HttpResponseForbidden()
+    return HttpResponse(prometheus.render(collect()), content_type=prometheus.CONTENT_TYPE)
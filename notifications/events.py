@@ -0,0 +1,200 @@
+"""
+Live delivery of notifications as server-sent events.
+
+``publish()`` announces a new notification once its transaction commits:
+with ``NOTIFY`` on PostgreSQL, so that every worker hears it, or in process
+on other databases. Each event loop of an ASGI worker runs one ``Broker``,
+which holds a single ``LISTEN`` connection. For every announced notification
+it looks up which of its subscribed users received it, with one query, and
+wakes only their streams.
+
+A stream holds a wake-up flag, not a queue, and reads what it missed from
+the inbox in pages of ``PAGE_SIZE``. A slow client therefore never makes its
+connection buffer events, and resuming from ``Last-Event-ID`` is the same
+catch-up read. Event ids are notification ids.
+"""
+
+import asyncio
+import json
+import logging
+import time
+
+import psycopg
+from django.conf import settings
+from django.db import connections, transaction
+from rest_framework.utils.encoders import JSONEncoder
+
+from LMSSystemBackend.db.aio import afetch, connect_kwargs
+from notifications.models import NotificationRecipient
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "lms_notifications"
+PAGE_SIZE = 100
+RECONNECT_DELAY = 5
+
+# Same fields as NotificationSerializer.
+EVENT_FIELDS = {
+    "id": "notification_id",
+    "message": "notification__message",
+    "timestamp": "notification__timestamp",
+    "sender": "notification__sender__email",
+    "course": "notification__course_semester__course__course_code",
+    "semester": "notification__course_semester__semester_name",
+    "is_read": "is_read",
+}
+
+# event loop -> its broker
+_brokers = {}
+
+
+def publish(notification, using="default"):
+    """Announce ``notification`` to the streams when the transaction commits."""
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        # Delivered on commit, dropped on rollback.
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [CHANNEL, str(notification.pk)])
+    else:
+        transaction.on_commit(lambda: dispatch_local(notification.pk), using=using)
+
+
+def dispatch_local(notification_id):
+    """Hand a notification to the brokers of this process."""
+    for loop, broker in list(_brokers.items()):
+        if not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(broker.dispatch(notification_id), loop)
+
+
+def get_broker():
+    loop = asyncio.get_running_loop()
+    broker = _brokers.get(loop)
+    if broker is None:
+        broker = _brokers[loop] = Broker()
+    return broker
+
+
+class Broker:
+    def __init__(self, using="default"):
+        self.using = using
+        # user id -> wake-up events of the user's open streams
+        self.subscribers = {}
+        self.listener = None
+
+    def subscribe(self, user_id):
+        if connections[self.using].vendor == "postgresql" and (
+            self.listener is None or self.listener.done()
+        ):
+            self.listener = asyncio.create_task(self.listen())
+        event = asyncio.Event()
+        self.subscribers.setdefault(user_id, set()).add(event)
+        return event
+
+    def unsubscribe(self, user_id, event):
+        events = self.subscribers.get(user_id)
+        if events is not None:
+            events.discard(event)
+            if not events:
+                del self.subscribers[user_id]
+
+    def wake(self, user_ids):
+        for user_id in user_ids:
+            for event in self.subscribers.get(user_id, ()):
+                event.set()
+
+    async def dispatch(self, notification_id):
+        if not self.subscribers:
+            return
+        rows = await afetch(
+            NotificationRecipient.objects.using(self.using)
+            .filter(notification_id=notification_id, user_id__in=list(self.subscribers))
+            .values_list("user_id")
+        )
+        self.wake(user_id for user_id, in rows)
+
+    async def listen(self):
+        while True:
+            try:
+                connection = await psycopg.AsyncConnection.connect(
+                    **connect_kwargs(self.using)
+                )
+                async with connection:
+                    await connection.execute(f"LISTEN {CHANNEL}")
+                    # Streams catch up on whatever was sent while not listening.
+                    self.wake(list(self.subscribers))
+                    async for notify in connection.notifies():
+                        await self.dispatch(int(notify.payload))
+            except (psycopg.Error, OSError):
+                logger.exception("Notification listener lost its connection.")
+                await asyncio.sleep(RECONNECT_DELAY)
+
+
+def format_event(event_id=None, data=None, comment=None, retry=None):
+    lines = []
+    if comment is not None:
+        lines.append(f": {comment}")
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if data is not None:
+        lines.append(f"data: {json.dumps(data, cls=JSONEncoder)}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+async def latest_notification_id(user, using="default"):
+    rows = await afetch(
+        NotificationRecipient.objects.using(using)
+        .filter(user=user)
+        .order_by("-notification_id")
+        .values_list("notification_id")[:1]
+    )
+    return rows[0][0] if rows else 0
+
+
+async def unseen_notifications(user, after, using="default"):
+    """The notifications of ``user`` newer than ``after``, oldest first."""
+    rows = await afetch(
+        NotificationRecipient.objects.using(using)
+        .filter(user=user, notification_id__gt=after)
+        .order_by("notification_id")
+        .values_list(*EVENT_FIELDS.values())[:PAGE_SIZE]
+    )
+    return [dict(zip(EVENT_FIELDS, row)) for row in rows]
+
+
+async def notification_events(user, last_event_id=None):
+    """
+    Server-sent events of the notifications ``user`` receives, starting
+    after ``last_event_id`` (or from now), until
+    ``NOTIFICATION_STREAM_MAX_AGE`` seconds have passed; clients reconnect
+    with the id of the last event they got.
+    """
+    broker = get_broker()
+    wake = broker.subscribe(user.pk)
+    try:
+        if last_event_id is None:
+            last_event_id = await latest_notification_id(user)
+        else:
+            wake.set()
+        yield format_event(retry=settings.NOTIFICATION_STREAM_RETRY * 1000)
+
+        deadline = time.monotonic() + settings.NOTIFICATION_STREAM_MAX_AGE
+        while (remaining := deadline - time.monotonic()) > 0:
+            try:
+                await asyncio.wait_for(
+                    wake.wait(),
+                    min(settings.NOTIFICATION_STREAM_HEARTBEAT, remaining),
+                )
+            except asyncio.TimeoutError:
+                yield format_event(comment="heartbeat")
+                continue
+            wake.clear()
+            while events := await unseen_notifications(user, last_event_id):
+                for data in events:
+                    last_event_id = data["id"]
+                    yield format_event(event_id=last_event_id, data=data)
+                if len(events) < PAGE_SIZE:
+                    break
+    finally:
+        broker.unsubscribe(user.pk, wake)
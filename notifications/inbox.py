@@ -0,0 +1,135 @@
+"""
+Sending notifications and tracking what their recipients have read.
+
+A notification is stored once and fanned out to one ``NotificationRecipient``
+row per recipient, inserted ``BATCH_SIZE`` at a time. Each batch also adds
+one to its recipients' ``UnreadCounter`` with a single UPDATE, so the unread
+badge is a primary key lookup. Marking read decrements a counter by the
+number of rows the UPDATE actually flipped, which keeps it exact when the
+same notification is marked read by concurrent requests.
+
+New notifications are also pushed to the open event streams, see events.py.
+"""
+
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+from courses.models import CourseTeacher
+from notifications.events import publish
+from notifications.models import Notification, NotificationRecipient, UnreadCounter
+from students.models import LabScore
+
+BATCH_SIZE = 1000
+
+
+def semester_recipient_ids(semester):
+    """
+    Ids of the teachers of ``semester`` and of its students (those with a
+    lab score in it), without duplicates.
+    """
+    teachers = CourseTeacher.objects.filter(course_semester=semester).values_list(
+        "teacher_id", flat=True
+    )
+    students = LabScore.objects.filter(lab__course_semester=semester).values_list(
+        "student_id", flat=True
+    )
+    return teachers.union(students)
+
+
+def increment_unread(user_ids):
+    UnreadCounter.objects.bulk_create(
+        [UnreadCounter(user_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+    UnreadCounter.objects.filter(user_id__in=user_ids).update(count=F("count") + 1)
+
+
+def decrement_unread(user, count):
+    if count:
+        # A counter left behind by deleted notifications must not go negative.
+        UnreadCounter.objects.filter(user=user).update(
+            count=Greatest(F("count") - count, 0)
+        )
+
+
+@transaction.atomic
+def send_notification(
+    message, user_ids, sender=None, course_semester=None, batch_size=BATCH_SIZE
+):
+    """
+    Create a notification for the distinct ``user_ids`` (any iterable,
+    consumed in batches) and return it with its number of recipients.
+    """
+    notification = Notification.objects.create(
+        message=message, sender=sender, course_semester=course_semester
+    )
+    user_ids = iter(user_ids)
+    sent = 0
+    while batch := sorted(islice(user_ids, batch_size)):
+        NotificationRecipient.objects.bulk_create(
+            [
+                NotificationRecipient(notification=notification, user_id=user_id)
+                for user_id in batch
+            ]
+        )
+        increment_unread(batch)
+        sent += len(batch)
+    publish(notification)
+    return notification, sent
+
+
+def notify_semester(semester, message, sender=None, batch_size=BATCH_SIZE):
+    recipients = semester_recipient_ids(semester).iterator(chunk_size=batch_size)
+    return send_notification(
+        message,
+        recipients,
+        sender=sender,
+        course_semester=semester,
+        batch_size=batch_size,
+    )
+
+
+@transaction.atomic
+def mark_read(user, notification_ids=None):
+    """
+    Mark the given notifications of ``user`` (all of them by default) read
+    and return how many were unread.
+    """
+    recipients = NotificationRecipient.objects.filter(user=user, is_read=False)
+    if notification_ids is not None:
+        recipients = recipients.filter(notification_id__in=notification_ids)
+    marked = recipients.update(is_read=True)
+    decrement_unread(user, marked)
+    return marked
+
+
+def unread_count(user):
+    counts = UnreadCounter.objects.filter(user=user).values_list("count", flat=True)
+    return next(iter(counts), 0)
+
+
+@transaction.atomic
+def recount_unread():
+    """
+    Rebuild every counter from the recipient rows, e.g. after notifications
+    were deleted. Returns the number of users with unread notifications.
+    """
+    counts = (
+        NotificationRecipient.objects.values("user")
+        .annotate(unread=Count("pk", filter=Q(is_read=False)))
+        .filter(unread__gt=0)
+        .values_list("user", "unread")
+    )
+    counters = [UnreadCounter(user_id=user_id, count=count) for user_id, count in counts]
+    UnreadCounter.objects.update(count=0)
+    UnreadCounter.objects.bulk_create(
+        counters,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["count"],
+    )
+    return len(counters)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from notifications.inbox import recount_unread
+
+
+class Command(BaseCommand):
+    help = "Rebuild the unread notification counters from the inbox rows."
+
+    def handle(self, *args, **options):
+        users = recount_unread()
+        self.stdout.write(
+            self.style.SUCCESS(f"Recounted unread notifications of {users} users.")
+        )
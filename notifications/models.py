@@ -1,10 +1,79 @@
 from django.db import models
 
+from courses.models import CourseSemester
+from user_profiles.models import UserProfile
+
 
-# Create your models here.
 class Notification(models.Model):
     message = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
+    sender = models.ForeignKey(
+        UserProfile,
+        related_name="sent_notifications",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
+    # The semester it was sent to, if any.
+    course_semester = models.ForeignKey(
+        CourseSemester,
+        related_name="notifications",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+    )
 
     def __str__(self):
         return self.message
+
+
+class NotificationRecipient(models.Model):
+    """One row per recipient of a notification, holding its read state."""
+
+    notification = models.ForeignKey(
+        Notification, related_name="recipients", on_delete=models.CASCADE
+    )
+    # Indexed by the (user, notification) unique constraint.
+    user = models.ForeignKey(
+        UserProfile,
+        related_name="notifications",
+        on_delete=models.CASCADE,
+        db_index=False,
+    )
+    is_read = models.BooleanField(default=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "notification"], name="unique_notification_per_user"
+            ),
+        ]
+        indexes = [
+            # The unread part of an inbox, newest first.
+            models.Index(
+                fields=["user", "-notification"],
+                condition=models.Q(is_read=False),
+                name="notification_unread_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.notification_id} for {self.user_id}"
+
+
+class UnreadCounter(models.Model):
+    """
+    Number of unread notifications of a user, kept up to date with
+    ``F()`` updates whenever recipients are added or marked read.
+    """
+
+    user = models.OneToOneField(
+        UserProfile,
+        related_name="unread_counter",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.count} unread for {self.user_id}"
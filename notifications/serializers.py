@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+from notifications.models import NotificationRecipient
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    id = serializers.ReadOnlyField(source="notification_id")
+    message = serializers.ReadOnlyField(source="notification.message")
+    timestamp = serializers.ReadOnlyField(source="notification.timestamp")
+    sender = serializers.ReadOnlyField(source="notification.sender.email", default=None)
+    course = serializers.ReadOnlyField(
+        source="notification.course_semester.course.course_code", default=None
+    )
+    semester = serializers.ReadOnlyField(
+        source="notification.course_semester.semester_name", default=None
+    )
+
+    class Meta:
+        model = NotificationRecipient
+        fields = ("id", "message", "timestamp", "sender", "course", "semester", "is_read")
+
+
+class NotificationSendSerializer(serializers.Serializer):
+    message = serializers.CharField()
@@ -1,3 +1,184 @@
-from django.test import TestCase
+from asgiref.sync import async_to_sync, sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from courses.models import Course, CourseSemester, CourseTeacher, Lab
+from notifications.events import format_event, get_broker, notification_events
+from notifications.inbox import (
+    mark_read,
+    notify_semester,
+    recount_unread,
+    unread_count,
+)
+from notifications.models import Notification, NotificationRecipient, UnreadCounter
+from notifications.views import notification_stream
+from students.models import LabScore
+from user_profiles.models import UserProfile
+
+
+class NotificationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(
+            course_code="CS101",
+            course_name="Programming",
+            department="CS",
+            creater="a@example.com",
+        )
+        cls.semester = CourseSemester.objects.create(
+            semester_name="Fall", course=course, num_of_lab=2
+        )
+        cls.teacher = UserProfile.objects.create(
+            username="teacher", email="teacher@example.com", is_teacher=True
+        )
+        course_teacher = CourseTeacher.objects.create(
+            course=course, teacher=cls.teacher, role="Lecturer"
+        )
+        course_teacher.course_semester.add(cls.semester)
+        cls.students = [
+            UserProfile.objects.create(username=name, email=f"{name}@example.com")
+            for name in ("alice", "bob", "carol")
+        ]
+        for number in (1, 2):
+            lab = Lab.objects.create(
+                course_semester=cls.semester,
+                lab_number=number,
+                lab_name=f"Lab{number}",
+                lab_type="InLab",
+                weight=0.5,
+            )
+            for student in cls.students:
+                LabScore.objects.create(lab=lab, student=student, score=5)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+
+class NotificationInboxTests(NotificationTestCase):
+    def test_semester_fan_out(self):
+        notification, sent = notify_semester(self.semester, "Hello", batch_size=2)
+        self.assertEqual(sent, 4)
+        self.assertEqual(
+            set(notification.recipients.values_list("user", flat=True)),
+            {self.teacher.pk, *(student.pk for student in self.students)},
+        )
+        for user in [self.teacher, *self.students]:
+            self.assertEqual(unread_count(user), 1)
+
+    def test_send_and_read(self):
+        response = self.client_for(self.teacher).post(
+            "/api/notifications/courses/CS101/semesters/Fall", {"message": "Hello"}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["recipients"], 4)
+
+        client = self.client_for(self.students[0])
+        inbox = client.get("/api/notifications/").json()["results"]
+        self.assertEqual(
+            [(item["message"], item["course"], item["is_read"]) for item in inbox],
+            [("Hello", "CS101", False)],
+        )
+        response = client.post(f"/api/notifications/{inbox[0]['id']}/read")
+        self.assertEqual(response.json(), {"marked": 1, "unread": 0})
+        response = client.post(f"/api/notifications/{inbox[0]['id']}/read")
+        self.assertEqual(response.json(), {"marked": 0, "unread": 0})
+
+    def test_outsider_cannot_notify(self):
+        response = self.client_for(self.students[0]).post(
+            "/api/notifications/courses/CS101/semesters/Fall", {"message": "Hello"}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_stale_counter_does_not_go_negative(self):
+        notification, _ = notify_semester(self.semester, "Hello")
+        UnreadCounter.objects.filter(user=self.students[0]).update(count=0)
+        self.assertEqual(mark_read(self.students[0], [notification.pk]), 1)
+        self.assertEqual(unread_count(self.students[0]), 0)
+
+    def test_recount(self):
+        notify_semester(self.semester, "Hello")
+        NotificationRecipient.objects.filter(user=self.students[0]).delete()
+        UnreadCounter.objects.filter(user=self.students[1]).update(count=7)
+        self.assertEqual(recount_unread(), 3)
+        self.assertEqual(unread_count(self.students[0]), 0)
+        self.assertEqual(unread_count(self.students[1]), 1)
+
+
+class FormatEventTests(SimpleTestCase):
+    def test_format(self):
+        self.assertEqual(format_event(retry=3000), b"retry: 3000\n\n")
+        self.assertEqual(format_event(comment="heartbeat"), b": heartbeat\n\n")
+        self.assertEqual(
+            format_event(event_id=4, data={"id": 4, "message": "Hi"}),
+            b'id: 4\ndata: {"id": 4, "message": "Hi"}\n\n',
+        )
+
+
+@override_settings(
+    ASYNC_DB_POOL=None,
+    NOTIFICATION_STREAM_HEARTBEAT=0.05,
+    NOTIFICATION_STREAM_MAX_AGE=0.2,
+    NOTIFICATION_STREAM_RETRY=3,
+)
+class NotificationStreamTests(NotificationTestCase):
+    def test_unauthenticated(self):
+        request = RequestFactory().get("/api/notifications/stream")
+        request.user = AnonymousUser()
+        response = async_to_sync(notification_stream)(request)
+        self.assertEqual(response.status_code, 403)
+
+    def test_bad_last_event_id(self):
+        request = RequestFactory().get(
+            "/api/notifications/stream", HTTP_LAST_EVENT_ID="x"
+        )
+        request.user = self.students[0]
+        response = async_to_sync(notification_stream)(request)
+        self.assertEqual(response.status_code, 400)
+
+    def read_stream(self, user, last_event_id=None, send=None):
+        """
+        Every event of one stream of ``user``; ``send`` is called once the
+        stream has subscribed, and its notification's recipients are woken
+        as the broker would on its announcement.
+        """
+
+        async def read():
+            broker = get_broker()
+            stream = notification_events(user, last_event_id)
+            events = [await stream.__anext__()]
+            if send is not None:
+                notification, _ = await sync_to_async(send)()
+                await broker.dispatch(notification.pk)
+            events += [event async for event in stream]
+            if broker.listener is not None:
+                broker.listener.cancel()
+            return events, broker.subscribers
+
+        events, subscribers = async_to_sync(read)()
+        self.assertEqual(subscribers, {})
+        return events
+
+    def data_events(self, events):
+        return [event for event in events if event.startswith(b"id: ")]
+
+    def test_resumes_after_last_event_id(self):
+        first, _ = notify_semester(self.semester, "First")
+        second, _ = notify_semester(self.semester, "Second")
+        events = self.read_stream(self.students[0], last_event_id=first.pk)
+        self.assertEqual(events[0], b"retry: 3000\n\n")
+        self.assertIn(b": heartbeat\n\n", events)
+        [data] = self.data_events(events)
+        self.assertTrue(data.startswith(f"id: {second.pk}\n".encode()))
+        self.assertIn(b'"message": "Second"', data)
+
+    def test_wakes_on_new_notification(self):
+        notify_semester(self.semester, "Old")
+        events = self.read_stream(
+            self.students[0], send=lambda: notify_semester(self.semester, "Live")
+        )
+        [data] = self.data_events(events)
+        live = Notification.objects.get(message="Live")
+        self.assertTrue(data.startswith(f"id: {live.pk}\n".encode()))
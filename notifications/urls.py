@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.urls import path
+from notifications import views
+
+urlpatterns = [
+    path("", views.NotificationList.as_view(), name="notification-list"),
+    path("unread", views.UnreadCount.as_view(), name="notification-unread"),
+    path("read", views.MarkAllRead.as_view(), name="notification-read-all"),
+    path("<int:pk>/read", views.MarkRead.as_view(), name="notification-read"),
+    path(
+        "courses/<str:course_code>/semesters/<str:semester_name>",
+        views.SemesterNotificationSend.as_view(),
+        name="semester-notify",
+    ),
+]
+
+# The event stream holds its connection open, which only ASGI workers can
+# afford.
+if settings.ASYNC_VIEWS:
+    urlpatterns.append(
+        path("stream", views.notification_stream, name="notification-stream")
+    )
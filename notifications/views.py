@@ -1,3 +1,101 @@
-from django.shortcuts import render
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import generics, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from courses.membership import CourseMembershipMixin
+from courses.permissions import CanManageLabData
+from notifications.events import notification_events
+from notifications.inbox import mark_read, notify_semester, unread_count
+from notifications.models import NotificationRecipient
+from notifications.serializers import NotificationSendSerializer, NotificationSerializer
+
+
+class NotificationList(generics.ListAPIView):
+    """The user's inbox, newest first; ``?unread=1`` lists unread ones only."""
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = NotificationSerializer
+    pagination_ordering = "-notification_id"
+
+    def get_queryset(self):
+        queryset = NotificationRecipient.objects.filter(
+            user=self.request.user
+        ).select_related(
+            "notification__sender", "notification__course_semester__course"
+        )
+        if self.request.query_params.get("unread") in ("1", "true"):
+            queryset = queryset.filter(is_read=False)
+        return queryset
+
+
+class UnreadCount(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        return Response({"unread": unread_count(request.user)})
+
+
+class MarkRead(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        marked = mark_read(request.user, [self.kwargs["pk"]])
+        return Response({"marked": marked, "unread": unread_count(request.user)})
+
+
+class MarkAllRead(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        marked = mark_read(request.user)
+        return Response({"marked": marked, "unread": unread_count(request.user)})
+
+
+class SemesterNotificationSend(CourseMembershipMixin, generics.GenericAPIView):
+    """Send a notification to the teachers and students of a semester."""
+
+    permission_classes = [IsAuthenticated, CanManageLabData]
+    serializer_class = NotificationSendSerializer
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        notification, sent = notify_semester(
+            self.get_semester(),
+            serializer.validated_data["message"],
+            sender=request.user,
+        )
+        return Response(
+            {"id": notification.pk, "recipients": sent}, status=status.HTTP_201_CREATED
+        )
+
+
+async def notification_stream(request):
+    """
+    Server-sent events of the user's new notifications (ASGI only). Resumes
+    after the ``Last-Event-ID`` header, or the ``last_event_id`` parameter.
+    """
+    user = request.user
+    if not await sync_to_async(lambda: user.is_authenticated)():
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=403
+        )
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+    try:
+        last_event_id = None if last_event_id is None else int(last_event_id)
+    except ValueError:
+        return JsonResponse(
+            {"last_event_id": ["A valid integer is required."]}, status=400
+        )
+
+    response = StreamingHttpResponse(
+        notification_events(user, last_event_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Keeps proxies such as nginx from buffering the events.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,154 @@
+"""
+Learning outcome (LO) attainment computed with NumPy matrix products.
+
+For a semester with S students, L labs and O outcomes:
+
+* ``scores`` (S x L) are lab scores, NaN where a student has no score;
+* ``weights`` (L) are the ``Lab.weight`` values;
+* ``contributions`` (L x O) are ``LabLOContribution`` percentages.
+
+A lab's share of an outcome is ``weights[l] * contributions[l, o]``, and a
+student's attainment of an outcome is their normalized lab scores averaged
+with those shares. Outcomes no lab contributes to have no attainment (NaN).
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from django.db.models import CharField
+from django.db.models.functions import Coalesce
+
+from courses.models import Lab, LabLOContribution
+from courses.matrix import natural_sort_key
+from students.models import MAX_LAB_SCORE, LabScore
+from user_profiles.models import UserProfile
+# An outcome is attained by a student reaching half of it.
+PASS_THRESHOLD = 0.5
+
+
+@dataclass
+class SemesterStructure:
+    lab_ids: list
+    lab_names: list
+    outcome_codes: list
+    weights: np.ndarray
+    contributions: np.ndarray
+
+
+@dataclass
+class Attainment:
+    outcome_codes: list
+    students: list
+    # S x O, in [0, 1]
+    student_attainment: np.ndarray
+    # O, mean over students
+    class_attainment: np.ndarray
+    # O, share of students reaching PASS_THRESHOLD
+    pass_rate: np.ndarray
+
+
+def load_semester_structure(semester):
+    """Load lab weights and the lab x outcome contribution matrix (2 queries)."""
+    labs = sorted(
+        Lab.objects.filter(course_semester=semester).values_list(
+            "id", "lab_name", "weight"
+        ),
+        key=lambda lab: natural_sort_key(lab[1]),
+    )
+    lab_ids = [lab_id for lab_id, _, _ in labs]
+    rows = {lab_id: row for row, lab_id in enumerate(lab_ids)}
+
+    contributions = list(
+        LabLOContribution.objects.filter(
+            course_semester=semester, outcome__isnull=False
+        ).values_list("lab_id", "outcome__outcome_code", "contribution_percentage")
+    )
+    outcome_codes = sorted({code for _, code, _ in contributions}, key=natural_sort_key)
+    columns = {code: column for column, code in enumerate(outcome_codes)}
+
+    matrix = np.zeros((len(lab_ids), len(outcome_codes)))
+    for lab_id, code, percentage in contributions:
+        matrix[rows[lab_id], columns[code]] = float(percentage)
+
+    return SemesterStructure(
+        lab_ids=lab_ids,
+        lab_names=[name for _, name, _ in labs],
+        outcome_codes=outcome_codes,
+        weights=np.array([weight for _, _, weight in labs], dtype=float),
+        contributions=matrix / 100.0,
+    )
+
+
+def load_score_matrix(structure):
+    """
+    Load the semester's ``LabScore`` rows as a student x lab array aligned
+    with ``structure.lab_ids`` (one query). Students are identified by their
+    ``student_id``, falling back to their email.
+    """
+    rows = list(
+        LabScore.objects.filter(lab_id__in=structure.lab_ids).values_list(
+            "student_id", "lab_id", "score"
+        )
+    )
+    if not rows:
+        return [], np.empty((0, len(structure.lab_ids)))
+    student_pks, lab_ids, scores = (np.array(column) for column in zip(*rows))
+
+    students, student_rows = np.unique(student_pks, return_inverse=True)
+    lab_order = np.argsort(structure.lab_ids)
+    lab_columns = lab_order[
+        np.searchsorted(np.asarray(structure.lab_ids)[lab_order], lab_ids)
+    ]
+    matrix = np.full((len(students), len(structure.lab_ids)), np.nan)
+    matrix[student_rows, lab_columns] = scores
+
+    names = dict(
+        UserProfile.objects.filter(pk__in=students.tolist()).values_list(
+            "pk", Coalesce("student_id", "email", output_field=CharField())
+        )
+    )
+    return [names[pk] for pk in students.tolist()], matrix
+
+
+def compute_attainment(structure, students, scores, max_score=MAX_LAB_SCORE):
+    """
+    ``scores`` is an S x L array aligned with ``students`` and
+    ``structure.lab_ids``; missing scores (NaN) count as zero.
+    """
+    normalized = np.nan_to_num(np.asarray(scores, dtype=float) / max_score)
+    np.clip(normalized, 0.0, 1.0, out=normalized)
+
+    shares = structure.weights[:, np.newaxis] * structure.contributions
+    totals = shares.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        student_attainment = (normalized @ shares) / totals
+    if len(students):
+        class_attainment = student_attainment.mean(axis=0)
+        pass_rate = (student_attainment >= PASS_THRESHOLD).mean(axis=0)
+        pass_rate[np.isnan(class_attainment)] = np.nan
+    else:
+        class_attainment = np.full(len(totals), np.nan)
+        pass_rate = np.full(len(totals), np.nan)
+
+    return Attainment(
+        outcome_codes=structure.outcome_codes,
+        students=list(students),
+        student_attainment=student_attainment,
+        class_attainment=class_attainment,
+        pass_rate=pass_rate,
+    )
+
+
+def _to_json_array(values):
+    rounded = np.round(values, 4)
+    return np.where(np.isnan(rounded), None, rounded).tolist()
+
+
+def attainment_to_json(attainment):
+    return {
+        "outcomes": attainment.outcome_codes,
+        "students": attainment.students,
+        "student_attainment": _to_json_array(attainment.student_attainment),
+        "class_attainment": _to_json_array(attainment.class_attainment),
+        "pass_rate": _to_json_array(attainment.pass_rate),
+    }
@@ -0,0 +1,27 @@
+from rest_framework import serializers
+
+
+class ScoreMatrixSerializer(serializers.Serializer):
+    """
+    A student x lab score matrix: ``scores[i][j]`` is the score of
+    ``students[i]`` in ``labs[j]``, null when missing.
+    """
+
+    students = serializers.ListField(child=serializers.CharField())
+    labs = serializers.ListField(child=serializers.CharField(), allow_empty=False)
+    scores = serializers.ListField(
+        child=serializers.ListField(
+            child=serializers.FloatField(min_value=0, allow_null=True)
+        )
+    )
+
+    def validate(self, attrs):
+        if len(set(attrs["labs"])) != len(attrs["labs"]):
+            raise serializers.ValidationError({"labs": ["Labs must be unique."]})
+        if len(attrs["scores"]) != len(attrs["students"]) or any(
+            len(row) != len(attrs["labs"]) for row in attrs["scores"]
+        ):
+            raise serializers.ValidationError(
+                {"scores": ["Expected one row per student and one score per lab."]}
+            )
+        return attrs
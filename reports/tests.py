@@ -1,3 +1,102 @@
-from django.test import TestCase
+import io
+import zipfile
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, SimpleTestCase, TestCase
+
+from courses.models import Course, CourseSemester, CourseTeacher, Lab
+from reports.attainment import SemesterStructure, attainment_to_json, compute_attainment
+from students.models import LabScore
+from user_profiles.models import UserProfile
+
+
+class ComputeAttainmentTests(SimpleTestCase):
+    structure = SemesterStructure(
+        lab_ids=[1, 2],
+        lab_names=["Lab1", "Lab2"],
+        outcome_codes=["LO1", "LO2", "LO3"],
+        weights=np.array([0.5, 0.5]),
+        contributions=np.array([[1.0, 0.0, 0.0], [0.5, 0.5, 0.0]]),
+    )
+
+    def test_attainment(self):
+        scores = np.array([[10.0, 5.0], [np.nan, 10.0]])
+        attainment = compute_attainment(self.structure, ["A", "B"], scores)
+        self.assertEqual(
+            attainment_to_json(attainment),
+            {
+                "outcomes": ["LO1", "LO2", "LO3"],
+                "students": ["A", "B"],
+                "student_attainment": [[0.8333, 0.5, None], [0.3333, 1.0, None]],
+                "class_attainment": [0.5833, 0.75, None],
+                "pass_rate": [0.5, 1.0, None],
+            },
+        )
+
+    def test_no_students(self):
+        attainment = compute_attainment(self.structure, [], np.empty((0, 2)))
+        self.assertEqual(attainment_to_json(attainment)["class_attainment"], [None] * 3)
+
+
+class GradebookExportTests(TestCase):
+    url = "/api/reports/courses/CS101/semesters/Fall/gradebook.csv"
+
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(
+            course_code="CS101",
+            course_name="Programming",
+            department="CS",
+            creater="a@example.com",
+        )
+        semester = CourseSemester.objects.create(
+            semester_name="Fall", course=course, num_of_lab=1
+        )
+        lab = Lab.objects.create(
+            course_semester=semester,
+            lab_number=1,
+            lab_name="Lab1",
+            lab_type="InLab",
+            weight=1,
+        )
+        cls.teacher = UserProfile.objects.create(
+            username="teacher", email="teacher@example.com", is_teacher=True
+        )
+        course_teacher = CourseTeacher.objects.create(
+            course=course, teacher=cls.teacher, role="Lecturer"
+        )
+        course_teacher.course_semester.add(semester)
+        student = UserProfile.objects.create(
+            username="alice", email="alice@example.com", student_id="S1"
+        )
+        LabScore.objects.create(lab=lab, student=student, score=7)
+
+    expected = (
+        "student_id,email,first_name,last_name,Lab1,weighted_total\r\n"
+        "S1,alice@example.com,,,7.0,7.0\r\n"
+    )
+
+    def test_export(self):
+        self.client.force_login(self.teacher)
+        response = self.client.get(self.url)
+        self.assertFalse(response.is_async)
+        self.assertEqual(b"".join(response.streaming_content).decode(), self.expected)
+
+    def test_xlsx_export(self):
+        self.client.force_login(self.teacher)
+        response = self.client.get(self.url.replace(".csv", ".xlsx"))
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as workbook:
+            sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+        self.assertIn("alice@example.com", sheet)
+        self.assertIn("weighted_total", sheet)
+
+    async def test_export_is_streamed_asynchronously_under_asgi(self):
+        client = AsyncClient()
+        await sync_to_async(client.force_login)(self.teacher)
+        response = await client.get(self.url)
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(content.decode(), self.expected)
@@ -0,0 +1,22 @@
+from django.urls import path
+from reports import views
+
+urlpatterns = [
+    path(
+        "courses/<str:course_code>/semesters/<str:semester_name>/attainment",
+        views.SemesterAttainment.as_view(),
+        name="semester-attainment",
+    ),
+    path(
+        "courses/<str:course_code>/semesters/<str:semester_name>/gradebook.csv",
+        views.GradebookExport.as_view(),
+        {"export_format": "csv"},
+        name="gradebook-csv",
+    ),
+    path(
+        "courses/<str:course_code>/semesters/<str:semester_name>/gradebook.xlsx",
+        views.GradebookExport.as_view(),
+        {"export_format": "xlsx"},
+        name="gradebook-xlsx",
+    ),
+]
@@ -1,3 +1,98 @@
-from django.shortcuts import render
+from itertools import islice
 
-# Create your views here.
+import numpy as np
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework import generics, serializers
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from courses.membership import CourseMembershipMixin
+from courses.permissions import CanManageLabData
+from reports import xlsx
+from reports.attainment import (
+    attainment_to_json,
+    compute_attainment,
+    load_score_matrix,
+    load_semester_structure,
+)
+from reports.gradebook import gradebook_rows, stream_csv
+from reports.serializers import ScoreMatrixSerializer
+
+# Chunks of a streamed export read per thread switch under ASGI.
+STREAM_BATCH_SIZE = 200
+
+
+async def aiter_blocking(iterator, batch_size=STREAM_BATCH_SIZE):
+    """
+    Iterate over a blocking iterator from the event loop. Under ASGI Django
+    would otherwise read a synchronous streaming body into memory at once.
+    """
+    next_batch = sync_to_async(lambda: list(islice(iterator, batch_size)))
+    try:
+        while batch := await next_batch():
+            for chunk in batch:
+                yield chunk
+    finally:
+        # Closes the server-side cursor when the client goes away early.
+        await sync_to_async(iterator.close)()
+
+
+class SemesterAttainment(CourseMembershipMixin, generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, CanManageLabData]
+    serializer_class = ScoreMatrixSerializer
+
+    def get(self, request, *args, **kwargs):
+        structure = load_semester_structure(self.get_semester())
+        students, scores = load_score_matrix(structure)
+        attainment = compute_attainment(structure, students, scores)
+        return Response(attainment_to_json(attainment))
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        structure = load_semester_structure(self.get_semester())
+        columns = {name: column for column, name in enumerate(data["labs"])}
+        unknown_labs = set(columns) - set(structure.lab_names)
+        if unknown_labs:
+            raise serializers.ValidationError(
+                {"labs": [f"Unknown labs in this semester: {', '.join(sorted(unknown_labs))}."]}
+            )
+
+        given = np.array(data["scores"], dtype=float).reshape(
+            len(data["students"]), len(data["labs"])
+        )
+        # Align the score columns with the semester's labs, NaN where missing.
+        scores = np.full((len(data["students"]), len(structure.lab_names)), np.nan)
+        for lab_index, name in enumerate(structure.lab_names):
+            if name in columns:
+                scores[:, lab_index] = given[:, columns[name]]
+
+        attainment = compute_attainment(structure, data["students"], scores)
+        return Response(attainment_to_json(attainment))
+
+
+class GradebookExport(CourseMembershipMixin, generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, CanManageLabData]
+
+    def get(self, request, *args, **kwargs):
+        semester = self.get_semester()
+        export_format = kwargs["export_format"]
+        rows = gradebook_rows(semester)
+        if export_format == "xlsx":
+            content = xlsx.stream_xlsx(rows, sheet_name="Gradebook")
+            content_type = xlsx.CONTENT_TYPE
+        else:
+            content = stream_csv(rows)
+            content_type = "text/csv"
+        if isinstance(request._request, ASGIRequest):
+            content = aiter_blocking(content)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        filename = f"{semester.course.course_code}-{semester.semester_name}-gradebook"
+        response["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{export_format}"'
+        )
+        return response
@@ -0,0 +1,126 @@
+"""
+Streaming import of lab scores from CSV.
+
+The file is read row by row and handled in chunks: each chunk resolves its
+students with one query, is validated against the semester's labs (loaded
+once), and is upserted with one ``bulk_create``. Memory therefore depends on
+the chunk size, not on the size of the file. The whole import runs in one
+transaction, so a file that fails part way (e.g. it can't be decoded)
+imports nothing.
+
+Expected columns: ``lab_name``, ``score`` and either ``student_id`` or
+``email`` to identify the student. Student ids are not unique: rows naming
+one that several users share are rejected.
+"""
+
+import csv
+import io
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.db import transaction
+
+from courses.models import Lab
+from students.models import MAX_LAB_SCORE, LabScore
+from user_profiles.models import UserProfile
+
+CHUNK_SIZE = 2000
+# Only the first errors are reported, so a broken file can't exhaust memory.
+MAX_REPORTED_ERRORS = 100
+STUDENT_KEYS = ("student_id", "email")
+
+
+class ScoreImportError(Exception):
+    pass
+
+
+@dataclass
+class ScoreImportResult:
+    imported: int = 0
+    skipped: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, line, message):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def to_json(self):
+        return {"imported": self.imported, "skipped": self.skipped, "errors": self.errors}
+
+
+def open_csv(file, encoding="utf-8-sig"):
+    """Wrap a binary file (e.g. an upload) so it is decoded while streaming."""
+    return io.TextIOWrapper(file, encoding=encoding, newline="")
+
+
+def import_lab_scores(semester, text_file, chunk_size=CHUNK_SIZE):
+    reader = csv.DictReader(text_file)
+    columns = set(reader.fieldnames or ())
+    student_key = next((key for key in STUDENT_KEYS if key in columns), None)
+    missing = {"lab_name", "score"} - columns
+    if student_key is None or missing:
+        raise ScoreImportError(
+            "The CSV header must contain lab_name, score and one of "
+            f"{', '.join(STUDENT_KEYS)}."
+        )
+
+    lab_ids = dict(
+        Lab.objects.filter(course_semester=semester).values_list("lab_name", "id")
+    )
+    result = ScoreImportResult()
+    # Line 1 is the header.
+    rows = enumerate(reader, start=2)
+    with transaction.atomic():
+        while chunk := list(islice(rows, chunk_size)):
+            _import_chunk(chunk, student_key, lab_ids, result)
+    return result
+
+
+def _import_chunk(chunk, student_key, lab_ids, result):
+    keys = {row[student_key].strip() for _, row in chunk if row[student_key]}
+    student_ids = {}
+    shared = set()
+    students = UserProfile.objects.filter(**{f"{student_key}__in": keys}).values_list(
+        student_key, "id"
+    )
+    for key, student in students:
+        if key in student_ids:
+            shared.add(key)
+        student_ids[key] = student
+
+    scores = {}
+    for line, row in chunk:
+        key = (row[student_key] or "").strip()
+        student = student_ids.get(key)
+        lab = lab_ids.get((row["lab_name"] or "").strip())
+        if student is None:
+            result.add_error(line, f"Unknown student {row[student_key]!r}.")
+            continue
+        if key in shared:
+            result.add_error(line, f"Several users have the {student_key} {key!r}.")
+            continue
+        if lab is None:
+            result.add_error(line, f"Unknown lab {row['lab_name']!r} in this semester.")
+            continue
+        try:
+            score = float(row["score"])
+        except (TypeError, ValueError):
+            result.add_error(line, f"Invalid score {row['score']!r}.")
+            continue
+        if not 0 <= score <= MAX_LAB_SCORE:
+            result.add_error(line, f"Score must be between 0 and {MAX_LAB_SCORE:g}.")
+            continue
+        # A later row for the same student and lab wins.
+        scores[(lab, student)] = score
+
+    LabScore.objects.bulk_create(
+        [
+            LabScore(lab_id=lab, student_id=student, score=score)
+            for (lab, student), score in scores.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["lab", "student"],
+        update_fields=["score"],
+    )
+    result.imported += len(scores)
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.models import CourseSemester
+from students.importer import (
+    CHUNK_SIZE,
+    ScoreImportError,
+    import_lab_scores,
+)
+
+
+class Command(BaseCommand):
+    help = "Import lab scores of a course semester from a CSV file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("course_code")
+        parser.add_argument("semester_name")
+        parser.add_argument("csv_path")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+        parser.add_argument("--encoding", default="utf-8-sig")
+
+    def handle(self, *args, **options):
+        try:
+            semester = CourseSemester.objects.get(
+                course__course_code=options["course_code"],
+                semester_name=options["semester_name"],
+            )
+        except CourseSemester.DoesNotExist:
+            raise CommandError("The requested semester does not exist.")
+
+        with open(options["csv_path"], encoding=options["encoding"], newline="") as f:
+            try:
+                result = import_lab_scores(semester, f, options["chunk_size"])
+            except (ScoreImportError, UnicodeDecodeError) as e:
+                raise CommandError(str(e))
+
+        for error in result.errors:
+            self.stderr.write(f"line {error['line']}: {error['error']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.imported} scores, skipped {result.skipped} rows."
+            )
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.10 on 2026-10-18 08:50
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('courses', '0024_lablocontribution_unique_contribution_per_lab_outcome'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LabScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(10.0)])),
+                ('lab', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='lab_scores', to='courses.lab')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lab_scores', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='labscore',
+            constraint=models.UniqueConstraint(fields=('lab', 'student'), name='unique_score_per_lab_student'),
+        ),
+    ]
@@ -1,3 +1,31 @@
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
-# Create your models here.
+from courses.models import Lab
+from user_profiles.models import UserProfile
+
+# Lab scores are graded on a 0-10 scale.
+MAX_LAB_SCORE = 10.0
+
+
+class LabScore(models.Model):
+    student = models.ForeignKey(
+        UserProfile, related_name="lab_scores", on_delete=models.CASCADE
+    )
+    # Indexed by the (lab, student) unique constraint.
+    lab = models.ForeignKey(
+        Lab, related_name="lab_scores", on_delete=models.CASCADE, db_index=False
+    )
+    score = models.FloatField(
+        validators=[MinValueValidator(0.0), MaxValueValidator(MAX_LAB_SCORE)]
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["lab", "student"], name="unique_score_per_lab_student"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.score} in {self.lab_id} for {self.student_id}"
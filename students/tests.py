@@ -1,3 +1,126 @@
+import io
+
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from courses.models import Course, CourseSemester, CourseTeacher, Lab
+from students.importer import import_lab_scores
+from students.models import LabScore
+from user_profiles.models import UserProfile
+
+
+class ImportLabScoresTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(
+            course_code="CS101",
+            course_name="Programming",
+            department="CS",
+            creater="a@example.com",
+        )
+        cls.semester = CourseSemester.objects.create(
+            semester_name="Fall", course=course, num_of_lab=1
+        )
+        cls.lab = Lab.objects.create(
+            course_semester=cls.semester,
+            lab_number=1,
+            lab_name="Lab1",
+            lab_type="InLab",
+            weight=1,
+        )
+        cls.alice = UserProfile.objects.create(
+            username="alice", email="alice@example.com", student_id="S1"
+        )
+        UserProfile.objects.create(
+            username="bob", email="bob@example.com", student_id="S2"
+        )
+        UserProfile.objects.create(
+            username="bob2", email="bob2@example.com", student_id="S2"
+        )
+
+    def import_csv(self, text, **kwargs):
+        return import_lab_scores(self.semester, io.StringIO(text), **kwargs)
+
+    def test_imports_scores(self):
+        result = self.import_csv("student_id,lab_name,score\nS1,Lab1,7\n")
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(LabScore.objects.get(student=self.alice).score, 7)
+
+    def test_shared_student_id_is_rejected(self):
+        result = self.import_csv("student_id,lab_name,score\nS1,Lab1,7\nS2,Lab1,5\n")
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.skipped, 1)
+        self.assertEqual(result.errors[0]["line"], 3)
+        self.assertEqual(LabScore.objects.count(), 1)
+
+    def test_failure_imports_nothing(self):
+        class BrokenFile(io.StringIO):
+            def __next__(self):
+                line = super().__next__()
+                if line.startswith("S2"):
+                    raise UnicodeDecodeError("utf-8", b"", 0, 1, "invalid start byte")
+                return line
+
+        text = "student_id,lab_name,score\nS1,Lab1,7\nS2,Lab1,5\n"
+        with self.assertRaises(UnicodeDecodeError):
+            import_lab_scores(self.semester, BrokenFile(text), chunk_size=1)
+        self.assertFalse(LabScore.objects.exists())
+
+
+class LabScoreImportViewTests(TestCase):
+    url = "/api/students/courses/CS101/semesters/Fall/scores/import"
+
+    @classmethod
+    def setUpTestData(cls):
+        course = Course.objects.create(
+            course_code="CS101",
+            course_name="Programming",
+            department="CS",
+            creater="a@example.com",
+        )
+        semester = CourseSemester.objects.create(
+            semester_name="Fall", course=course, num_of_lab=1
+        )
+        Lab.objects.create(
+            course_semester=semester,
+            lab_number=1,
+            lab_name="Lab1",
+            lab_type="InLab",
+            weight=1,
+        )
+        cls.teacher = UserProfile.objects.create(
+            username="teacher", email="teacher@example.com", is_teacher=True
+        )
+        course_teacher = CourseTeacher.objects.create(
+            course=course, teacher=cls.teacher, role="Lecturer"
+        )
+        course_teacher.course_semester.add(semester)
+        UserProfile.objects.create(
+            username="alice", email="alice@example.com", student_id="S1"
+        )
+
+    def upload(self, content):
+        client = APIClient()
+        client.force_authenticate(self.teacher)
+        upload = SimpleUploadedFile("scores.csv", content, content_type="text/csv")
+        return client.post(self.url, {"file": upload}, format="multipart")
+
+    def test_import(self):
+        response = self.upload(
+            b"email,lab_name,score\nalice@example.com,Lab1,8\nbob,Lab1,3\n"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "imported": 1,
+                "skipped": 1,
+                "errors": [{"line": 3, "error": "Unknown student 'bob'."}],
+            },
+        )
 
-# Create your tests here.
+    def test_bad_header(self):
+        response = self.upload(b"name,score\nalice,8\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("file", response.json())
@@ -0,0 +1,10 @@
+from django.urls import path
+from students import views
+
+urlpatterns = [
+    path(
+        "courses/<str:course_code>/semesters/<str:semester_name>/scores/import",
+        views.LabScoreImport.as_view(),
+        name="score-import",
+    ),
+]
@@ -1,3 +1,24 @@
-from django.shortcuts import render
+from rest_framework import generics, serializers, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from courses.membership import CourseMembershipMixin
+from courses.permissions import CanManageLabData
+from students.importer import ScoreImportError, import_lab_scores, open_csv
+
+
+class LabScoreImport(CourseMembershipMixin, generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, CanManageLabData]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        semester = self.get_semester()
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise serializers.ValidationError({"file": ["No CSV file was uploaded."]})
+        try:
+            result = import_lab_scores(semester, open_csv(upload))
+        except (ScoreImportError, UnicodeDecodeError) as e:
+            raise serializers.ValidationError({"file": [str(e)]})
+        return Response(result.to_json(), status=status.HTTP_200_OK)
@@ -1,10 +1,10 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import UserProfile
-from courses.models import CourseTeacher, Course, CourseSemester, Lab, LearningOutcome
+from LMSSystemBackend.admin import EstimatedCountMixin
 
 
-class UserProfileAdmin(UserAdmin):
+class UserProfileAdmin(EstimatedCountMixin, UserAdmin):
     list_display = [
         "username",
         "email",
@@ -13,7 +13,8 @@ class UserProfileAdmin(UserAdmin):
         "is_teacher",
         "phone_number",
     ]
-    search_fields = ["username", "email", "first_name", "last_name", "is_teacher"]
+    # Prefixes only, each served by a case-insensitive prefix index.
+    search_fields = ["^username", "^email", "^student_id", "^last_name"]
     list_filter = ["is_teacher", "is_superuser"]
     fieldsets = (
         (None, {"fields": ("username", "password")}),
@@ -46,8 +47,3 @@ class UserProfileAdmin(UserAdmin):
 
 
 admin.site.register(UserProfile, UserProfileAdmin)
-admin.site.register(CourseTeacher)
-admin.site.register(Course)
-admin.site.register(CourseSemester)
-admin.site.register(Lab)
-admin.site.register(LearningOutcome)
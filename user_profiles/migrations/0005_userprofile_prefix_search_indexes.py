@@ -0,0 +1,43 @@
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+# Case-insensitive prefix indexes for the admin search ("^field" lookups
+# compile to UPPER(field) LIKE 'TERM%'). PostgreSQL only: text_pattern_ops
+# doesn't exist elsewhere, so they are not declared on the model.
+PREFIX_FIELDS = ["username", "email", "student_id", "last_name"]
+
+
+def prefix_indexes():
+    return [
+        models.Index(
+            OpClass(Upper(field), name="text_pattern_ops"), name=f"user_{field}_prefix_idx"
+        )
+        for field in PREFIX_FIELDS
+    ]
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    UserProfile = apps.get_model("user_profiles", "UserProfile")
+    for index in prefix_indexes():
+        schema_editor.add_index(UserProfile, index)
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for index in prefix_indexes():
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(index.name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user_profiles", "0004_alter_userprofile_email"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
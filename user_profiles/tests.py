@@ -1,3 +1,117 @@
+from unittest import mock
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from courses.models import Course, CourseSemester, Lab
+from LMSSystemBackend import admin as lms_admin
+from LMSSystemBackend.admin import EstimatedCountPaginator, estimated_count
+from user_profiles.models import UserProfile
+
+
+class EstimatedCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for name in ("alice", "bob", "carol"):
+            UserProfile.objects.create(username=name, email=f"{name}@example.com")
+
+    def test_estimate_is_used_for_large_unfiltered_lists(self):
+        with mock.patch.object(lms_admin, "estimated_count", return_value=250000):
+            paginator = EstimatedCountPaginator(UserProfile.objects.order_by("pk"), 10)
+            self.assertEqual(paginator.count, 250000)
+            filtered = UserProfile.objects.filter(username__startswith="a").order_by(
+                "pk"
+            )
+            self.assertEqual(EstimatedCountPaginator(filtered, 10).count, 1)
+
+    def test_small_tables_are_counted(self):
+        with mock.patch.object(lms_admin, "estimated_count", return_value=3):
+            paginator = EstimatedCountPaginator(UserProfile.objects.order_by("pk"), 10)
+            self.assertEqual(paginator.count, 3)
+        if connection.vendor == "postgresql":
+            estimate = estimated_count(UserProfile.objects.all())
+            self.assertTrue(estimate is None or estimate >= 0)
+
+
+class AdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = UserProfile.objects.create_superuser(
+            username="admin", email="admin@example.com", password="x"
+        )
+        UserProfile.objects.create(
+            username="alice", email="alice@example.com", student_id="S1"
+        )
+        UserProfile.objects.create(username="bob", email="bob@example.com")
+        course = Course.objects.create(
+            course_code="CS101", course_name="Programming", department="CS"
+        )
+        Course.objects.create(
+            course_code="MA201", course_name="Linear Algebra", department="Math"
+        )
+        cls.semester = CourseSemester.objects.create(
+            semester_name="Fall", course=course, num_of_lab=0
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def changelist(self, model, **params):
+        url = f"/admin/{model._meta.app_label}/{model._meta.model_name}/"
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_user_search_matches_prefixes(self):
+        response = self.changelist(UserProfile, q="ali")
+        self.assertEqual(
+            [user.username for user in response.context["cl"].result_list], ["alice"]
+        )
+        response = self.changelist(UserProfile, q="lice")
+        self.assertEqual(list(response.context["cl"].result_list), [])
+
+    def test_course_search(self):
+        response = self.changelist(Course, q="linear")
+        self.assertEqual(
+            [course.course_code for course in response.context["cl"].result_list],
+            ["MA201"],
+        )
+
+    def test_course_search_is_ranked(self):
+        Course.objects.create(
+            course_code="AL100", course_name="Software Design", department="SE"
+        )
+        Course.objects.create(
+            course_code="SE310", course_name="Testing", department="SE"
+        )
+
+        def codes(**params):
+            response = self.changelist(Course, **params)
+            return [course.course_code for course in response.context["cl"].result_list]
+
+        # The code of SE310 also matches, which ranks it first.
+        self.assertEqual(codes(q="se"), ["SE310", "AL100"])
+        # A sorted column wins over the rank.
+        self.assertEqual(codes(q="se", o="1"), ["AL100", "SE310"])
+
+    def add_labs(self, first, last):
+        Lab.objects.bulk_create(
+            Lab(
+                course_semester=self.semester,
+                lab_number=number,
+                lab_name=f"Lab{number}",
+                lab_type="InLab",
+                weight=1,
+            )
+            for number in range(first, last + 1)
+        )
 
-# Create your tests here.
+    def test_lab_list_queries_do_not_grow(self):
+        self.add_labs(1, 1)
+        with CaptureQueriesContext(connection) as one_lab:
+            self.changelist(Lab)
+        self.add_labs(2, 10)
+        with self.assertNumQueries(len(one_lab)):
+            response = self.changelist(Lab)
+        self.assertEqual(response.context["cl"].result_count, 10)